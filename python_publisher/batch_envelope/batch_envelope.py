@@ -0,0 +1,48 @@
+"""This module packs several serialized configuration change requests into one
+ConfigChangeRequestBatch envelope, grouped by configuration type, and unpacks Pub/Sub
+messages of either format. Envelopes are published with the message attribute
+format=batch, messages without it hold a single serialized ConfigChangeRequest.
+"""
+from config_change_request import config_change_batch_pb2
+from config_change_request import config_change_pb2
+
+FORMAT_ATTRIBUTE = "format"
+BATCH_FORMAT = "batch"
+#The attributes of every published batch envelope
+BATCH_ATTRIBUTES = {FORMAT_ATTRIBUTE: BATCH_FORMAT}
+
+def pack(serialized_requests):
+  """Pack serialized requests into one envelope. The requests of each configuration type
+  keep the order they were given in.
+
+  Args:
+      serialized_requests (list): the serialized ConfigChangeRequest of every request
+
+  Returns:
+      bytes: the serialized ConfigChangeRequestBatch
+  """
+  batch = config_change_batch_pb2.ConfigChangeRequestBatch()
+  groups = {}
+  for data in serialized_requests:
+    request = config_change_pb2.ConfigChangeRequest.FromString(data)
+    if request.config_type not in groups:
+      groups[request.config_type] = batch.groups.add(config_type=request.config_type)
+    groups[request.config_type].requests.append(data)
+  return batch.SerializeToString()
+
+def unpack(data, attributes=None):
+  """Read the requests of a Pub/Sub message.
+
+  Args:
+      data (bytes): the data of the message
+      attributes (dict): the attributes of the message, if any
+
+  Returns:
+      list: every ConfigChangeRequest of the message, grouped by configuration type for
+            batch envelopes
+  """
+  if (attributes or {}).get(FORMAT_ATTRIBUTE) != BATCH_FORMAT:
+    return [config_change_pb2.ConfigChangeRequest.FromString(data)]
+  batch = config_change_batch_pb2.ConfigChangeRequestBatch.FromString(data)
+  return [config_change_pb2.ConfigChangeRequest.FromString(request)
+          for group in batch.groups for request in group.requests]
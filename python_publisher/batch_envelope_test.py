@@ -0,0 +1,59 @@
+"""Test file for batch_envelope.py"""
+import unittest
+import logs.logger
+from batch_envelope import batch_envelope
+from benchmark import fake_publisher
+from config_change_request import config_change_pb2
+from publish_queue import publish_queue
+from pubsub_publisher import pubsub_publisher
+
+def make_request(issue_id, config_type):
+  """Returns:
+      bytes: a serialized request of the issue and configuration type
+  """
+  return config_change_pb2.ConfigChangeRequest(
+      issue_id=issue_id, config_type=config_type).SerializeToString()
+
+class TestsBatchEnvelope(unittest.TestCase):
+  """Test methods from batch_envelope.py
+
+  Args:
+    unittest (unittest.TestCase): unittest Testcase
+  """
+  def test_pack_and_unpack(self):
+    """Test pack() and unpack() with requests of two configuration types.
+    Assert that the requests are grouped by type, keeping their order within each type.
+    """
+    data = batch_envelope.pack([make_request("1", "QueueInfo"),
+                                make_request("2", "EnqueueRules"),
+                                make_request("3", "QueueInfo")])
+    requests = batch_envelope.unpack(data, batch_envelope.BATCH_ATTRIBUTES)
+    assert [request.issue_id for request in requests] == ["1", "3", "2"]
+
+  def test_unpack_single_request(self):
+    """Test unpack() with a message without the format attribute.
+    Assert that the message is read as a single request.
+    """
+    requests = batch_envelope.unpack(make_request("1", "EnqueueRules"), {})
+    assert len(requests) == 1 and requests[0].issue_id == "1"
+
+  def test_publish_queue_batches(self):
+    """Test PublishQueue with a batch size.
+    Assert that every request is confirmed and published exactly once.
+    """
+    client = fake_publisher.FakePublisherClient()
+    publisher = pubsub_publisher.PubSubPublisher(client)
+    requests = publish_queue.PublishQueue(publisher, logs.logger.RecordingLogger(), batch_size=10)
+    confirmations = [requests.submit(str(issue_id), make_request(str(issue_id), "QueueInfo"))
+                     for issue_id in range(50)]
+    for confirmation in confirmations:
+      confirmation.result(timeout=5)
+    requests.stop(timeout=5)
+    assert len(requests.confirmed_issues) == 50
+    unpacked = [request for (_, data), attributes in zip(client.messages,
+                                                         client.message_attributes)
+                for request in batch_envelope.unpack(data, attributes)]
+    assert sorted(int(request.issue_id) for request in unpacked) == list(range(50))
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,90 @@
+"""Publish and consume throughput benchmark for batch envelopes.
+
+The same requests are published through the publish queue one per message, and in batch
+envelopes of growing sizes, with an offline fake client whose publishes resolve after a
+network round trip. The messages are then consumed by a fake subscriber which pays a fixed
+cost to receive and acknowledge every message. Run from python_publisher/:
+
+    $ python3 -m benchmark.batch_envelope_benchmark
+"""
+import argparse
+import time
+from benchmark import fake_publisher
+from benchmark import fake_subscriber
+from config_change_request import config_change_pb2
+from publish_queue import publish_queue
+from pubsub_publisher import pubsub_publisher
+
+CONFIG_TYPES = ("EnqueueRules", "RoutingTargets", "QueueInfo")
+
+def make_requests(count):
+  """Make serialized requests of every configuration type.
+
+  Args:
+      count (int): the number of requests
+
+  Returns:
+      list: the (issue id, serialized request) of every request
+  """
+  requests = []
+  for issue_id in range(count):
+    request = config_change_pb2.ConfigChangeRequest(
+        issue_id=str(issue_id), config_type=CONFIG_TYPES[issue_id % len(CONFIG_TYPES)])
+    request.enqueue_rules.changes.add(method="Add", queue="queue", priority=issue_id)
+    requests.append((str(issue_id), request.SerializeToString()))
+  return requests
+
+def run(requests, batch_size, latency, ack_sec):
+  """Publish and consume the requests.
+
+  Args:
+      requests (list): the (issue id, serialized request) of every request
+      batch_size (int): the batch envelope size, 0 for one message per request
+      latency (float): the round trip time of a publish
+      ack_sec (float): the time taken to receive and acknowledge one message
+
+  Returns:
+      tuple: the requests published per second, the requests consumed per second and
+             the number of messages
+  """
+  client = fake_publisher.FakePublisherClient(latency)
+  publisher = pubsub_publisher.PubSubPublisher(client)
+  queue = publish_queue.PublishQueue(publisher, batch_size=batch_size)
+  start = time.perf_counter()
+  confirmations = [queue.submit(issue_id, data) for issue_id, data in requests]
+  for confirmation in confirmations:
+    confirmation.result()
+  publish_time = time.perf_counter() - start
+  queue.stop()
+  publisher.stop()
+
+  subscriber = fake_subscriber.FakeSubscriber(lambda request: None, ack_sec)
+  start = time.perf_counter()
+  subscriber.consume(client)
+  consume_time = time.perf_counter() - start
+  assert subscriber.request_count == len(requests)
+  return (len(requests) / publish_time, len(requests) / consume_time,
+          subscriber.message_count)
+
+def main():
+  """Publish and consume the requests with every batch size and print the results."""
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--requests", type=int, default=2000)
+  parser.add_argument("--latency-ms", type=float, default=30,
+                      help="round trip time of a publish")
+  parser.add_argument("--ack-ms", type=float, default=1,
+                      help="time taken by the subscriber to receive and acknowledge a message")
+  parser.add_argument("--batch-sizes", type=int, nargs="+", default=[0, 10, 100])
+  args = parser.parse_args()
+
+  requests = make_requests(args.requests)
+  print("%-12s %10s %18s %18s" % ("batch size", "messages", "published/sec",
+                                   "consumed/sec"))
+  for batch_size in args.batch_sizes:
+    published, consumed, messages = run(requests, batch_size, args.latency_ms / 1000,
+                                        args.ack_ms / 1000)
+    print("%-12s %10d %18.1f %18.1f" % (batch_size or "single", messages, published,
+                                        consumed))
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,63 @@
+"""Throughput benchmark for visiting issues with a pool of web driver sessions.
+
+Issue pages are served from a local HTTP server that delays every response to emulate
+the time Chrome takes to load and render a Buganizer issue. Run from python_publisher/:
+
+    $ python3 -m benchmark.driver_pool_benchmark
+"""
+import argparse
+import time
+import logs.logger
+from benchmark import fixture_pages
+from benchmark import fixture_server
+from driver_pool import driver_pool
+from fingerprint_tracker import fingerprint_tracker
+from web_scraping_utility import web_scraping_utility
+
+def run(web_scraping_util, server, issues, pool_size):
+  """Visit every issue once with a pool of fixture driver sessions.
+
+  Args:
+      web_scraping_util (WebScrapingUtility): the scraping utility under test
+      server (FixtureServer): the server holding the fixture pages
+      issues (list): the Buganizer urls to visit
+      pool_size (int): the number of driver sessions in the pool
+
+  Returns:
+      float: the number of issues visited per second
+  """
+  web_scraping_util.driver_pool = driver_pool.DriverPool(
+      [fixture_server.FixtureDriver(server) for _ in range(pool_size)])
+  web_scraping_util.fingerprint_tracker = fingerprint_tracker.FingerprintTracker()
+  start = time.perf_counter()
+  web_scraping_util.visit_all_issues_in_list(issues)
+  return len(issues) / (time.perf_counter() - start)
+
+def main():
+  """Run the benchmark for every pool size and print the throughput."""
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--issues", type=int, default=64)
+  parser.add_argument("--latency", type=float, default=0.25,
+                      help="seconds added to every page load")
+  parser.add_argument("--pool-sizes", type=int, nargs="+", default=[1, 2, 4, 8])
+  args = parser.parse_args()
+
+  pages = {}
+  issues = []
+  for issue_id in range(args.issues):
+    pages["/issues/" + str(issue_id)] = fixture_pages.enqueue_rules_issue_page(
+        reporter_comments=0, other_comments=5, filler_nodes=500)
+    issues.append(fixture_pages.ISSUE_URL + str(issue_id))
+
+  web_scraping_util = web_scraping_utility.WebScrapingUtility(logs.logger.Logger())
+  web_scraping_util.http_page_reader = None
+  with fixture_server.FixtureServer(pages, args.latency) as server:
+    baseline = None
+    for pool_size in args.pool_sizes:
+      throughput = run(web_scraping_util, server, issues, pool_size)
+      baseline = baseline or throughput
+      print("pool size %2d: %8.1f issues/sec (%.1fx)" % (pool_size, throughput,
+                                                        throughput / baseline))
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,50 @@
+"""Parse time benchmark for large EnqueueRules templates.
+
+A template of about 10k lines is turned into a ConfigChangeRequest with
+ConfigurationTypeFactory.make_enqueue_rules(), once valid and once with an error in every
+tenth change. Every error of the invalid template is reported in the same pass. Run from
+python_publisher/:
+
+    $ python3 -m benchmark.enqueue_rules_benchmark
+"""
+import argparse
+from benchmark import fixture_pages
+from benchmark.parse_benchmark import median_time
+from config_change_request import config_change_request
+from enqueue_rules_parser import enqueue_rules_parser
+
+def make_request(template):
+  """Parse a template into a request.
+
+  Args:
+      template (str): the EnqueueRules template
+
+  Returns:
+      config_change_request.ConfigurationChangeRequest: the request or its errors
+  """
+  return config_change_request.ConfigurationTypeFactory().make_enqueue_rules(
+      enqueue_rules_parser.iter_lines(template), fixture_pages.REPORTER, template,
+      fixture_pages.ISSUE_URL + "1")
+
+def main():
+  """Time parsing a valid and an invalid template and print the results."""
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--lines", type=int, default=10000)
+  parser.add_argument("--repeat", type=int, default=5)
+  args = parser.parse_args()
+
+  valid_template = fixture_pages.enqueue_rules_template(args.lines // 4)
+  invalid_template = valid_template.replace("Priority: 0\n", "Priority: high\n").replace(
+      "0\nFeatures", "0\nFeature")
+
+  print("%-10s %8s %8s %10s %12s" % ("template", "lines", "changes", "errors", "parse ms"))
+  for name, template in (("valid", valid_template), ("invalid", invalid_template)):
+    request = make_request(template)
+    changes_count = len(request.proto.enqueue_rules.changes) if request.proto else 0
+    errors_count = request.error_message.count("\nLine ")
+    parse_time = median_time(lambda template=template: make_request(template), args.repeat)
+    print("%-10s %8d %8d %10d %12.2f" % (name, template.count("\n") + 1, changes_count,
+                                         errors_count, parse_time))
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,74 @@
+"""An offline stand-in for the Pub/Sub publisher client, used by the tests and the
+benchmarks instead of a live topic.
+"""
+from concurrent import futures
+import itertools
+import queue
+import threading
+import time
+
+class FakePublisherClient():
+  """A stand-in for google.cloud.pubsub_v1.PublisherClient. Messages are kept in memory
+  and each publish future resolves on a background thread after a fixed latency, however
+  many publishes are in flight.
+  """
+
+  def __init__(self, latency=0, fail_every=0, setup_sec=0):
+    """Setup the FakePublisherClient
+
+    Args:
+        latency (float): the seconds before each publish future resolves
+        fail_every (int): every fail_every-th publish fails, none by default
+        setup_sec (float): the seconds taken to create the client, as a real client
+                           opens its gRPC channel
+    """
+    time.sleep(setup_sec)
+    self.latency = latency
+    self.fail_every = fail_every
+    self.messages = []
+    #The attributes of every message, in the order of messages
+    self.message_attributes = []
+    self._message_ids = itertools.count(1)
+    self._lock = threading.Lock()
+    self._in_flight = queue.Queue()
+    self._resolver = threading.Thread(target=self._resolve, daemon=True)
+    self._resolver.start()
+
+  def topic_path(self, project, topic):
+    """Returns:
+        str: the path of the topic
+    """
+    return "projects/" + project + "/topics/" + topic
+
+  def publish(self, topic, data, **attributes):
+    """Publish a message.
+
+    Returns:
+        concurrent.futures.Future: resolves to the message id, or fails for every
+                                   fail_every-th message
+    """
+    future = futures.Future()
+    with self._lock:
+      message_id = next(self._message_ids)
+      self.messages.append((topic, data))
+      self.message_attributes.append(attributes)
+    self._in_flight.put((time.monotonic() + self.latency, message_id, future))
+    return future
+
+  def _resolve(self):
+    """Resolve every publish once its latency elapsed, in the order they were made."""
+    while True:
+      in_flight = self._in_flight.get()
+      if in_flight is None:
+        return
+      due_time, message_id, future = in_flight
+      time.sleep(max(0, due_time - time.monotonic()))
+      if self.fail_every and message_id % self.fail_every == 0:
+        future.set_exception(RuntimeError("publish " + str(message_id) + " failed"))
+      else:
+        future.set_result(str(message_id))
+
+  def stop(self):
+    """Resolve every publish in flight."""
+    self._in_flight.put(None)
+    self._resolver.join()
@@ -0,0 +1,35 @@
+"""An offline stand-in for the subscriber, used by the benchmarks to consume the messages
+kept by benchmark.fake_publisher.FakePublisherClient in either message format.
+"""
+import time
+from batch_envelope import batch_envelope
+
+class FakeSubscriber():
+  """Consumes published messages, paying a fixed cost to receive and acknowledge every
+  message, as a Pub/Sub subscriber does, and handing every request to a handler.
+  """
+
+  def __init__(self, handler, ack_sec=0):
+    """Setup the FakeSubscriber
+
+    Args:
+        handler (callable): called with every config_change_pb2.ConfigChangeRequest
+        ack_sec (float): the seconds taken to receive and acknowledge one message
+    """
+    self.handler = handler
+    self.ack_sec = ack_sec
+    self.message_count = 0
+    self.request_count = 0
+
+  def consume(self, client):
+    """Consume every message published to a fake client.
+
+    Args:
+        client (fake_publisher.FakePublisherClient): the client holding the messages
+    """
+    for (_, data), attributes in zip(client.messages, client.message_attributes):
+      for request in batch_envelope.unpack(data, attributes):
+        self.handler(request)
+        self.request_count += 1
+      time.sleep(self.ack_sec)
+      self.message_count += 1
@@ -0,0 +1,184 @@
+"""This module builds synthetic Buganizer pages for the publisher benchmarks. The pages
+reproduce the markup the scraping utilities read: the issue list table, the issue metadata
+fields, the component path link and the comment stream.
+"""
+import html
+
+ISSUE_URL = "https://b.corp.google.com/issues/"
+REPORTER = "reporter@google.com"
+COMMENTER = "commenter@google.com"
+
+QUEUE_INFO_FIELDS = [
+    ("severity", "Severity", "S2"),
+    ("foundInVersion", "Found In", "1.0, 1.1"),
+    ("inProd", "In Prod", "Yes"),
+    ("verifier", "Verifier", "verifier@google.com"),
+    ("targetedToVersion", "Targeted To", "2.0"),
+    ("customField688197", "Queue Id", "42"),
+    ("customField686879", "MDB group name", "hermes-mdb"),
+    ("customField686850", "Ops Owner", "ops@google.com"),
+    ("customField686358", "GVO Owner", "gvo@google.com"),
+    ("customField686980", "Tech Owner", "tech@google.com"),
+    ("customField686718", "Is Dashboard Queue", "true"),
+    ("customField687560", "Reviews per Item", "3"),
+    ("customField686833", "Fragment Name", "fragment"),
+    ("customField686748", "Item Expiry (Sec)", "3600"),
+    ("customField688166", "Is Experimental Review Enabled", "false"),
+    ("customField686699", "Experimental Probability", "10"),
+]
+
+ROUTING_TARGETS_FIELDS = [
+    ("severity", "Severity", "S1"),
+    ("foundInVersion", "Found In", "empty"),
+    ("inProd", "In Prod", "No"),
+    ("verifier", "Verifier", "empty"),
+    ("targetedToVersion", "Targeted To", "empty"),
+    ("customField688193", "Queue Id", "7"),
+]
+
+def issue_list_page(issue_ids, modified="Oct 1", comments="1",
+                    assignee="runchenyan@google.com", filler_nodes=0):
+  """Build a Buganizer issue list page.
+
+  Args:
+      issue_ids (list): the ids of the issues listed on the page
+      modified (str): the Modified column value of every issue
+      comments (str): the Comments column value of every issue
+      assignee (str): the Assignee column value of every issue
+      filler_nodes (int): the number of unrelated elements added around the issue table
+
+  Returns:
+      str: the html of the issue list page
+  """
+  rows = []
+  for issue_id in issue_ids:
+    rows.append('<tr data-row-id="%s"><td>%s</td><td>Issue %s</td><td>%s</td><td>%s</td>'
+                '<td>%s</td></tr>' % (issue_id, issue_id, issue_id, assignee, modified,
+                                      comments))
+  filler = "".join('<div class="bv2-filler"><span>%d</span></div>' % i
+                   for i in range(filler_nodes))
+  return ('<html><head><title>status:open componentid:898075 - Buganizer</title></head>'
+          '<body>%s<table><thead><tr><th>ID</th><th>Title</th><th>Assignee</th><th>Modified'
+          '</th><th>Comments</th></tr></thead><tbody>%s</tbody></table></body></html>'
+          % (filler, "".join(rows)))
+
+def metadata_field(field_class, label, value):
+  """Build one issue metadata field.
+
+  Args:
+      field_class (str): the suffix of the bv2-issue-metadata-field-* class
+      label (str): the display name of the field
+      value (str): the value of the field, 'empty' for no value
+
+  Returns:
+      str: the html of the metadata field
+  """
+  return ('<div class="bv2-issue-metadata-field-inner bv2-issue-metadata-field-%s" '
+          'aria-label="%s value is %s"><span>%s</span></div>'
+          % (field_class, html.escape(label), html.escape(value), html.escape(value)))
+
+def comment(user, text):
+  """Build one comment of the issue comment stream.
+
+  Args:
+      user (str): the author of the comment
+      text (str): the text of the comment, one line per template line
+
+  Returns:
+      str: the html of the comment
+  """
+  lines = "<br>".join(html.escape(line) for line in text.splitlines())
+  return ('<li class="bv2-event ng-star-inserted"><span class="bv2-event-user-id" '
+          'data-hovercard-id="%s">%s</span><div class="bv2-event-body"><b-plain-format-'
+          'unquoted-section class="ng-star-inserted">%s</b-plain-format-unquoted-section>'
+          '</div></li>' % (user, user, lines))
+
+def enqueue_rules_template(changes_count):
+  """Build a valid EnqueueRules template.
+
+  Args:
+      changes_count (int): the number of changes in the template
+
+  Returns:
+      str: the text of the template
+  """
+  lines = ["Configuration: EnqueueRules"]
+  for i in range(changes_count):
+    lines.extend(["Method: Add", "QueueId: Q" + str(i), "Features: f1, f2, f3",
+                  "Priority: " + str(i)])
+  return "\n".join(lines)
+
+def issue_page(config_type, fields=(), comments=(), queues_to_route=(),
+               assignee="runchenyan@google.com", filler_nodes=0):
+  """Build a Buganizer issue page.
+
+  Args:
+      config_type (str): "EnqueueRules", "RoutingTargets" or "QueueInfo"
+      fields (list): the (class, label, value) tuples of the advanced metadata fields
+      comments (list): the html of every comment in the comment stream
+      queues_to_route (list): the (queue id, list name) tuples of the RoutingTargets
+                              queue lists
+      assignee (str): the assignee of the issue
+      filler_nodes (int): the number of unrelated elements added to reach the size of a
+                          real Angular issue page
+
+  Returns:
+      str: the html of the issue page
+  """
+  metadata = [metadata_field("reporter", "Reporter", REPORTER),
+              metadata_field("assignee", "Assignee", assignee)]
+  metadata.extend(metadata_field(*field) for field in fields)
+  buttons = ['<button id="bv2-issue-metadata-list-%d" aria-label="Remove %s from %s">'
+             '</button>' % (i, queue_id, list_name)
+             for i, (queue_id, list_name) in enumerate(queues_to_route)]
+  filler = "".join('<div class="bv2-filler"><span>%d</span></div>' % i
+                   for i in range(filler_nodes))
+  return ('<html><head><title>Issue - Buganizer</title></head><body><b-service-bootstrap>'
+          '<div class="bv2-component-path"><a href="/issues?q=componentid:898075">Hermes</a>'
+          ' &gt; <a href="/issues?q=componentid:898076">%s</a></div>'
+          '<div class="bv2-issue-metadata">%s%s</div><ul class="bv2-events">%s</ul>%s'
+          '</b-service-bootstrap></body></html>'
+          % (config_type, "".join(metadata), "".join(buttons), "".join(comments), filler))
+
+def enqueue_rules_issue_page(changes_count=1, reporter_comments=1, other_comments=0,
+                             filler_nodes=0):
+  """Build an EnqueueRules issue page.
+
+  Args:
+      changes_count (int): the number of changes in each reporter template comment
+      reporter_comments (int): the number of template comments from the reporter
+      other_comments (int): the number of comments from other users
+      filler_nodes (int): the number of unrelated elements added to the page
+
+  Returns:
+      str: the html of the issue page
+  """
+  comments = [comment(COMMENTER, "Looks good to me.") for _ in range(other_comments)]
+  comments.extend(comment(REPORTER, enqueue_rules_template(changes_count))
+                  for _ in range(reporter_comments))
+  return issue_page("EnqueueRules", comments=comments, filler_nodes=filler_nodes)
+
+def queue_info_issue_page(filler_nodes=0):
+  """Build a QueueInfo issue page assigned to the automation user.
+
+  Args:
+      filler_nodes (int): the number of unrelated elements added to the page
+
+  Returns:
+      str: the html of the issue page
+  """
+  return issue_page("QueueInfo", fields=QUEUE_INFO_FIELDS, filler_nodes=filler_nodes)
+
+def routing_targets_issue_page(filler_nodes=0):
+  """Build a RoutingTargets issue page assigned to the automation user.
+
+  Args:
+      filler_nodes (int): the number of unrelated elements added to the page
+
+  Returns:
+      str: the html of the issue page
+  """
+  queues_to_route = [("11", "Add Queues to Route To"), ("12", "Add Queues to Route To"),
+                     ("13", "Remove Queues to Route To")]
+  return issue_page("RoutingTargets", fields=ROUTING_TARGETS_FIELDS,
+                    queues_to_route=queues_to_route, filler_nodes=filler_nodes)
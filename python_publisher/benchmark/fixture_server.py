@@ -0,0 +1,138 @@
+"""This module holds the FixtureServer class which serves recorded or synthetic Buganizer
+pages from a local HTTP server, and the FixtureDriver class which stands in for a selenium
+web driver session reading pages from that server.
+"""
+import re
+import threading
+import time
+import urllib.request
+from http import server
+from selenium import common
+
+BUGANIZER_URL = "https://b.corp.google.com"
+COMPONENT_LINK_PATTERN = re.compile(r'<a href="/issues\?q=componentid:\d+">([^<]*)</a></div>')
+
+class FixtureServer():
+  """Serves a dictionary of pages from a local HTTP server, optionally
+  delaying every response to emulate page load time.
+  """
+
+  def __init__(self, pages, latency=0.0):
+    """Setup the FixtureServer
+
+    Args:
+        pages (dict): the html of every page, keyed by url path
+        latency (float): the number of seconds every response is delayed by
+    """
+    self.pages = pages
+    self.latency = latency
+    fixture_server = self
+
+    class Handler(server.BaseHTTPRequestHandler):
+      """Serves the fixture pages."""
+      protocol_version = "HTTP/1.1"
+
+      def do_GET(self):
+        """Respond with the fixture page for the requested path."""
+        time.sleep(fixture_server.latency)
+        page = fixture_server.pages.get(self.path)
+        if page is None:
+          self.send_error(404)
+          return
+        body = page.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+      def log_message(self, *args):
+        """Keep the benchmark output quiet."""
+
+    self._server = server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    self._server.daemon_threads = True
+    self.base_url = "http://127.0.0.1:" + str(self._server.server_address[1])
+    self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+  def __enter__(self):
+    self._thread.start()
+    return self
+
+  def __exit__(self, *args):
+    self._server.shutdown()
+    self._server.server_close()
+
+  def local_url(self, url):
+    """Map a Buganizer url to the same path on the fixture server.
+
+    Args:
+        url (str): the Buganizer url
+
+    Returns:
+        str: the fixture server url
+    """
+    return url.replace(BUGANIZER_URL, self.base_url)
+
+class FixtureElement():
+  """A stand-in for a selenium web element."""
+
+  def __init__(self, text):
+    self.text = text
+
+class FixtureDriver():
+  """A stand-in for a selenium web driver session which loads pages from a FixtureServer."""
+
+  def __init__(self, fixture_server):
+    """Setup the FixtureDriver
+
+    Args:
+        fixture_server (FixtureServer): the server holding the fixture pages
+    """
+    self.fixture_server = fixture_server
+    self.page_source = ""
+    self.title = ""
+
+  def get(self, url):
+    """Load a page from the fixture server.
+
+    Args:
+        url (str): the Buganizer url of the page
+    """
+    with urllib.request.urlopen(self.fixture_server.local_url(url)) as response:
+      self.page_source = response.read().decode("utf-8")
+    title = re.search(r"<title>([^<]*)</title>", self.page_source)
+    self.title = title.group(1) if title else ""
+
+  def get_cookies(self):
+    """Returns:
+        list: the cookies of the session, fixture pages need none
+    """
+    return []
+
+  def implicitly_wait(self, seconds):
+    """Pages are fully loaded once get() returns, so there is nothing to wait for."""
+
+  def find_element_by_xpath(self, xpath):
+    """Find the component path link, the only element read by xpath while scraping.
+
+    Args:
+        xpath (str): the xpath of the element
+
+    Returns:
+        FixtureElement: the last link of the component path
+    """
+    component_link = COMPONENT_LINK_PATTERN.search(self.page_source)
+    if component_link is None:
+      raise common.exceptions.NoSuchElementException(xpath)
+    return FixtureElement(component_link.group(1))
+
+  def find_element_by_id(self, element_id):
+    """Fixture pages are static, so no element can be clicked.
+
+    Args:
+        element_id (str): the id of the element
+    """
+    raise common.exceptions.NoSuchElementException(element_id)
+
+  def quit(self):
+    """Nothing to terminate."""
@@ -0,0 +1,107 @@
+"""Wall time and peak memory benchmark for the html parser backends.
+
+Every installed backend parses a corpus of Buganizer pages and reads everything the scrapers
+use: the issue list table, the issue metadata, the component path links and the comment
+stream. Each backend runs in its own process so that its peak resident memory, including
+memory allocated by C parsers, can be measured. The corpus is either a directory of recorded
+.html pages or, by default, synthetic pages. Run from python_publisher/:
+
+    $ python3 -m benchmark.html_parser_benchmark [--corpus DIR]
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+from benchmark import fixture_pages
+from parsed_page import parsed_page
+from web_scraping_utility import html_parser
+
+def load_corpus(corpus_path, filler_nodes):
+  """Load the pages of the corpus.
+
+  Args:
+      corpus_path (str): a directory of recorded .html pages, or None for synthetic pages
+      filler_nodes (int): the number of unrelated elements added to each synthetic issue page
+
+  Returns:
+      list: the html of every page
+  """
+  if corpus_path:
+    pages = []
+    for file_name in sorted(os.listdir(corpus_path)):
+      if file_name.endswith(".html"):
+        with open(os.path.join(corpus_path, file_name), encoding="utf-8") as page_file:
+          pages.append(page_file.read())
+    return pages
+
+  return [
+      fixture_pages.issue_list_page([str(issue_id) for issue_id in range(500)]),
+      fixture_pages.enqueue_rules_issue_page(changes_count=10, reporter_comments=3,
+                                             other_comments=50, filler_nodes=filler_nodes),
+      fixture_pages.queue_info_issue_page(filler_nodes),
+      fixture_pages.routing_targets_issue_page(filler_nodes),
+  ]
+
+def read_page(page):
+  """Read everything the scrapers use from a parsed page.
+
+  Args:
+      page (parsed_page.ParsedPage): the parsed page
+  """
+  page.title()
+  page.table_rows()
+  page.table_header_titles()
+  page.component_link_texts()
+  page.comments()
+  page.metadata_fields()
+
+def run_worker(parser, pages, repeat):
+  """Parse and read the corpus with one backend and print the results as JSON.
+
+  Args:
+      parser (str): the parser backend
+      pages (list): the html of every page
+      repeat (int): the number of passes over the corpus
+  """
+  baseline_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+  start = time.perf_counter()
+  for _ in range(repeat):
+    for page in pages:
+      read_page(parsed_page.ParsedPage(page, parser))
+  elapsed = time.perf_counter() - start
+  peak_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+  print(json.dumps({"ms_per_page": elapsed * 1000 / (repeat * len(pages)),
+                    "peak_rss_delta_mb": (peak_rss_kb - baseline_rss_kb) / 1024}))
+
+def main():
+  """Run every installed backend in its own process and print the results."""
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--corpus", help="directory of recorded Buganizer .html pages")
+  parser.add_argument("--repeat", type=int, default=5)
+  parser.add_argument("--filler-nodes", type=int, default=3000,
+                      help="unrelated elements added to each synthetic issue page")
+  parser.add_argument("--worker", help=argparse.SUPPRESS)
+  args = parser.parse_args()
+
+  pages = load_corpus(args.corpus, args.filler_nodes)
+  if args.worker:
+    run_worker(args.worker, pages, args.repeat)
+    return
+
+  print("%d pages, %.1f MB" % (len(pages), sum(len(page) for page in pages) / 2**20))
+  print("%-12s %12s %18s" % ("parser", "ms/page", "peak RSS delta MB"))
+  for backend in html_parser.available_parsers():
+    command = [sys.executable, "-m", "benchmark.html_parser_benchmark", "--worker", backend,
+               "--repeat", str(args.repeat), "--filler-nodes", str(args.filler_nodes)]
+    if args.corpus:
+      command.extend(["--corpus", args.corpus])
+    result = json.loads(subprocess.run(command, check=True, capture_output=True,
+                                       text=True).stdout)
+    print("%-12s %12.2f %18.1f" % (backend, result["ms_per_page"],
+                                   result["peak_rss_delta_mb"]))
+
+if __name__ == "__main__":
+  main()
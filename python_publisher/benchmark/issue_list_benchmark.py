@@ -0,0 +1,50 @@
+"""Parse time benchmark for the issue list page read by scrape_issues().
+
+The issue list page is read once per pass of the scrape loop, but only its title, its table
+header and the id and fingerprint cells of each row are used. The page is parsed in full and
+with only the title and the issue table kept, for growing numbers of rows and of unrelated
+elements around the table. Run from python_publisher/:
+
+    $ python3 -m benchmark.issue_list_benchmark
+"""
+import argparse
+from benchmark import fixture_pages
+from benchmark.parse_benchmark import median_time
+from parsed_page import parsed_page
+from web_scraping_utility import html_parser
+
+def read_issue_list(source_html, parser, only_tags):
+  """Parse an issue list page and read what scrape_issue_links() uses.
+
+  Args:
+      source_html (str): the html of the issue list page
+      parser (str): the parser backend
+      only_tags (tuple): the tags kept, or None to parse the whole page
+  """
+  page = parsed_page.ParsedPage(source_html, parser, only_tags)
+  page.title()
+  page.table_header_titles()
+  page.table_rows()
+
+def main():
+  """Time reading issue list pages of several sizes and print the results."""
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--repeat", type=int, default=5)
+  parser.add_argument("--filler-nodes", type=int, default=3000,
+                      help="unrelated elements added around the issue table")
+  args = parser.parse_args()
+
+  print("%-12s %6s %12s %12s" % ("parser", "rows", "full ms", "targeted ms"))
+  for backend in html_parser.available_parsers():
+    for rows in (50, 200, 800):
+      page = fixture_pages.issue_list_page([str(issue_id) for issue_id in range(rows)],
+                                           filler_nodes=args.filler_nodes)
+      full_time = median_time(lambda page=page: read_issue_list(page, backend, None),
+                              args.repeat)
+      targeted_time = median_time(
+          lambda page=page: read_issue_list(page, backend, parsed_page.ISSUE_LIST_TAGS),
+          args.repeat)
+      print("%-12s %6d %12.2f %12.2f" % (backend, rows, full_time, targeted_time))
+
+if __name__ == "__main__":
+  main()
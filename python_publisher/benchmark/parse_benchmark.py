@@ -0,0 +1,80 @@
+"""Parse time per issue benchmark for the issue page scraping path.
+
+Every issue page is now parsed once and shared by the field scrapers and the comment parser.
+The previous implementation parsed QueueInfo and RoutingTargets pages a second time in
+scrape_queue_info() and scrape_routing_targets(), so its time per issue is reported as the
+measured time plus one extra parse for those types. Run from python_publisher/:
+
+    $ python3 -m benchmark.parse_benchmark
+"""
+import argparse
+from concurrent import futures
+import statistics
+import time
+import logs.logger
+from benchmark import fixture_pages
+from config_change_request import config_change_request
+from parsed_page import parsed_page
+from web_scraping_utility import web_scraping_utility
+
+#The number of times each issue page was parsed before it was parsed once per visit
+PREVIOUS_PARSES_PER_ISSUE = {"EnqueueRules": 1, "QueueInfo": 2, "RoutingTargets": 2}
+
+def median_time(function, repeat):
+  """Time a function.
+
+  Args:
+      function (callable): the function to time
+      repeat (int): the number of timed calls
+
+  Returns:
+      float: the median time of one call in milliseconds
+  """
+  times = []
+  for _ in range(repeat):
+    start = time.perf_counter()
+    function()
+    times.append((time.perf_counter() - start) * 1000)
+  return statistics.median(times)
+
+def main():
+  """Time parsing and scraping every issue page type and print the results."""
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--repeat", type=int, default=20)
+  parser.add_argument("--filler-nodes", type=int, default=3000,
+                      help="unrelated elements added to reach the size of a real issue page")
+  args = parser.parse_args()
+
+  #Keep the benchmark offline, nothing is published
+  def publish_nothing(factory, proto):
+    confirmation = futures.Future()
+    confirmation.set_result("1")
+    return confirmation
+
+  config_change_request.ConfigurationTypeFactory.publish = publish_nothing
+  web_scraping_util = web_scraping_utility.WebScrapingUtility(logs.logger.Logger())
+
+  pages = {
+      "EnqueueRules": fixture_pages.enqueue_rules_issue_page(
+          changes_count=5, reporter_comments=1, other_comments=20,
+          filler_nodes=args.filler_nodes),
+      "QueueInfo": fixture_pages.queue_info_issue_page(args.filler_nodes),
+      "RoutingTargets": fixture_pages.routing_targets_issue_page(args.filler_nodes),
+  }
+
+  print("%-15s %10s %16s %16s" % ("issue type", "parse ms", "before ms/issue",
+                                   "after ms/issue"))
+  for config_type, page in pages.items():
+    parse_time = median_time(lambda page=page: parsed_page.ParsedPage(page), args.repeat)
+
+    def scrape(page=page):
+      #Forget the comments counted by the previous call so every call parses the template
+      web_scraping_util._message_parsing_util.issue_comments_counts.clear()
+      web_scraping_util.scrape_issue_page(fixture_pages.ISSUE_URL + "1", page)
+
+    after_time = median_time(scrape, args.repeat)
+    before_time = after_time + (PREVIOUS_PARSES_PER_ISSUE[config_type] - 1) * parse_time
+    print("%-15s %10.2f %16.2f %16.2f" % (config_type, parse_time, before_time, after_time))
+
+if __name__ == "__main__":
+  main()
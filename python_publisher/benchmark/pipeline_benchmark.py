@@ -0,0 +1,260 @@
+"""End-to-end throughput benchmark for the publisher, from Buganizer html to published
+ConfigChangeRequests, without a Buganizer session or a Pub/Sub topic.
+
+An issue list page and its EnqueueRules, QueueInfo and RoutingTargets issue pages are served
+from a local HTTP server to a pool of fixture driver sessions. Every issue goes through
+WebScrapingUtility, MessageParsingUtility and ConfigurationTypeFactory and is published
+through the publish queue into an offline fake client. The pages are either synthetic or a
+directory of recorded pages holding list.html and one <issue id>.html page per issue.
+
+The issues per second, the median and 99th percentile latency of every stage and the peak
+resident memory are printed and written as JSON, so that runs can be compared with
+--compare. Run from python_publisher/:
+
+    $ python3 -m benchmark.pipeline_benchmark [--corpus DIR] [--output FILE] [--compare FILE]
+"""
+import argparse
+import collections
+import functools
+import json
+import os
+import resource
+import statistics
+import threading
+import time
+import logs.logger
+from benchmark import fake_publisher
+from benchmark import fixture_pages
+from benchmark import fixture_server
+from config_change_request import config_change_request
+from driver_pool import driver_pool
+from publish_queue import publish_queue
+from pubsub_publisher import pubsub_publisher
+from web_scraping_utility import html_parser
+from web_scraping_utility import web_scraping_utility
+
+LIST_URL = "https://b.corp.google.com/issues?q=componentid:898075%20status:open"
+CONFIG_TYPES = ("EnqueueRules", "QueueInfo", "RoutingTargets")
+
+class StageTimer():
+  """Records the duration of every call of the timed pipeline stages, from any thread."""
+
+  def __init__(self):
+    self.durations = collections.defaultdict(list)
+    self._lock = threading.Lock()
+
+  def record(self, stage, seconds):
+    """Record one duration of a stage.
+
+    Args:
+        stage (str): the name of the stage
+        seconds (float): the duration
+    """
+    with self._lock:
+      self.durations[stage].append(seconds)
+
+  def wrap(self, stage, function):
+    """Time every call of a function as a stage.
+
+    Args:
+        stage (str): the name of the stage
+        function (callable): the function to time
+
+    Returns:
+        callable: the timed function
+    """
+    def timed(*args, **kwargs):
+      start = time.perf_counter()
+      try:
+        return function(*args, **kwargs)
+      finally:
+        self.record(stage, time.perf_counter() - start)
+    return timed
+
+  def report(self):
+    """Returns:
+        dict: the number of calls and the median and 99th percentile duration in
+              milliseconds of every stage
+    """
+    report = {}
+    with self._lock:
+      for stage, durations in self.durations.items():
+        durations = sorted(durations)
+        report[stage] = {
+            "count": len(durations),
+            "p50_ms": statistics.median(durations) * 1000,
+            "p99_ms": durations[min(len(durations) - 1, int(len(durations) * 0.99))] * 1000}
+    return report
+
+def load_pages(corpus_path, issues_count, filler_nodes):
+  """Load or build the issue list page and the issue pages.
+
+  Args:
+      corpus_path (str): a directory of recorded pages, or None for synthetic pages
+      issues_count (int): the number of synthetic issues, every configuration type in turn
+      filler_nodes (int): the number of unrelated elements added to each synthetic issue page
+
+  Returns:
+      dict: the html of every page, keyed by url path
+  """
+  issue_pages = {}
+  list_page = None
+  if corpus_path:
+    for file_name in sorted(os.listdir(corpus_path)):
+      with open(os.path.join(corpus_path, file_name), encoding="utf-8") as page_file:
+        if file_name == "list.html":
+          list_page = page_file.read()
+        elif file_name.endswith(".html"):
+          issue_pages[file_name[:-len(".html")]] = page_file.read()
+  else:
+    for issue_id in range(issues_count):
+      config_type = CONFIG_TYPES[issue_id % len(CONFIG_TYPES)]
+      if config_type == "EnqueueRules":
+        issue_pages[str(issue_id)] = fixture_pages.enqueue_rules_issue_page(
+            changes_count=5, reporter_comments=1, other_comments=20, filler_nodes=filler_nodes)
+      elif config_type == "QueueInfo":
+        issue_pages[str(issue_id)] = fixture_pages.queue_info_issue_page(filler_nodes)
+      else:
+        issue_pages[str(issue_id)] = fixture_pages.routing_targets_issue_page(filler_nodes)
+
+  pages = {"/issues/" + issue_id: page for issue_id, page in issue_pages.items()}
+  list_path = LIST_URL.replace(fixture_server.BUGANIZER_URL, "")
+  pages[list_path] = list_page or fixture_pages.issue_list_page(list(issue_pages))
+  #The second page of search results lists no new issues, which ends the listing
+  pages[list_path + web_scraping_utility.constants.ISSUE_LIST_PAGE_PARAMETER % 2] = \
+    fixture_pages.issue_list_page([])
+  return pages
+
+def instrument(web_scraping_util, requests, timer):
+  """Time every stage of the pipeline.
+
+  Args:
+      web_scraping_util (WebScrapingUtility): the scraping utility under test
+      requests (publish_queue.PublishQueue): the publish queue under test
+      timer (StageTimer): records the stage durations
+  """
+  web_scraping_util.read_issue_list_page = timer.wrap(
+      "list_page", web_scraping_util.read_issue_list_page)
+  web_scraping_util.load_page = timer.wrap("page_load", web_scraping_util.load_page)
+  web_scraping_util.visit_pooled_issue = timer.wrap(
+      "issue", web_scraping_util.visit_pooled_issue)
+  html_parser.parse = timer.wrap("parse", html_parser.parse)
+  factory = config_change_request.ConfigurationTypeFactory
+  factory.make = timer.wrap("build_request", factory.make)
+  factory.make_enqueue_rules = timer.wrap("build_request", factory.make_enqueue_rules)
+
+  submit = requests.submit
+  @functools.wraps(submit)
+  def timed_submit(*args, **kwargs):
+    start = time.perf_counter()
+    confirmation = submit(*args, **kwargs)
+    confirmation.add_done_callback(
+        lambda _: timer.record("publish", time.perf_counter() - start))
+    return confirmation
+  requests.submit = timed_submit
+
+def run(args, logger=None):
+  """Run every issue through the pipeline once.
+
+  Args:
+      args (argparse.Namespace): the benchmark options
+      logger (logs.logger.Logger): the logger of the scraping utility, a new log file in
+                                   logs/ by default
+
+  Returns:
+      dict: the results of the run
+  """
+  pages = load_pages(args.corpus, args.issues, args.filler_nodes)
+  client = fake_publisher.FakePublisherClient(args.publish_latency_ms / 1000)
+  publisher = pubsub_publisher.PubSubPublisher(client)
+  pubsub_publisher.set_publisher(publisher)
+  requests = publish_queue.PublishQueue(publisher)
+  publish_queue.set_publish_queue(requests)
+
+  timer = StageTimer()
+  web_scraping_util = web_scraping_utility.WebScrapingUtility(
+      logger or logs.logger.Logger())
+  web_scraping_util.http_page_reader = None
+  instrument(web_scraping_util, requests, timer)
+
+  with fixture_server.FixtureServer(pages, args.page_latency_ms / 1000) as server:
+    web_scraping_util.driver_pool = driver_pool.DriverPool(
+        [fixture_server.FixtureDriver(server) for _ in range(args.drivers)])
+    start = time.perf_counter()
+    web_scraping_util.visit_all_issues_in_list(web_scraping_util.scrape_issue_pages(LIST_URL))
+    requests.join()
+    wall_sec = time.perf_counter() - start
+
+  requests.stop()
+  publisher.stop()
+  client.stop()
+  issues_count = len(pages) - 2
+  return {
+      "options": vars(args),
+      "html_parser": html_parser.SELECTED_PARSER,
+      "issues": issues_count,
+      "published": requests.stats()["confirmed"],
+      "wall_sec": wall_sec,
+      "issues_per_sec": issues_count / wall_sec,
+      "stages": timer.report(),
+      "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+  }
+
+def print_results(results, baseline=None):
+  """Print the results of a run, next to the results of a previous run if given.
+
+  Args:
+      results (dict): the results of the run
+      baseline (dict): the results of a previous run
+  """
+  def compared(value, baseline_value):
+    if baseline_value is None:
+      return "%10.2f" % value
+    return "%10.2f %10.2f" % (baseline_value, value)
+
+  baseline = baseline or {}
+  print("%d issues, %d published, html parser %s" % (results["issues"], results["published"],
+                                                     results["html_parser"]))
+  print("%-30s %s" % ("", "%10s %10s" % ("baseline", "run") if baseline else "%10s" % "run"))
+  print("%-30s %s" % ("issues/sec", compared(results["issues_per_sec"],
+                                             baseline.get("issues_per_sec"))))
+  print("%-30s %s" % ("peak RSS MB", compared(results["peak_rss_mb"],
+                                              baseline.get("peak_rss_mb"))))
+  for stage, stage_results in results["stages"].items():
+    baseline_stage = baseline.get("stages", {}).get(stage, {})
+    for percentile in ("p50_ms", "p99_ms"):
+      print("%-30s %s" % (stage + " " + percentile, compared(
+          stage_results[percentile], baseline_stage.get(percentile))))
+
+def main():
+  """Run the benchmark, print the results and write them as JSON."""
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--corpus", help="directory of recorded pages, list.html and one "
+                      "<issue id>.html page per issue")
+  parser.add_argument("--issues", type=int, default=300,
+                      help="the number of synthetic issues")
+  parser.add_argument("--filler-nodes", type=int, default=3000,
+                      help="unrelated elements added to reach the size of a real issue page")
+  parser.add_argument("--drivers", type=int, default=4,
+                      help="the number of fixture driver sessions")
+  parser.add_argument("--page-latency-ms", type=float, default=0,
+                      help="time added to every page load")
+  parser.add_argument("--publish-latency-ms", type=float, default=30,
+                      help="round trip time of a publish")
+  parser.add_argument("--output", default="pipeline_benchmark.json",
+                      help="the JSON file the results are written to")
+  parser.add_argument("--compare", help="the JSON results of a previous run")
+  args = parser.parse_args()
+
+  baseline = None
+  if args.compare:
+    with open(args.compare) as baseline_file:
+      baseline = json.load(baseline_file)
+
+  results = run(args)
+  print_results(results, baseline)
+  with open(args.output, "w") as output_file:
+    json.dump(results, output_file, indent=2)
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,56 @@
+"""Publish throughput and latency benchmark for configuration change requests.
+
+Requests are published with a new publisher client for every request, as every publish did
+before the client was shared, and with the publisher shared by the process. Both use an
+offline fake client whose creation takes as long as opening a gRPC channel and whose
+publishes resolve after a network round trip. Run from python_publisher/:
+
+    $ python3 -m benchmark.publish_benchmark
+"""
+import argparse
+import time
+from benchmark import fake_publisher
+from config_change_request import config_change_pb2
+from pubsub_publisher import pubsub_publisher
+
+def main():
+  """Publish requests both ways and print the results."""
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--requests", type=int, default=200)
+  parser.add_argument("--setup-ms", type=float, default=20,
+                      help="time taken to create a publisher client")
+  parser.add_argument("--latency-ms", type=float, default=30,
+                      help="round trip time of a publish")
+  args = parser.parse_args()
+
+  data = config_change_pb2.ConfigChangeRequest(issue_id="1").SerializeToString()
+
+  latency = args.latency_ms / 1000
+  setup_sec = args.setup_ms / 1000
+
+  start = time.perf_counter()
+  for _ in range(args.requests):
+    client = fake_publisher.FakePublisherClient(latency, setup_sec=setup_sec)
+    client.publish(client.topic_path("project", "topic"), data)
+    client.stop()
+  per_call_time = time.perf_counter() - start
+
+  client = fake_publisher.FakePublisherClient(latency, setup_sec=setup_sec)
+  publisher = pubsub_publisher.PubSubPublisher(client)
+  start = time.perf_counter()
+  for _ in range(args.requests):
+    publisher.publish(data)
+  publisher.flush()
+  shared_time = time.perf_counter() - start
+  stats = publisher.stats()
+  publisher.stop()
+
+  print("%-20s %14s" % ("publisher", "requests/sec"))
+  print("%-20s %14.1f" % ("client per request", args.requests / per_call_time))
+  print("%-20s %14.1f" % ("shared publisher", args.requests / shared_time))
+  print("shared publisher: %d published, %d failed, p50 %.1f ms, p99 %.1f ms"
+        % (stats["published"], stats["failed"], stats["p50_latency_ms"],
+           stats["p99_latency_ms"]))
+
+if __name__ == "__main__":
+  main()
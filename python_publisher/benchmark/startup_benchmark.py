@@ -0,0 +1,73 @@
+"""Import time benchmark for the entry point of the publisher.
+
+The entry point is imported in fresh interpreters with -X importtime, and the median total
+import time and the slowest imports are reported. The benchmark fails, with exit status 1,
+when the median exceeds the budget or when one of the heavy dependencies which are only
+imported on first use is imported at startup. Run from python_publisher/:
+
+    $ python3 -m benchmark.startup_benchmark [--budget-ms 300]
+
+The subscriber entry point can be measured with --directory ../python_subscriber.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+#Dependencies which must not be imported before they are first used
+DEFERRED_MODULES = ("google.cloud.pubsub_v1", "selenium.webdriver", "bs4", "requests",
+                    "pandas", "matplotlib")
+
+def import_times(module, directory):
+  """Import a module in a fresh interpreter.
+
+  Args:
+      module (str): the module to import
+      directory (str): the directory the interpreter runs in
+
+  Returns:
+      dict: the cumulative import time in milliseconds of every imported module
+  """
+  stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", "import " + module],
+                          cwd=directory, check=True, capture_output=True, text=True).stderr
+  times = {}
+  for line in stderr.splitlines():
+    #import time: self [us] | cumulative | imported package
+    fields = line.split("|")
+    if len(fields) == 3 and fields[1].strip().isdigit():
+      times[fields[2].strip()] = int(fields[1]) / 1000
+  return times
+
+def main():
+  """Import the entry point several times, print the results and exit with status 1 on a
+  regression.
+  """
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--module", default="main")
+  parser.add_argument("--directory", default=".")
+  parser.add_argument("--repeat", type=int, default=5)
+  parser.add_argument("--budget-ms", type=float, default=300,
+                      help="the most the median import time may take")
+  parser.add_argument("--top", type=int, default=10,
+                      help="the number of slowest imports to print")
+  args = parser.parse_args()
+
+  runs = [import_times(args.module, args.directory) for _ in range(args.repeat)]
+  total_ms = statistics.median(times[args.module] for times in runs)
+  deferred = sorted(module for module in runs[-1] if module in DEFERRED_MODULES)
+
+  print("%-50s %12s" % ("slowest imports", "cumulative ms"))
+  slowest = sorted(runs[-1].items(), key=lambda item: item[1], reverse=True)
+  for module, module_ms in slowest[:args.top]:
+    print("%-50s %12.1f" % (module, module_ms))
+  print("import %s: median %.1f ms, budget %.1f ms" % (args.module, total_ms, args.budget_ms))
+
+  if deferred:
+    print("FAIL: imported at startup: " + ", ".join(deferred))
+  if total_ms > args.budget_ms:
+    print("FAIL: import time over budget")
+  if deferred or total_ms > args.budget_ms:
+    sys.exit(1)
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: config_change_batch.proto
+
+import sys
+_b=sys.version_info[0]<3 and (lambda x:x) or (lambda x:x.encode('latin1'))
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import message as _message
+from google.protobuf import reflection as _reflection
+from google.protobuf import symbol_database as _symbol_database
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor.FileDescriptor(
+  name='config_change_batch.proto',
+  package='',
+  syntax='proto3',
+  serialized_options=None,
+  serialized_pb=_b('\n\x19\x63onfig_change_batch.proto\"{\n\x18\x43onfigChangeRequestBatch\x12/\n\x06groups\x18\x01 \x03(\x0b\x32\x1f.ConfigChangeRequestBatch.Group\x1a.\n\x05Group\x12\x13\n\x0b\x63onfig_type\x18\x01 \x01(\t\x12\x10\n\x08requests\x18\x02 \x03(\x0c\x62\x06proto3')
+)
+
+
+
+
+_CONFIGCHANGEREQUESTBATCH_GROUP = _descriptor.Descriptor(
+  name='Group',
+  full_name='ConfigChangeRequestBatch.Group',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='config_type', full_name='ConfigChangeRequestBatch.Group.config_type', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='requests', full_name='ConfigChangeRequestBatch.Group.requests', index=1,
+      number=2, type=12, cpp_type=9, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=106,
+  serialized_end=152,
+)
+
+_CONFIGCHANGEREQUESTBATCH = _descriptor.Descriptor(
+  name='ConfigChangeRequestBatch',
+  full_name='ConfigChangeRequestBatch',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='groups', full_name='ConfigChangeRequestBatch.groups', index=0,
+      number=1, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[_CONFIGCHANGEREQUESTBATCH_GROUP, ],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=29,
+  serialized_end=152,
+)
+
+_CONFIGCHANGEREQUESTBATCH_GROUP.containing_type = _CONFIGCHANGEREQUESTBATCH
+_CONFIGCHANGEREQUESTBATCH.fields_by_name['groups'].message_type = _CONFIGCHANGEREQUESTBATCH_GROUP
+DESCRIPTOR.message_types_by_name['ConfigChangeRequestBatch'] = _CONFIGCHANGEREQUESTBATCH
+_sym_db.RegisterFileDescriptor(DESCRIPTOR)
+
+ConfigChangeRequestBatch = _reflection.GeneratedProtocolMessageType('ConfigChangeRequestBatch', (_message.Message,), dict(
+
+  Group = _reflection.GeneratedProtocolMessageType('Group', (_message.Message,), dict(
+    DESCRIPTOR = _CONFIGCHANGEREQUESTBATCH_GROUP,
+    __module__ = 'config_change_batch_pb2'
+    # @@protoc_insertion_point(class_scope:ConfigChangeRequestBatch.Group)
+    ))
+  ,
+  DESCRIPTOR = _CONFIGCHANGEREQUESTBATCH,
+  __module__ = 'config_change_batch_pb2'
+  # @@protoc_insertion_point(class_scope:ConfigChangeRequestBatch)
+  ))
+_sym_db.RegisterMessage(ConfigChangeRequestBatch)
+_sym_db.RegisterMessage(ConfigChangeRequestBatch.Group)
+
+
+# @@protoc_insertion_point(module_scope)
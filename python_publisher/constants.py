@@ -3,8 +3,38 @@
 PROJECT_ID = "google.com:youtube-admin-pacing-server"
 #Pub/Sub Topic Name
 TOPIC_NAME = "BuganizerCR"
+#Pub/Sub publisher batch settings and flow control
+PUBLISH_MAX_MESSAGES = 100
+PUBLISH_MAX_BYTES = 1024 * 1024
+PUBLISH_MAX_LATENCY_SEC = 0.05
+PUBLISH_FLOW_CONTROL_MESSAGES = 1000
+PUBLISH_FLOW_CONTROL_BYTES = 10 * 1024 * 1024
+#Requests waiting to be published or retried, scraping blocks once the queue is full
+PUBLISH_QUEUE_SIZE = 1000
+PUBLISH_MAX_ATTEMPTS = 5
+PUBLISH_RETRY_BASE_SEC = 1
+#The longest delay between two retries of a spooled request, which is retried until it is
+#published
+PUBLISH_RETRY_MAX_SEC = 60
+#The most queued requests published together in one batch envelope, 0 publishes every
+#request in its own message, as the subscriber only reads single requests
+PUBLISH_BATCH_ENVELOPE_SIZE = 0
+#Write-ahead spool of the requests not confirmed yet, replayed on start
+SPOOL_PATH = "request_spool.dat"
+SPOOL_REPLAY_BATCH_SIZE = 500
+#A warning is logged once this many spooled requests are unconfirmed, eg. during an outage
+SPOOL_WARN_PENDING_REQUESTS = 10000
+#The spool file is rewritten with only its unconfirmed requests once it holds at least
+#SPOOL_COMPACT_MIN_RECORDS acked requests, and SPOOL_COMPACT_RATIO times more acked than
+#unconfirmed requests
+SPOOL_COMPACT_MIN_RECORDS = 1000
+SPOOL_COMPACT_RATIO = 4
 #Buganizer Url
 URL = "https://b.corp.google.com/issues?q=status:open%20componentid:898075&s=created_time:desc"
+#Query parameter appended to URL to read the next pages of the issue list, formatted with
+#the page number
+ISSUE_LIST_PAGE_PARAMETER = "&p=page:%d"
+MAX_ISSUE_LIST_PAGES = 100
 #Path to Chrome driver
 DRIVER_PATH = "/opt/google/chrome/chromedriver"
 #Path to Chrome profile
@@ -20,3 +50,67 @@ ENQUEUE_RULE_FEATURES_SPECIFIER = "Features: "
 ENQUEUE_RULE_PRIORITY_SPECIFIER = "Priority: "
 #Automation user
 AUTOMATION_USER = "runchenyan@google.com"
+#Issue list columns used to fingerprint an issue, only changed issues are visited again
+FINGERPRINT_COLUMNS = ("Modified", "Comments", "Assignee")
+#Polling scheduler
+POLL_MIN_INTERVAL_SEC = 5
+POLL_MAX_INTERVAL_SEC = 300
+POLL_BACKOFF_FACTOR = 2
+POLL_JITTER = 0.2
+MAX_PAGE_LOADS_PER_MINUTE = 60
+#HTTP reads are limited separately, so the pooled HTTP reads are not held to the web driver
+#page load rate
+MAX_HTTP_READS_PER_MINUTE = 600
+#Number of web driver sessions visiting issues concurrently
+DRIVER_POOL_SIZE = 1
+#Seconds an issue list page waits for a MOMA login before the pass gives up on it
+MOMA_LOGIN_TIMEOUT_SEC = 300
+#Read Buganizer pages over "http" with the browser's cookies, or only with "selenium"
+READ_MODE = "http"
+HTTP_POOL_SIZE = 8
+HTTP_TIMEOUT_SEC = 10
+#Issue metadata scraped for each configuration type. Each entry maps a metadata field class
+#(bv2-issue-metadata-field-<class>), or for list types a metadata list name, to its value type
+QUEUE_INFO_METADATA = {
+    "severity": "str",
+    "foundInVersion": "str",
+    "inProd": "yes_no",
+    "verifier": "str",
+    "targetedToVersion": "str",
+    "customField688197": "int", #Queue Id
+    "customField686879": "str", #MDB group name
+    "customField686850": "str", #Ops Owner
+    "customField686358": "str", #GVO Owner
+    "customField686980": "str", #Tech Owner
+    "customField686718": "true_false", #Is Dashboard Queue
+    "customField687560": "int", #Reviews per Item
+    "customField686833": "str", #Fragment Name
+    "customField686748": "int", #Item Expiry (Sec)
+    "customField688166": "true_false", #Is Experimental Review Enabled
+    "customField686699": "int", #Experimental Probability
+}
+ROUTING_TARGETS_METADATA = {
+    "severity": "str",
+    "foundInVersion": "str",
+    "inProd": "yes_no",
+    "verifier": "str",
+    "targetedToVersion": "str",
+    "customField688193": "int", #Queue Id
+    "Add Queues to Route To": "int_list",
+    "Remove Queues to Route To": "int_list",
+}
+#Html parser backends in order of preference, the first installed one is used
+HTML_PARSERS = ("lexbor", "lxml", "html.parser")
+#SQLite database persisting the comments parsed and requests published for each open issue
+STATE_DB_PATH = "issue_state.db"
+#Issues whose latest published request hash is remembered in memory, and for how long
+DEDUP_MAX_ENTRIES = 10000
+DEDUP_TTL_SEC = 24 * 60 * 60
+#Historical Traffic Database holding the queues and features EnqueueRules requests are
+#checked against before they are published, requests are not checked if SPANNER_INSTANCE_ID
+#is None
+SPANNER_INSTANCE_ID = "historicaltraffic"
+SPANNER_DATABASE_ID = "historical_traffic"
+VALIDATION_INDEX_PAGE_SIZE = 10000
+VALIDATION_INDEX_FULL_REFRESH_SEC = 60 * 60
+VALIDATION_INDEX_MISS_REFRESH_SEC = 60
@@ -0,0 +1,82 @@
+"""This module holds the DriverPool class which hands out a bounded set of selenium web
+driver sessions to the threads visiting Buganizer issues concurrently.
+"""
+import contextlib
+import queue
+import threading
+
+class DriverPool():
+  """A bounded pool of selenium web driver sessions. Each session is leased to
+  one thread at a time.
+  """
+
+  def __init__(self, drivers, factory=None):
+    """Setup the DriverPool
+
+    Args:
+        drivers (list): the web driver sessions held by the pool
+        factory (callable): starts a new web driver session, or returns None if it could
+                            not, used to replace broken sessions
+    """
+    self.drivers = list(drivers)
+    self.size = len(self.drivers)
+    self.factory = factory
+    self._lock = threading.Lock()
+    #The replacement of every broken session still leased, None if it has none
+    self._replacements = {}
+    self._available_drivers = queue.Queue()
+    for driver in self.drivers:
+      self._available_drivers.put(driver)
+
+  @contextlib.contextmanager
+  def lease(self):
+    """Block until a web driver session is free and lease it to the caller.
+
+    Yields:
+        selenium.webdriver.chrome.webdriver.WebDriver: the leased web driver session, or
+                                                       None once the pool has no session
+                                                       left
+    """
+    driver = self._available_drivers.get()
+    try:
+      yield driver
+    finally:
+      with self._lock:
+        if driver in self._replacements:
+          driver = self._replacements.pop(driver)
+          if driver is None:
+            self.size -= 1
+      if driver is not None or self.size == 0:
+        #Once the last session is dropped, None is handed out so no caller blocks forever
+        self._available_drivers.put(driver)
+
+  def replace(self, driver):
+    """Quit a broken web driver session leased by the caller and start a new one, which
+    takes its place in the pool when the lease ends. The session is dropped from the pool if
+    no new one can be started.
+
+    Args:
+        driver (selenium.webdriver.chrome.webdriver.WebDriver): the leased session
+
+    Returns:
+        selenium.webdriver.chrome.webdriver.WebDriver: the new session, or None
+    """
+    try:
+      driver.quit()
+    except Exception:
+      pass
+    replacement = self.factory() if self.factory else None
+    with self._lock:
+      self.drivers.remove(driver)
+      if replacement is not None:
+        self.drivers.append(replacement)
+      self._replacements[driver] = replacement
+    return replacement
+
+  def quit(self):
+    """Terminate every web driver session in the pool."""
+    for driver in self.drivers:
+      driver.quit()
+    self.drivers = []
+    self.size = 0
+    self._available_drivers = queue.Queue()
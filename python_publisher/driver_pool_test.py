@@ -0,0 +1,68 @@
+"""Test file for driver_pool.py"""
+import threading
+import unittest
+from driver_pool import driver_pool
+
+class FakeDriver():
+  """A stand-in for a web driver session which records whether it was quit."""
+  def __init__(self, name):
+    self.name = name
+    self.quit_called = False
+
+  def quit(self):
+    """End the session."""
+    self.quit_called = True
+
+class TestsDriverPool(unittest.TestCase):
+  """Test methods from driver_pool.py
+
+  Args:
+    unittest (unittest.TestCase): unittest Testcase
+  """
+  def test_lease_and_return(self):
+    """Test leasing every session of the pool.
+    Assert that sessions are leased to one caller at a time and are handed out again once
+    returned.
+    """
+    first, second = FakeDriver("first"), FakeDriver("second")
+    pool = driver_pool.DriverPool([first, second])
+    third_lease = []
+
+    with pool.lease() as leased_first:
+      with pool.lease() as leased_second:
+        assert {leased_first, leased_second} == {first, second}
+        waiter = threading.Thread(
+            target=lambda: third_lease.append(pool.lease().__enter__()))
+        waiter.start()
+        waiter.join(0.1)
+        assert not third_lease
+      waiter.join(1)
+    assert third_lease == [leased_second]
+
+  def test_broken_session_is_replaced(self):
+    """Test replacing a broken session while it is leased.
+    Assert that it is quit and the new session takes its place in the pool.
+    """
+    broken = FakeDriver("broken")
+    pool = driver_pool.DriverPool([broken], factory=lambda: FakeDriver("new"))
+    with pool.lease() as driver:
+      replacement = pool.replace(driver)
+    assert broken.quit_called
+    assert pool.drivers == [replacement] and pool.size == 1
+    with pool.lease() as driver:
+      assert driver is replacement
+
+  def test_last_session_dropped(self):
+    """Test replacing the last session when no new session can be started.
+    Assert that the pool is empty and leases yield None instead of blocking.
+    """
+    pool = driver_pool.DriverPool([FakeDriver("broken")], factory=lambda: None)
+    with pool.lease() as driver:
+      assert pool.replace(driver) is None
+    assert pool.size == 0 and pool.drivers == []
+    for _ in range(2):
+      with pool.lease() as driver:
+        assert driver is None
+
+if __name__ == "__main__":
+  unittest.main()
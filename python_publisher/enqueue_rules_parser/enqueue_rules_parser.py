@@ -0,0 +1,149 @@
+"""This module parses the changes of an EnqueueRules template in a single pass over its
+lines. Every change line is matched by one pattern compiled from the specifiers in
+constants.py, each complete and valid change is added to the request as soon as its last
+line is read, and every line-level error of the template is collected instead of stopping
+at the first one. With a validation index, unknown queues and features are reported too.
+"""
+import io
+import re
+import constants
+
+#The specifiers of the lines of one change, in template order
+SPECIFIERS = (constants.METHOD_SPECIFIER, constants.QUEUE_SPECIFIER,
+              constants.ENQUEUE_RULE_FEATURES_SPECIFIER,
+              constants.ENQUEUE_RULE_PRIORITY_SPECIFIER)
+SPECIFIER_INDEXES = {specifier: index for index, specifier in enumerate(SPECIFIERS)}
+SPECIFIER_PATTERN = re.compile("(?P<specifier>" + "|".join(
+    re.escape(specifier) for specifier in SPECIFIERS) + ")(?P<value>.*)")
+
+def iter_lines(text):
+  """Iterate over the lines of a comment without splitting it up front.
+
+  Args:
+      text (str): the comment
+
+  Yields:
+      str: each line of the comment, without its line break
+  """
+  for line in io.StringIO(text, newline=None):
+    yield line.rstrip("\n")
+
+def missing_specifiers(first_index, last_index):
+  """Name the specifiers missing from a change.
+
+  Args:
+      first_index (int): the index in SPECIFIERS of the first missing specifier
+      last_index (int): the index in SPECIFIERS after the last missing specifier
+
+  Returns:
+      str: the quoted missing specifiers
+  """
+  return ", ".join("'" + specifier + "'" for specifier in SPECIFIERS[first_index:last_index])
+
+def parse_changes(lines, enqueue_rules, reporter, first_line_number=2,
+                  validation_index=None):
+  """Parse the change lines of an EnqueueRules template into a request.
+
+  Args:
+      lines (iterable): the lines of the template after the Configuration line
+      enqueue_rules (config_change_pb2.EnqueueRules): the message the changes are added to
+      reporter (str): the reporter of the Buganizer issue
+      first_line_number (int): the line number of the first line in the comment
+      validation_index (validation_index.ValidationIndex): the known queues and features,
+                                                           nothing is checked against them
+                                                           if not given
+
+  Returns:
+      list: a message for every invalid line, empty if the template is valid
+  """
+  errors = []
+  #The index in SPECIFIERS of the next line of the current change, 0 between changes
+  next_index = 0
+  change_line_number = None
+  change_is_valid = True
+  method = queue = features = None
+  line_number = first_line_number - 1
+
+  for line_number, line in enumerate(lines, first_line_number):
+    if next_index == 0:
+      change_line_number = line_number
+      change_is_valid = True
+
+    match = SPECIFIER_PATTERN.match(line)
+    if match is None:
+      #Most likely a misspelled specifier, read as the expected line
+      errors.append("Line " + str(line_number) + ": '" + line + "' does not start with " + \
+        missing_specifiers(next_index, next_index + 1) + ".")
+      change_is_valid = False
+      next_index = (next_index + 1) % len(SPECIFIERS)
+      continue
+
+    index = SPECIFIER_INDEXES[match.group("specifier")]
+    value = match.group("value")
+    if index == 0 and next_index != 0:
+      errors.append("Line " + str(line_number) + ": the change starting on line " + \
+        str(change_line_number) + " is missing " + \
+        missing_specifiers(next_index, len(SPECIFIERS)) + ".")
+      change_line_number = line_number
+      change_is_valid = True
+    elif index > next_index:
+      errors.append("Line " + str(line_number) + ": missing " + \
+        missing_specifiers(next_index, index) + " before '" + SPECIFIERS[index] + "'.")
+      change_is_valid = False
+    elif index < next_index:
+      errors.append("Line " + str(line_number) + ": expected " + \
+        missing_specifiers(next_index, next_index + 1) + " but found '" + \
+        SPECIFIERS[index] + "'.")
+      change_is_valid = False
+
+    if index == 0:
+      method = value
+      if method not in constants.POSSIBLE_METHODS:
+        errors.append("Line " + str(line_number) + ": the method entry '" + method + \
+          "' is not a valid method, use 'Add', 'Remove', or 'Set'.")
+        change_is_valid = False
+    elif index == 1:
+      queue = value
+      #The queue entry may list several queues, separated like the features
+      unknown_queues = [] if validation_index is None else \
+        validation_index.unknown_queues(queue.split(", "))
+      if len(unknown_queues) == 1:
+        errors.append("Line " + str(line_number) + ": the queue '" + unknown_queues[0] + \
+          "' does not exist.")
+        change_is_valid = False
+      elif unknown_queues:
+        errors.append("Line " + str(line_number) + ": the queues " + \
+          ", ".join("'" + queue_id + "'" for queue_id in unknown_queues) + \
+          " do not exist.")
+        change_is_valid = False
+    elif index == 2:
+      features = value.split(", ")
+      unknown_features = [] if validation_index is None else \
+        validation_index.unknown_features(features)
+      if unknown_features:
+        errors.append("Line " + str(line_number) + ": the features " + \
+          ", ".join("'" + feature + "'" for feature in unknown_features) + \
+          " do not exist.")
+        change_is_valid = False
+    else:
+      try:
+        priority = int(value)
+      except ValueError:
+        errors.append("Line " + str(line_number) + ": the priority entry '" + value + \
+          "' is not an integer.")
+        change_is_valid = False
+      if change_is_valid:
+        change = enqueue_rules.changes.add()
+        change.reporter = reporter
+        change.method = method
+        change.queue = queue
+        change.features.extend(features)
+        change.priority = priority
+
+    next_index = (index + 1) % len(SPECIFIERS)
+
+  if next_index != 0:
+    errors.append("Line " + str(line_number) + ": the change starting on line " + \
+      str(change_line_number) + " is missing " + \
+      missing_specifiers(next_index, len(SPECIFIERS)) + ".")
+  return errors
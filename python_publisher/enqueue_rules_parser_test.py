@@ -0,0 +1,61 @@
+"""Test file for enqueue_rules_parser.py"""
+import unittest
+from benchmark import fixture_pages
+from config_change_request import config_change_pb2
+from enqueue_rules_parser import enqueue_rules_parser
+
+def parse(template):
+  """Parse the change lines of a template.
+
+  Args:
+      template (str): the EnqueueRules template
+
+  Returns:
+      tuple: the parsed EnqueueRules message and the errors
+  """
+  enqueue_rules = config_change_pb2.EnqueueRules()
+  lines = enqueue_rules_parser.iter_lines(template)
+  next(lines)
+  return enqueue_rules, enqueue_rules_parser.parse_changes(lines, enqueue_rules, "reporter")
+
+class TestsEnqueueRulesParser(unittest.TestCase):
+  """Test methods from enqueue_rules_parser.py
+
+  Args:
+    unittest (unittest.TestCase): unittest Testcase
+  """
+  def test_valid_template(self):
+    """Test parse_changes() on a valid template with Windows line breaks.
+    Assert that every change is parsed.
+    """
+    template = fixture_pages.enqueue_rules_template(3).replace("\n", "\r\n")
+    enqueue_rules, errors = parse(template)
+    assert errors == []
+    assert [change.queue for change in enqueue_rules.changes] == ["Q0", "Q1", "Q2"]
+    assert list(enqueue_rules.changes[2].features) == ["f1", "f2", "f3"]
+    assert enqueue_rules.changes[2].priority == 2
+
+  def test_priority_with_spaces(self):
+    """Test parse_changes() on a priority entry followed by a space.
+    Assert that the priority is parsed, as int() accepts it.
+    """
+    enqueue_rules, errors = parse("\n".join(["Configuration: EnqueueRules", "Method: Add",
+                                              "QueueId: Q0", "Features: f1", "Priority: 5 "]))
+    assert errors == []
+    assert enqueue_rules.changes[0].priority == 5
+
+  def test_every_error_is_reported(self):
+    """Test parse_changes() on a template with an error in several changes.
+    Assert that one error is reported for each invalid line.
+    """
+    template = "\n".join(["Configuration: EnqueueRules",
+                          "Method: Move", "QueueId: Q0", "Features: f1", "Priority: 0",
+                          "Method: Add", "QueueId: Q1", "Priority: 1",
+                          "Method: Add", "QueueId: Q2", "Features: f1", "Priority: high",
+                          "Method: Add", "QueueId: Q3"])
+    _, errors = parse(template)
+    assert [error.split(":")[0] for error in errors] == \
+      ["Line 2", "Line 8", "Line 12", "Line 14"]
+
+if __name__ == '__main__':
+  unittest.main()
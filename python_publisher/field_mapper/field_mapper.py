@@ -0,0 +1,116 @@
+"""This module holds the FieldMapper class which maps the display names of the advanced
+fields scraped from a Buganizer issue to the fields of a ConfigChangeRequest. A mapper is
+built once per configuration type from the protobuf descriptors, so fields added to
+config_change.proto are picked up without code changes.
+
+A display name matches a field once both are lowercased and stripped of everything but
+letters and digits, eg. 'Item Expiry (Sec)' matches item_expiry_sec.
+"""
+import functools
+from google.protobuf import descriptor
+from config_change_request import config_change_pb2
+
+#The oneof of ConfigChangeRequest holding the fields of each configuration type
+CONFIG_TYPE_ONEOF = "ConfigType"
+
+@functools.lru_cache(maxsize=1024)
+def normalize(name):
+  """Normalize a display name or a field name.
+
+  Args:
+      name (str): the display name or the field name
+
+  Returns:
+      str: the name lowercased, without any character which is not a letter or a digit
+  """
+  return "".join(character for character in name.lower() if character.isalnum())
+
+def make_setter(field):
+  """Make the function setting a field from a scraped value.
+
+  Args:
+      field (google.protobuf.descriptor.FieldDescriptor): the field
+
+  Returns:
+      callable: sets the field of a message to a value, with the message and the value
+                as arguments
+  """
+  name = field.name
+  if field.label == descriptor.FieldDescriptor.LABEL_REPEATED:
+    if field.type == descriptor.FieldDescriptor.TYPE_STRING:
+      #Comma-separated list
+      return lambda message, value: getattr(message, name).extend(
+          value.replace(" ", "").split(","))
+    return lambda message, value: getattr(message, name).extend(value)
+  if field.type == descriptor.FieldDescriptor.TYPE_ENUM:
+    enum_type = field.enum_type
+    return lambda message, value: setattr(message, name, enum_type.values_by_name[value].number)
+  return lambda message, value: setattr(message, name, value)
+
+class FieldMapper():
+  """Sets the fields of a ConfigChangeRequest of one configuration type from the advanced
+  fields scraped from a Buganizer issue.
+  """
+
+  def __init__(self, config_type):
+    """Build the mapper from the protobuf descriptors.
+
+    Args:
+        config_type (str): the configuration type, the name of a message of the
+                           ConfigType oneof, eg. 'QueueInfo' or 'RoutingTargets'
+    """
+    self.config_type = config_type
+    request_descriptor = config_change_pb2.ConfigChangeRequest.DESCRIPTOR
+    #The (True if the field is on the ConfigChangeRequest itself, setter) of each field,
+    #keyed by the normalized field name
+    self.setters = {}
+    self.config_type_field_name = None
+    for field in request_descriptor.oneofs_by_name[CONFIG_TYPE_ONEOF].fields:
+      if field.message_type.name == config_type:
+        self.config_type_field_name = field.name
+        for config_type_field in field.message_type.fields:
+          self.setters[normalize(config_type_field.name)] = (False, make_setter(config_type_field))
+    if self.config_type_field_name is None:
+      raise ValueError("Unknown configuration type " + config_type)
+
+    for field in request_descriptor.fields:
+      if field.containing_oneof is None:
+        self.setters[normalize(field.name)] = (True, make_setter(field))
+
+  def has_field(self, display_name):
+    """Check whether a scraped advanced field maps to a field of the request.
+
+    Args:
+        display_name (str): the display name of the advanced field
+
+    Returns:
+        bool: True if the advanced field is sent in the request
+    """
+    return normalize(display_name) in self.setters
+
+  def apply(self, request, advanced_fields):
+    """Set the fields of a request from scraped advanced fields. Advanced fields which do
+    not map to a field of the request are ignored.
+
+    Args:
+        request (config_change_pb2.ConfigChangeRequest): the request to fill in
+        advanced_fields (dict): the value of each advanced field, keyed by display name
+    """
+    config_type_message = getattr(request, self.config_type_field_name)
+    for display_name, value in advanced_fields.items():
+      setter = self.setters.get(normalize(display_name))
+      if setter is not None:
+        on_request, set_field = setter
+        set_field(request if on_request else config_type_message, value)
+
+@functools.lru_cache(maxsize=None)
+def get_mapper(config_type):
+  """Get the mapper of a configuration type, shared by the whole process.
+
+  Args:
+      config_type (str): the configuration type, eg. 'QueueInfo' or 'RoutingTargets'
+
+  Returns:
+      FieldMapper: the mapper of the configuration type
+  """
+  return FieldMapper(config_type)
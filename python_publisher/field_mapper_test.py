@@ -0,0 +1,40 @@
+"""Test file for field_mapper.py"""
+import unittest
+from config_change_request import config_change_pb2
+from field_mapper import field_mapper
+
+class TestsFieldMapper(unittest.TestCase):
+  """Test methods from field_mapper.py
+
+  Args:
+    unittest (unittest.TestCase): unittest Testcase
+  """
+  def test_display_names_match_fields(self):
+    """Test has_field() for display names of QueueInfo fields.
+    Assert that display names match the fields regardless of case and punctuation, and
+    that unknown names do not match.
+    """
+    mapper = field_mapper.get_mapper("QueueInfo")
+    assert mapper.has_field("Item Expiry (Sec)") and mapper.has_field("MDB group name")
+    assert mapper.has_field("Issue Id")
+    assert not mapper.has_field("Assignee")
+    assert field_mapper.get_mapper("QueueInfo") is mapper
+
+  def test_apply(self):
+    """Test apply() for RoutingTargets advanced fields.
+    Assert that every field is converted according to its descriptor.
+    """
+    request = config_change_pb2.ConfigChangeRequest()
+    field_mapper.get_mapper("RoutingTargets").apply(request, {
+        "Issue Id": "12", "Config Type": "RoutingTargets", "Severity": "S1",
+        "Found In": "1.0, 1.1", "In Prod": True, "Queue Id": 7,
+        "Add Queues to Route To": [11, 12], "Assignee": "ignored@google.com"})
+    assert (request.issue_id, request.config_type) == ("12", "RoutingTargets")
+    routing_targets = request.routing_targets
+    assert routing_targets.severity == routing_targets.S1
+    assert list(routing_targets.found_in) == ["1.0", "1.1"]
+    assert routing_targets.in_prod and routing_targets.queue_id == 7
+    assert list(routing_targets.add_queues_to_route_to) == [11, 12]
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,115 @@
+"""This module holds the FingerprintTracker class which keeps track of a fingerprint
+for every issue found on the Buganizer issue list page, so that only issues which
+changed since they were last visited are opened again.
+"""
+import threading
+
+class FingerprintTracker():
+  """Keeps track of the issue fingerprints scraped from the issue list page and
+  decides which issues need to be visited again.
+  """
+
+  def __init__(self):
+    """Setup the FingerprintTracker"""
+    #The most recent fingerprint seen on the issue list page for each issue
+    self.observed_fingerprints = {}
+    #The fingerprint each issue had when it was last visited successfully
+    self.visited_fingerprints = {}
+    #The issues found on the issue list page during the current pass
+    self.seen_issues = set()
+    self.visited_count = 0
+    self.skipped_count = 0
+    #Issues are recorded as visited from the threads visiting them
+    self._lock = threading.Lock()
+
+  def observe(self, issue, fingerprint):
+    """Record the fingerprint of an issue as it appears on the issue list page.
+
+    Args:
+        issue (str): the URL of the Buganizer issue
+        fingerprint (tuple): the values of the fingerprint columns for the issue,
+                             None for any column that could not be found
+    """
+    self.observed_fingerprints[issue] = fingerprint
+    self.seen_issues.add(issue)
+
+  def needs_visit(self, issue):
+    """Check whether an issue changed since it was last visited.
+
+    An issue is always visited if it has never been visited, or if none of its
+    fingerprint columns could be found on the issue list page.
+
+    Args:
+        issue (str): the URL of the Buganizer issue
+
+    Returns:
+        bool: True if the issue should be visited, False if it is unchanged
+    """
+    fingerprint = self.observed_fingerprints.get(issue)
+    if fingerprint is None or all(value is None for value in fingerprint):
+      return True
+    return self.visited_fingerprints.get(issue) != fingerprint
+
+  def filter_changed(self, issues):
+    """Yield the issues which need to be visited and count the issues skipped. Visited
+    issues are only counted once their visit succeeded, see record_visited().
+
+    Args:
+        issues (iterable): the Buganizer issue urls found on the issue list page
+
+    Yields:
+        str: the URL of each issue that changed since it was last visited
+    """
+    for issue in issues:
+      if self.needs_visit(issue):
+        yield issue
+      else:
+        self.skipped_count += 1
+
+  def mark_visited(self, issue):
+    """Remember the current fingerprint of an issue once it has been fully processed.
+
+    Args:
+        issue (str): the URL of the Buganizer issue
+    """
+    if issue in self.observed_fingerprints:
+      self.visited_fingerprints[issue] = self.observed_fingerprints[issue]
+
+  def record_visited(self, issue):
+    """Count an issue as visited by the current pass and remember its current fingerprint,
+    once it was read and processed.
+
+    Args:
+        issue (str): the URL of the Buganizer issue
+    """
+    with self._lock:
+      self.visited_count += 1
+      self.mark_visited(issue)
+
+  def forget(self, issue):
+    """Forget the fingerprint an issue had when it was last visited, so it is visited
+    again on the next pass, for example once publishing its request failed.
+
+    Args:
+        issue (str): the URL of the Buganizer issue
+    """
+    self.visited_fingerprints.pop(issue, None)
+
+  def reset_counts(self):
+    """Reset the visited and skipped issue counts and the seen issues at the start of a
+    new pass.
+    """
+    self.visited_count = 0
+    self.skipped_count = 0
+    self.seen_issues = set()
+
+  def prune_unseen(self):
+    """Drop the fingerprints of the issues which were not on the issue list page during the
+    finished pass, eg. once they were closed. Nothing is dropped by a pass which found no
+    issue, as the issue list page could not be read.
+    """
+    if not self.seen_issues:
+      return
+    for fingerprints in (self.observed_fingerprints, self.visited_fingerprints):
+      for issue in set(fingerprints) - self.seen_issues:
+        del fingerprints[issue]
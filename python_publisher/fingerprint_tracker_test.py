@@ -0,0 +1,114 @@
+"""Test file for fingerprint_tracker.py"""
+import unittest
+import logs.logger
+from fingerprint_tracker import fingerprint_tracker
+from web_scraping_utility import web_scraping_utility
+
+logger = logs.logger.RecordingLogger()
+
+ISSUE_LIST_HTML = """<html><head><title>componentid:898075 - Buganizer</title></head><body>
+<table><thead><tr><th>ID</th><th>Assignee</th><th>Modified</th><th>Comments</th></tr></thead>
+<tbody>
+<tr data-row-id="1"><td>1</td><td>automation@google.com</td><td>Oct 1</td><td>2</td></tr>
+<tr data-row-id="2"><td>2</td><td>reporter@google.com</td><td>Oct 2</td><td>5</td></tr>
+</tbody></table></body></html>"""
+
+class FakeDriver():
+  """A stand-in for the selenium web driver that serves a fixed page."""
+  def __init__(self, page_source, title="componentid:898075 - Buganizer"):
+    self.page_source = page_source
+    self.title = title
+
+  def get(self, url):
+    """Pretend to load the url."""
+
+  def get_cookies(self):
+    """Returns:
+        list: no cookies
+    """
+    return []
+
+class TestsFingerprintTracker(unittest.TestCase):
+  """Test methods from fingerprint_tracker.py
+
+  Args:
+    unittest (unittest.TestCase): unittest Testcase
+  """
+  def test_unvisited_issue_needs_visit(self):
+    """Test needs_visit() for an issue that was never visited.
+    Assert that the issue needs a visit.
+    """
+    tracker = fingerprint_tracker.FingerprintTracker()
+    tracker.observe("issue", ("Oct 1", "2", "user"))
+    assert tracker.needs_visit("issue")
+
+  def test_unchanged_issue_is_skipped(self):
+    """Test filter_changed() for an issue whose fingerprint did not change.
+    Assert that the issue is skipped and counted.
+    """
+    tracker = fingerprint_tracker.FingerprintTracker()
+    tracker.observe("issue", ("Oct 1", "2", "user"))
+    tracker.mark_visited("issue")
+    assert list(tracker.filter_changed(["issue"])) == []
+    assert tracker.skipped_count == 1 and tracker.visited_count == 0
+
+  def test_changed_issue_is_visited(self):
+    """Test filter_changed() for an issue that received a new comment.
+    Assert that the issue is visited again.
+    """
+    tracker = fingerprint_tracker.FingerprintTracker()
+    tracker.observe("issue", ("Oct 1", "2", "user"))
+    tracker.mark_visited("issue")
+    tracker.observe("issue", ("Oct 1", "3", "user"))
+    assert list(tracker.filter_changed(["issue"])) == ["issue"]
+    assert tracker.visited_count == 0
+    tracker.record_visited("issue")
+    assert tracker.visited_count == 1 and not tracker.needs_visit("issue")
+
+  def test_missing_fingerprint_columns(self):
+    """Test needs_visit() when no fingerprint column is on the issue list page.
+    Assert that the issue is always visited.
+    """
+    tracker = fingerprint_tracker.FingerprintTracker()
+    tracker.observe("issue", (None, None, None))
+    tracker.mark_visited("issue")
+    assert tracker.needs_visit("issue")
+
+  def test_scrape_issues_fingerprints(self):
+    """Test scrape_issues() with an issue list page holding the fingerprint columns.
+    Assert that every issue is fingerprinted from its row.
+    """
+    web_driver = web_scraping_utility.WebScrapingUtility(logger)
+    web_driver.driver = FakeDriver(ISSUE_LIST_HTML)
+    issues = web_driver.scrape_issues("url")
+    observed = web_driver.fingerprint_tracker.observed_fingerprints
+    assert observed[issues[0]] == ("Oct 1", "2", "automation@google.com")
+    assert observed[issues[1]] == ("Oct 2", "5", "reporter@google.com")
+
+  def test_unread_issue_is_visited_again(self):
+    """Test visiting an issue when no web driver session is left to read it.
+    Assert that its fingerprint is not remembered, so the next pass visits it again.
+    """
+    web_driver = web_scraping_utility.WebScrapingUtility(logger)
+    web_driver.http_page_reader = None
+    web_driver.fingerprint_tracker.observe("issue", ("Oct 1", "2", "user"))
+    web_driver.visit_pooled_issue("issue")
+    assert web_driver.fingerprint_tracker.needs_visit("issue")
+    assert web_driver.fingerprint_tracker.visited_count == 0
+
+  def test_issues_off_the_list_are_dropped(self):
+    """Test prune_unseen() after a pass which no longer found one of two issues.
+    Assert that only the fingerprints of the issue still on the list are kept.
+    """
+    tracker = fingerprint_tracker.FingerprintTracker()
+    for issue in ("open", "closed"):
+      tracker.observe(issue, ("Oct 1", "2", "user"))
+      tracker.mark_visited(issue)
+    tracker.reset_counts()
+    tracker.observe("open", ("Oct 1", "2", "user"))
+    tracker.prune_unseen()
+    assert set(tracker.observed_fingerprints) == {"open"}
+    assert set(tracker.visited_fingerprints) == {"open"}
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,61 @@
+"""Test file for html_parser.py"""
+import unittest
+from benchmark import fixture_pages
+from parsed_page import parsed_page
+from web_scraping_utility import html_parser
+
+PAGES = [
+    fixture_pages.issue_list_page(["1", "2", "3"]),
+    fixture_pages.enqueue_rules_issue_page(changes_count=2, reporter_comments=2,
+                                           other_comments=2),
+    fixture_pages.queue_info_issue_page(),
+    fixture_pages.routing_targets_issue_page(),
+]
+
+def read_page(page):
+  """Read everything the scrapers use from a parsed page.
+
+  Args:
+      page (parsed_page.ParsedPage): the parsed page
+
+  Returns:
+      tuple: the values read from the page
+  """
+  return (page.title(), page.table_header_titles(), page.table_rows(),
+          page.component_link_texts(), page.comments(), page.metadata_fields(),
+          page.metadata_lists())
+
+class TestsHtmlParser(unittest.TestCase):
+  """Test methods from html_parser.py
+
+  Args:
+    unittest (unittest.TestCase): unittest Testcase
+  """
+  def test_backends_agree(self):
+    """Test every installed parser backend on the fixture pages.
+    Assert that every backend reads the same values as the html.parser fallback.
+    """
+    for source_html in PAGES:
+      expected = read_page(parsed_page.ParsedPage(source_html, "html.parser"))
+      for parser in html_parser.available_parsers():
+        assert read_page(parsed_page.ParsedPage(source_html, parser)) == expected, parser
+
+  def test_issue_list_tags(self):
+    """Test parsing only parsed_page.ISSUE_LIST_TAGS of an issue list page with filler.
+    Assert that every backend reads the same title and table as a full parse.
+    """
+    source_html = fixture_pages.issue_list_page(["1", "2", "3"], filler_nodes=10)
+    full_page = parsed_page.ParsedPage(source_html, "html.parser")
+    expected = (full_page.title(), full_page.table_header_titles(), full_page.table_rows())
+    for parser in html_parser.available_parsers():
+      page = parsed_page.ParsedPage(source_html, parser, parsed_page.ISSUE_LIST_TAGS)
+      assert (page.title(), page.table_header_titles(), page.table_rows()) == expected, parser
+
+  def test_select_parser_fallback(self):
+    """Test select_parser() when no preferred backend is installed.
+    Assert that the html.parser fallback is selected.
+    """
+    assert html_parser.select_parser(("not-installed",)) == "html.parser"
+
+if __name__ == '__main__':
+  unittest.main()
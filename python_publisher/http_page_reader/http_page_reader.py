@@ -0,0 +1,91 @@
+"""This module holds the HttpPageReader class which reads Buganizer pages through a pooled,
+keep-alive HTTP session instead of a Chrome browser. The session is authenticated with the
+cookies of the selenium web driver, which loaded the Chrome profile. The requests library
+is only imported once the first page is read, so it does not slow down the start.
+"""
+import constants
+
+class HttpPageReader():
+  """Reads the html of Buganizer pages over HTTP. Any failure returns None so the
+  caller can fall back to the selenium web driver.
+  """
+
+  def __init__(self, logger):
+    """Setup the HttpPageReader
+
+    Args:
+        logger (logs.logger.Logger): the systems error logger
+    """
+    self.logger = logger
+    self._session = None
+
+  def session(self):
+    """Get the pooled HTTP session, creating it on first use.
+
+    Returns:
+        requests.Session: the HTTP session
+    """
+    if self._session is None:
+      import requests
+      from requests import adapters
+
+      self._session = requests.Session()
+      adapter = adapters.HTTPAdapter(pool_connections=1,
+                                     pool_maxsize=constants.HTTP_POOL_SIZE)
+      self._session.mount("https://", adapter)
+      self._session.mount("http://", adapter)
+    return self._session
+
+  def load_cookies(self, cookies):
+    """Authenticate the HTTP session with the cookies of a selenium web driver session.
+
+    Args:
+        cookies (list): the cookie dictionaries returned by driver.get_cookies()
+    """
+    session = self.session()
+    for cookie in cookies:
+      session.cookies.set(cookie["name"], cookie["value"],
+                          domain=cookie.get("domain", ""), path=cookie.get("path", "/"))
+
+  def get_page(self, url, marker):
+    """Read the html of a page over HTTP.
+
+    Args:
+        url (str): the url of the page
+        marker (str): text that only appears on the page once it is fully served, used
+                      to detect login redirects and pages which need a browser to render
+
+    Returns:
+        str: the html of the page, or None if the page could not be read over HTTP
+    """
+    session = self.session()
+    import requests
+
+    try:
+      response = session.get(url, timeout=constants.HTTP_TIMEOUT_SEC)
+    except requests.exceptions.RequestException as error:
+      self.log_fallback(url, "the request failed: " + str(error))
+      return None
+
+    if response.status_code != 200:
+      self.log_fallback(url, "the server answered with status " + str(response.status_code))
+      return None
+    if marker not in response.text:
+      self.log_fallback(url, "the page does not hold '" + marker + "', it may be a login "\
+        "redirect or need a browser to render")
+      return None
+    return response.text
+
+  def log_fallback(self, url, reason):
+    """Log why a page could not be read over HTTP and is read with the web driver.
+
+    Args:
+        url (str): the url of the page
+        reason (str): why the HTTP read failed
+    """
+    self.logger.log("INFO: Reading " + url + " with the web driver, " + reason + ".\n")
+
+  def close(self):
+    """Close every pooled connection of the HTTP session, if it was created."""
+    if self._session is not None:
+      self._session.close()
@@ -0,0 +1,118 @@
+"""Test file for http_page_reader.py"""
+import unittest
+import logs.logger
+from benchmark import fixture_pages
+from benchmark import fixture_server
+from http_page_reader import http_page_reader
+from web_scraping_utility import web_scraping_utility
+
+logger = logs.logger.RecordingLogger()
+
+PAGES = {
+    "/issues?q=componentid:898075": fixture_pages.issue_list_page(["1", "2", "3"]),
+    "/issues/1": fixture_pages.queue_info_issue_page(),
+    "/login": "<html><head><title>MOMA Single Sign On</title></head></html>",
+}
+
+class CountingScheduler():
+  """A stand-in for the polling scheduler which counts the page loads."""
+  def __init__(self):
+    self.page_loads = 0
+    self.http_reads = 0
+
+  def acquire_page_load(self, over_http=False):
+    """Record a page load."""
+    if over_http:
+      self.http_reads += 1
+    else:
+      self.page_loads += 1
+
+class TestsHttpPageReader(unittest.TestCase):
+  """Test methods from http_page_reader.py
+
+  Args:
+    unittest (unittest.TestCase): unittest Testcase
+  """
+  def test_get_page(self):
+    """Test get_page() for a page holding the marker.
+    Assert that the html of the page is returned.
+    """
+    reader = http_page_reader.HttpPageReader(logger)
+    with fixture_server.FixtureServer(PAGES) as server:
+      page = reader.get_page(server.base_url + "/issues/1",
+                             web_scraping_utility.ISSUE_PAGE_MARKER)
+    reader.close()
+    assert page == PAGES["/issues/1"]
+
+  def test_get_page_failures(self):
+    """Test get_page() for a missing page, a login page and an unreachable server.
+    Assert that None is returned so the caller falls back to selenium, and that the reason
+    of every fallback is logged.
+    """
+    recording_logger = logs.logger.RecordingLogger()
+    reader = http_page_reader.HttpPageReader(recording_logger)
+    with fixture_server.FixtureServer(PAGES) as server:
+      missing_page = reader.get_page(server.base_url + "/issues/404", "<tbody")
+      login_page = reader.get_page(server.base_url + "/login", "<tbody")
+    unreachable_page = reader.get_page(server.base_url + "/issues/1", "<tbody")
+    reader.close()
+    assert missing_page is None and login_page is None and unreachable_page is None
+    assert len(recording_logger.messages) == 3
+    assert "status 404" in recording_logger.messages[0]
+    assert "does not hold '<tbody'" in recording_logger.messages[1]
+
+  def test_scrape_issues_without_browser(self):
+    """Test scrape_issues() in the http read mode without a web driver.
+    Assert that every issue on the issue list page is found.
+    """
+    web_driver = web_scraping_utility.WebScrapingUtility(logger)
+    web_driver.http_page_reader = http_page_reader.HttpPageReader(logger)
+    with fixture_server.FixtureServer(PAGES) as server:
+      issues = web_driver.scrape_issues(server.base_url + "/issues?q=componentid:898075")
+    web_driver.quit_scrape()
+    assert issues == [fixture_pages.ISSUE_URL + issue_id for issue_id in ["1", "2", "3"]]
+
+  def test_http_reads_are_rate_limited(self):
+    """Test reading the issue list and an issue over HTTP with a polling scheduler.
+    Assert that every read is counted against the HTTP read limit.
+    """
+    scheduler = CountingScheduler()
+    web_driver = web_scraping_utility.WebScrapingUtility(logger, scheduler)
+    web_driver.http_page_reader = http_page_reader.HttpPageReader(logger)
+    with fixture_server.FixtureServer(PAGES) as server:
+      web_driver.scrape_issues(server.base_url + "/issues?q=componentid:898075")
+      web_driver.visit_issue(server.base_url + "/issues/404")
+    web_driver.quit_scrape()
+    #The two pages of the issue list, the second one missing, and the issue
+    assert scheduler.http_reads == 3 and scheduler.page_loads == 0
+
+  def test_scrape_issue_pages(self):
+    """Test scrape_issue_pages() over several pages of the issue list.
+    Assert that the issues of every page are yielded in order and that reading stops
+    at the last, shorter page.
+    """
+    list_path = "/issues?q=componentid:898075"
+    pages = {
+        list_path: fixture_pages.issue_list_page(["6", "5"]),
+        list_path + "&p=page:2": fixture_pages.issue_list_page(["4", "3"]),
+        list_path + "&p=page:3": fixture_pages.issue_list_page(["2"]),
+        list_path + "&p=page:4": fixture_pages.issue_list_page(["1"]),
+    }
+    web_driver = web_scraping_utility.WebScrapingUtility(logger)
+    web_driver.http_page_reader = http_page_reader.HttpPageReader(logger)
+    with fixture_server.FixtureServer(pages) as server:
+      issues = list(web_driver.scrape_issue_pages(server.base_url + list_path))
+    web_driver.quit_scrape()
+    assert issues == [fixture_pages.ISSUE_URL + issue_id for issue_id in "65432"]
+
+  def test_scrape_issue_page_without_config_type(self):
+    """Test scrape_issue_page() for a page without a component path link.
+    Assert that the page is reported as unscraped so selenium is used instead.
+    """
+    web_driver = web_scraping_utility.WebScrapingUtility(logger)
+    issue = fixture_pages.ISSUE_URL + "1"
+    page = fixture_pages.queue_info_issue_page().replace("componentid", "hotlistid")
+    assert not web_driver.scrape_issue_page(issue, page)
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,131 @@
+"""This module holds the IssueStateStore class which persists the state the publisher keeps
+for every open Buganizer issue in a local SQLite database: the number of comments already
+parsed on the issue and the hashes of the configuration change requests already published
+for it. After a restart, the comments and requests that were already handled are not
+published again. Only the latest request published for an issue is kept, so an issue
+changed back to an earlier request is published again.
+"""
+import hashlib
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS comment_cursors (
+  issue TEXT PRIMARY KEY,
+  comments_count INTEGER NOT NULL,
+  updated_time REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS published_requests (
+  issue TEXT PRIMARY KEY,
+  request_hash TEXT NOT NULL,
+  published_time REAL NOT NULL
+);
+"""
+
+def request_hash(proto):
+  """Hash a configuration change request.
+
+  Args:
+      proto (config_change_pb2.ConfigChangeRequest): the configuration change request
+
+  Returns:
+      str: the hex SHA-256 digest of the serialized request
+  """
+  return hashlib.sha256(proto.SerializeToString(deterministic=True)).hexdigest()
+
+class IssueStateStore():
+  """Persists per-issue comment cursors and latest published request hashes. Every update is
+  committed immediately to a write-ahead logged database, so a crash loses no update
+  that returned.
+  """
+
+  def __init__(self, path=":memory:"):
+    """Open the store, creating the database if needed.
+
+    Args:
+        path (str): the path of the SQLite database, an in-memory database by default
+    """
+    self._lock = threading.Lock()
+    self._connection = sqlite3.connect(path, check_same_thread=False)
+    if path != ":memory:":
+      self._connection.execute("PRAGMA journal_mode=WAL")
+      self._connection.execute("PRAGMA synchronous=NORMAL")
+    self._connection.executescript(SCHEMA)
+
+  def comment_counts(self):
+    """Load every comment cursor.
+
+    Returns:
+        dict: the number of comments already parsed, keyed by the URL of the issue
+    """
+    with self._lock:
+      return dict(self._connection.execute(
+          "SELECT issue, comments_count FROM comment_cursors"))
+
+  def set_comment_count(self, issue, comments_count):
+    """Record the number of comments parsed on an issue.
+
+    Args:
+        issue (str): the URL of the Buganizer issue
+        comments_count (int): the number of comments already parsed
+    """
+    with self._lock, self._connection:
+      self._connection.execute(
+          "INSERT OR REPLACE INTO comment_cursors VALUES (?, ?, ?)",
+          (issue, comments_count, time.time()))
+
+  def is_published(self, issue, proto_hash):
+    """Check whether a configuration change request is the latest one published for an
+    issue.
+
+    Args:
+        issue (str): the URL of the Buganizer issue
+        proto_hash (str): the hash of the request, see request_hash()
+
+    Returns:
+        bool: True if the request is the latest one published for the issue
+    """
+    with self._lock:
+      return self._connection.execute(
+          "SELECT 1 FROM published_requests WHERE issue = ? AND request_hash = ?",
+          (issue, proto_hash)).fetchone() is not None
+
+  def record_published(self, issue, proto_hash):
+    """Record that a configuration change request was published for an issue, replacing
+    the request published before it.
+
+    Args:
+        issue (str): the URL of the Buganizer issue
+        proto_hash (str): the hash of the request, see request_hash()
+    """
+    with self._lock, self._connection:
+      self._connection.execute(
+          "INSERT OR REPLACE INTO published_requests VALUES (?, ?, ?)",
+          (issue, proto_hash, time.time()))
+
+  def evict_closed_issues(self, open_issues):
+    """Delete the state of every issue which is no longer open.
+
+    Args:
+        open_issues (list): the URLs of the open Buganizer issues
+
+    Returns:
+        int: the number of comment cursors deleted
+    """
+    with self._lock, self._connection:
+      self._connection.execute("CREATE TEMP TABLE IF NOT EXISTS open_issues (issue TEXT)")
+      self._connection.execute("DELETE FROM open_issues")
+      self._connection.executemany("INSERT INTO open_issues VALUES (?)",
+                                   [(issue,) for issue in open_issues])
+      evicted_count = self._connection.execute(
+          "DELETE FROM comment_cursors WHERE issue NOT IN (SELECT issue FROM open_issues)"
+          ).rowcount
+      self._connection.execute(
+          "DELETE FROM published_requests WHERE issue NOT IN (SELECT issue FROM open_issues)")
+    return evicted_count
+
+  def close(self):
+    """Close the database."""
+    with self._lock:
+      self._connection.close()
@@ -0,0 +1,94 @@
+"""Test file for issue_state_store.py"""
+from concurrent import futures
+import os
+import tempfile
+import unittest
+import logs.logger
+from benchmark import fixture_pages
+from config_change_request import config_change_request
+from issue_state_store import issue_state_store
+from message_parsing_utility import message_parsing_utility
+from parsed_page import parsed_page
+
+logger = logs.logger.RecordingLogger()
+
+class TestsIssueStateStore(unittest.TestCase):
+  """Test methods from issue_state_store.py
+
+  Args:
+    unittest (unittest.TestCase): unittest Testcase
+  """
+  def setUp(self):
+    self.directory = tempfile.TemporaryDirectory()
+    self.path = os.path.join(self.directory.name, "issue_state.db")
+
+  def tearDown(self):
+    self.directory.cleanup()
+
+  def test_state_survives_restart(self):
+    """Test reopening the store.
+    Assert that the comment cursors and published requests are loaded again.
+    """
+    store = issue_state_store.IssueStateStore(self.path)
+    store.set_comment_count("issue", 3)
+    store.record_published("issue", "hash")
+    store.close()
+
+    store = issue_state_store.IssueStateStore(self.path)
+    assert store.comment_counts() == {"issue": 3}
+    assert store.is_published("issue", "hash")
+    assert not store.is_published("issue", "other hash")
+    store.close()
+
+  def test_only_latest_request_is_published(self):
+    """Test an issue whose request changes and then changes back.
+    Assert that only the latest request counts as published, so the earlier request is
+    published again.
+    """
+    store = issue_state_store.IssueStateStore(self.path)
+    store.record_published("issue", "A")
+    store.record_published("issue", "B")
+    assert store.is_published("issue", "B")
+    assert not store.is_published("issue", "A")
+    store.close()
+
+  def test_evict_closed_issues(self):
+    """Test evict_closed_issues() after an issue was closed.
+    Assert that only the state of the open issue is kept.
+    """
+    store = issue_state_store.IssueStateStore(self.path)
+    for issue in ("open", "closed"):
+      store.set_comment_count(issue, 1)
+      store.record_published(issue, "hash")
+    assert store.evict_closed_issues(["open"]) == 1
+    assert store.comment_counts() == {"open": 1}
+    assert not store.is_published("closed", "hash")
+    store.close()
+
+  def test_comments_not_republished_after_restart(self):
+    """Test parsing an EnqueueRules issue again after a restart.
+    Assert that its comments are published only once.
+    """
+    published = []
+    publish = config_change_request.ConfigurationTypeFactory.publish
+    def publish_now(factory, proto):
+      published.append(proto)
+      confirmation = futures.Future()
+      confirmation.set_result(str(len(published)))
+      return confirmation
+
+    config_change_request.ConfigurationTypeFactory.publish = publish_now
+    try:
+      page = parsed_page.ParsedPage(fixture_pages.enqueue_rules_issue_page(
+          changes_count=1, reporter_comments=1, other_comments=1))
+      for _ in range(2):
+        store = issue_state_store.IssueStateStore(self.path)
+        message_parsing_util = message_parsing_utility.MessageParsingUtility(logger, store)
+        message_parsing_util.parse_page(page, fixture_pages.REPORTER, fixture_pages.ISSUE_URL)
+        store.close()
+    finally:
+      config_change_request.ConfigurationTypeFactory.publish = publish
+    assert len(published) == 1
+
+if __name__ == '__main__':
+  unittest.main()
@@ -26,3 +26,17 @@ class Logger():
     """
     error_message = str(datetime.now()) + "  " + error_message
     self.logger.error(error_message)
+
+class RecordingLogger():
+  """Keeps the logged messages in memory instead of writing a log file, for the tests."""
+
+  def __init__(self):
+    self.messages = []
+
+  def log(self, error_message):
+    """Keep a message.
+
+    Args:
+        error_message (str): the message to keep
+    """
+    self.messages.append(error_message)
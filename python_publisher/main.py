@@ -1,7 +1,16 @@
 """This module holds the System class which completes any necessary setup for scraping.
 """
+import functools
 import constants
 import logs.logger
+from config_change_request import config_change_pb2
+from issue_state_store import issue_state_store
+from message_parsing_utility import message_parsing_utility
+from polling_scheduler import polling_scheduler
+from publish_queue import publish_queue
+from pubsub_publisher import pubsub_publisher
+from request_spool import request_spool
+from validation_index import validation_index
 from web_scraping_utility import web_scraping_utility
 
 class System():
@@ -9,19 +18,102 @@ class System():
 
   def __init__(self):
     logger = logs.logger.Logger()
-    self.web_scraping_util = web_scraping_utility.WebScrapingUtility(logger)
+    self.logger = logger
+    pubsub_publisher.set_publisher(pubsub_publisher.PubSubPublisher(logger=logger))
+    self.spool = request_spool.RequestSpool(constants.SPOOL_PATH)
+    requests = publish_queue.PublishQueue(logger=logger, spool=self.spool)
+    publish_queue.set_publish_queue(requests)
+    self.scheduler = polling_scheduler.PollingScheduler()
+    self.state_store = issue_state_store.IssueStateStore(constants.STATE_DB_PATH)
+    self.replay_spool(requests)
+    self.validation_index = self.setup_validation_index(logger)
+    validation_index.set_index(self.validation_index)
+    self.web_scraping_util = web_scraping_utility.WebScrapingUtility(logger, self.scheduler,
+                                                                     self.state_store)
+
+  def setup_validation_index(self, logger):
+    """Setup the index of the Historical Traffic Database the changes of EnqueueRules
+    requests are checked against. The database is opened and the index loaded by the first
+    pass. Until the index is loaded, requests are published without checking their queues
+    and features, and failures to open the database are logged by every refresh.
+
+    Args:
+      logger (logs.logger.Logger): the systems error logger
+
+    Returns:
+      validation_index.ValidationIndex: the index, or None if requests are not checked
+    """
+    if constants.SPANNER_INSTANCE_ID is None:
+      return None
+    return validation_index.ValidationIndex(validation_index.SpannerIndexSource(), logger)
+
+  def replay_spool(self, requests):
+    """Publish the requests left unconfirmed by the previous run, and record them in the
+    state store once confirmed so they are not published again.
+
+    Args:
+      requests (publish_queue.PublishQueue): the publish queue with the spool
+    """
+    replayed_requests = requests.replay_spool()
+    if replayed_requests:
+      self.logger.log("INFO: Replaying " + str(len(replayed_requests)) + " unconfirmed "\
+        "requests from the spool.\n")
+    for issue_id, data, confirmation in replayed_requests:
+      proto_hash = issue_state_store.request_hash(
+          config_change_pb2.ConfigChangeRequest.FromString(data))
+      confirmation.add_done_callback(functools.partial(
+          self.record_replayed, message_parsing_utility.ISSUE_URL_PREFIX + issue_id,
+          proto_hash))
+
+  def record_replayed(self, issue, proto_hash, confirmation):
+    """Record a replayed request in the state store once it is confirmed.
+
+    Args:
+      issue (str): the URL of the Buganizer issue of the request
+      proto_hash (str): the hash of the request, see issue_state_store.request_hash()
+      confirmation (concurrent.futures.Future): the confirmation future of the request
+    """
+    if confirmation.exception() is None:
+      self.state_store.record_published(issue, proto_hash)
+
+  def log_pass_stats(self, fingerprints):
+    """Log the number of issues visited and skipped by a pass and the publish statistics.
+
+    Args:
+      fingerprints (fingerprint_tracker.FingerprintTracker): the fingerprints of the pass
+    """
+    self.logger.log("INFO: Visited " + str(fingerprints.visited_count) + " issues, skipped " + \
+      str(fingerprints.skipped_count) + " unchanged issues.\n")
+    publish_stats = pubsub_publisher.get_publisher().stats()
+    if publish_stats["p50_latency_ms"] is not None:
+      self.logger.log("INFO: Published " + str(publish_stats["published"]) + " requests, " + \
+        str(publish_stats["failed"]) + " failed, p50 latency " + \
+        str(round(publish_stats["p50_latency_ms"])) + " ms, p99 latency " + \
+        str(round(publish_stats["p99_latency_ms"])) + " ms, " + \
+        str(publish_queue.get_publish_queue().depth()) + " requests still queued.\n")
 
   def begin_scrape(self, url):
-    """Begins the proccess of scraping Buganizer.
+    """Begins the proccess of scraping Buganizer. Passes are spaced out by the
+    polling scheduler, which backs off while nothing changes.
 
     Args:
       url (str): the Buganizer url to scrape
     """
     while True:
-      issues = self.web_scraping_util.scrape_issues(url)
+      if self.validation_index:
+        self.validation_index.refresh()
+      fingerprints = self.web_scraping_util.fingerprint_tracker
+      fingerprints.reset_counts()
+
+      #Issues are visited while the next pages of the issue list are read
+      issues = self.web_scraping_util.scrape_issue_pages(url)
+      self.web_scraping_util.visit_all_issues_in_list(issues)
+      fingerprints.prune_unseen()
+      if fingerprints.visited_count + fingerprints.skipped_count > 0:
+        self.log_pass_stats(fingerprints)
 
-      if len(issues) > 0:
-        self.web_scraping_util.visit_all_issues_in_list(issues)
+      self.scheduler.record_pass(fingerprints.visited_count > 0)
+      self.scheduler.wait_for_next_pass()
 
 if __name__ == "__main__":
   system = System()
@@ -0,0 +1,22 @@
+"""Test file for main.py"""
+import os
+import unittest
+from benchmark import startup_benchmark
+
+class TestsMain(unittest.TestCase):
+  """Test the startup of main.py
+
+  Args:
+    unittest (unittest.TestCase): unittest Testcase
+  """
+  def test_heavy_dependencies_are_deferred(self):
+    """Test importing main in a fresh interpreter.
+    Assert that no dependency which is imported on first use is imported at startup.
+    """
+    imported_modules = startup_benchmark.import_times(
+        "main", os.path.dirname(os.path.abspath(__file__)))
+    assert "main" in imported_modules
+    assert not set(startup_benchmark.DEFERRED_MODULES) & set(imported_modules)
+
+if __name__ == "__main__":
+  unittest.main()
@@ -3,20 +3,83 @@ reporters comments on a given issue.
 """
 import constants
 from config_change_request import config_change_request
+from enqueue_rules_parser import enqueue_rules_parser
+from issue_state_store import issue_state_store
+from publish_queue import publish_queue
+from request_deduplicator import request_deduplicator
+
+ISSUE_URL_PREFIX = "https://b.corp.google.com/issues/"
 
 class MessageParsingUtility():
   """Responsible for parsing the source html and the
   reporters comments on a given issue"""
 
-  def __init__(self, logger):
+  def __init__(self, logger, state_store=None, fingerprint_tracker=None):
     """Setup the MessageParsingUtility
 
     Args:
         logger (logs.logger.Logger): the systems error logger
+        state_store (issue_state_store.IssueStateStore): persists the comment cursors and
+                                                         published requests of each issue,
+                                                         kept in memory by default
+        fingerprint_tracker (fingerprint_tracker.FingerprintTracker): forgets the
+                                                                      fingerprint of an
+                                                                      issue whose request
+                                                                      failed, if given
     """
-    self.issue_comments_counts = {}
+    self.state_store = state_store or issue_state_store.IssueStateStore()
+    self.fingerprint_tracker = fingerprint_tracker
+    self.deduplicator = request_deduplicator.RequestDeduplicator()
+    self.issue_comments_counts = self.state_store.comment_counts()
     self.logger = logger
 
+  def evict_closed_issues(self, open_issues):
+    """Forget the comment cursors and published requests of every issue which is no
+    longer open.
+
+    Args:
+        open_issues (list): the URLs of the open Buganizer issues
+    """
+    self.state_store.evict_closed_issues(open_issues)
+    open_issues = set(open_issues)
+    for issue in list(self.issue_comments_counts):
+      if issue not in open_issues:
+        del self.issue_comments_counts[issue]
+
+  def publish_once(self, factory, proto, issue):
+    """Publish a configuration change request unless it is the same as the latest request
+    published for the issue. Unchanged requests of recently published issues are skipped
+    in memory, older ones are compared with the latest request in the state store. The
+    request is recorded as the latest one of the issue in the state store once it is
+    confirmed. If it fails, the issue is visited again by the next pass to build it again.
+
+    Only QueueInfo and RoutingTargets requests, which are built again from the issue
+    fields on every visit, go through this check.
+
+    Args:
+        factory (config_change_request.ConfigurationTypeFactory): the factory which made
+                                                                  the request
+        proto (config_change_pb2.ConfigChangeRequest): the configuration change request
+        issue (str): the URL of the Buganizer issue
+    """
+    proto_hash = issue_state_store.request_hash(proto)
+    if not self.deduplicator.claim(proto.issue_id, proto_hash):
+      return
+    if self.state_store.is_published(issue, proto_hash):
+      return
+    confirmation = factory.publish(proto)
+
+    def record_published(confirmation):
+      error = confirmation.exception()
+      if error is None:
+        self.state_store.record_published(issue, proto_hash)
+        return
+      self.deduplicator.release(proto.issue_id, proto_hash)
+      #A replaced request has a newer request of its issue in flight
+      if self.fingerprint_tracker and not isinstance(error, publish_queue.SupersededError):
+        self.fingerprint_tracker.forget(issue)
+    confirmation.add_done_callback(record_published)
+
   def publish_buganizer_fields(self, advanced_fields):
     """Create a RoutingTargets or QueueInfo ConfigChangeRequest object
     and publishes the proto object
@@ -29,21 +92,22 @@ class MessageParsingUtility():
     
     #This means template was valid and ready to send
     if config_change.proto is not None:
-      factory.publish(config_change.proto)
+      self.publish_once(factory, config_change.proto,
+                        ISSUE_URL_PREFIX + advanced_fields["Issue Id"])
     #Otherwise log what the problem with the template was
     else:
       self.logger.log(config_change.error_message)
 
-  def parse_page(self, soup, reporter, issue):
+  def parse_page(self, page, reporter, issue):
     """Parses the source html for the reporter and their comments from each
     of the issues under the given componentid. Once each comment is scraped, the message
     and reporter are sent to generate_message().
     Args:
-      soup (BeautifulSoup): the BeautifulSoup object of the Buganizer issue
+      page (parsed_page.ParsedPage): the parsed Buganizer issue
       reporter (str): the reporter of the Buganizer issue
       issue (str): the URL of the current Buganizer issue
     """
-    comments = soup.find_all("li", "bv2-event ng-star-inserted")
+    comments = page.comments()
     current_comments_count = len(comments)
 
     if issue not in self.issue_comments_counts.keys():
@@ -51,15 +115,11 @@ class MessageParsingUtility():
 
     if current_comments_count > self.issue_comments_counts[issue]:
       for i in range(self.issue_comments_counts[issue], current_comments_count):
-        user_comment = comments[i]
-        current_user = user_comment.find("span", "bv2-event-user-id")['data-hovercard-id']
-        if current_user == reporter:
-          comment_text_tag = user_comment.find("b-plain-format-unquoted-section",
-                                               "ng-star-inserted")
-          if comment_text_tag is not None:
-            comment = comment_text_tag.get_text(separator='\n')
-            self.generate_message(reporter, comment, issue)
+        current_user, comment = comments[i]
+        if current_user == reporter and comment is not None:
+          self.generate_message(reporter, comment, issue)
       self.issue_comments_counts[issue] = current_comments_count
+      self.state_store.set_comment_count(issue, current_comments_count)
 
   def generate_message(self, reporter, comment, issue):
     """Splits the reporter's comment and extracts all configuration change request.
@@ -71,10 +131,11 @@ class MessageParsingUtility():
       comment (str): the reporter's comment on the current Buganizer issue
       issue (str): the URL of the current Buganizer issue
     """
-    template = comment.splitlines()
+    template = enqueue_rules_parser.iter_lines(comment)
+    first_line = comment.partition("\n")[0].rstrip("\r")
     config_specifier_length = len(constants.CONFIGURATION_SPECIFIER)
-    config_specifier = template[0][:config_specifier_length]
-    config_change_type = template[0][config_specifier_length:]
+    config_specifier = first_line[:config_specifier_length]
+    config_change_type = first_line[config_specifier_length:]
     if config_specifier != constants.CONFIGURATION_SPECIFIER:
       error = "The following configuration change request from " + \
       issue + " is invalid. The configuraiton specifier in the template is not correct. "\
@@ -96,7 +157,8 @@ class MessageParsingUtility():
       self.logger.log(error)
       return
 
-    #This means template was valid and ready to send
+    #This means template was valid and ready to send. Every comment is parsed once, so an
+    #identical template posted again by the reporter is a new request and is published
     if config_change.proto is not None:
       factory.publish(config_change.proto)
     #Otherwise log what the problem with the template was
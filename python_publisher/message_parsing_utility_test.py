@@ -0,0 +1,84 @@
+"""Test file for message_parsing_utility.py"""
+from concurrent import futures
+import unittest
+import logs.logger
+from benchmark import fixture_pages
+from config_change_request import config_change_pb2
+from config_change_request import config_change_request
+from fingerprint_tracker import fingerprint_tracker
+from message_parsing_utility import message_parsing_utility
+from parsed_page import parsed_page
+
+logger = logs.logger.RecordingLogger()
+
+class TestsMessageParsingUtility(unittest.TestCase):
+  """Test methods from message_parsing_utility.py
+
+  Args:
+    unittest (unittest.TestCase): unittest Testcase
+  """
+  def setUp(self):
+    self.published = []
+    self.publish = config_change_request.ConfigurationTypeFactory.publish
+
+    #The error of every publish, None for confirmed publishes
+    self.publish_errors = []
+
+    def publish_now(factory, proto):
+      self.published.append(proto)
+      confirmation = futures.Future()
+      error = self.publish_errors.pop(0) if self.publish_errors else None
+      if error is None:
+        confirmation.set_result(str(len(self.published)))
+      else:
+        confirmation.set_exception(error)
+      return confirmation
+
+    config_change_request.ConfigurationTypeFactory.publish = publish_now
+    self.fingerprints = fingerprint_tracker.FingerprintTracker()
+    self.message_parsing_util = message_parsing_utility.MessageParsingUtility(
+        logger, fingerprint_tracker=self.fingerprints)
+
+  def tearDown(self):
+    config_change_request.ConfigurationTypeFactory.publish = self.publish
+
+  def test_request_changed_back_is_published(self):
+    """Test an issue whose request changes and then changes back to the first request.
+    Assert that every change is published and an unchanged request is not.
+    """
+    factory = config_change_request.ConfigurationTypeFactory()
+    for queue in (1, 2, 2, 1):
+      proto = config_change_pb2.ConfigChangeRequest(issue_id="1", config_type="QueueInfo")
+      proto.queue_info.queue_id = queue
+      self.message_parsing_util.publish_once(factory, proto, fixture_pages.ISSUE_URL + "1")
+    assert [proto.queue_info.queue_id for proto in self.published] == [1, 2, 1]
+
+  def test_failed_request_is_built_again(self):
+    """Test a request whose publish fails for good.
+    Assert that its issue is visited again by the next pass and the same request is
+    published again.
+    """
+    issue = fixture_pages.ISSUE_URL + "1"
+    self.fingerprints.observe(issue, ("Oct 1", "2", "user"))
+    self.fingerprints.mark_visited(issue)
+    self.publish_errors.append(RuntimeError("failed"))
+    factory = config_change_request.ConfigurationTypeFactory()
+    for _ in range(2):
+      proto = config_change_pb2.ConfigChangeRequest(issue_id="1", config_type="QueueInfo")
+      proto.queue_info.queue_id = 1
+      self.message_parsing_util.publish_once(factory, proto, issue)
+    assert self.fingerprints.needs_visit(issue)
+    assert len(self.published) == 2
+
+  def test_repeated_enqueue_rules_template_is_published(self):
+    """Test an EnqueueRules template posted twice by the reporter.
+    Assert that both comments are published.
+    """
+    page = parsed_page.ParsedPage(fixture_pages.enqueue_rules_issue_page(
+        changes_count=1, reporter_comments=2))
+    self.message_parsing_util.parse_page(page, fixture_pages.REPORTER, fixture_pages.ISSUE_URL)
+    assert len(self.published) == 2
+    assert self.published[0] == self.published[1]
+
+if __name__ == "__main__":
+  unittest.main()
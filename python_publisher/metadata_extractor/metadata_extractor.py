@@ -0,0 +1,61 @@
+"""This module holds the MetadataExtractor class which maps the issue metadata of a parsed
+Buganizer issue to typed advanced field values, following a declarative table such as
+constants.QUEUE_INFO_METADATA or constants.ROUTING_TARGETS_METADATA.
+"""
+
+#Converters from the text of a metadata value to its typed value
+VALUE_CONVERTERS = {
+    "str": str,
+    "int": int,
+    #Yes/No select fields
+    "yes_no": lambda value: value == "Yes",
+    #true/false checkbox fields
+    "true_false": lambda value: value == "true",
+    "int_list": lambda values: [int(value) for value in values],
+}
+
+class MetadataExtractor():
+  """Extracts the advanced fields of one configuration type from a parsed Buganizer issue."""
+
+  def __init__(self, metadata_table, mapper=None):
+    """Setup the MetadataExtractor
+
+    Args:
+        metadata_table (dict): the value type of each scraped metadata field, keyed by the
+                               field class or, for '_list' types, by the metadata list name
+        mapper (field_mapper.FieldMapper): if given, only fields which the mapper sends in
+                                           the ConfigChangeRequest are extracted
+    """
+    self.mapper = mapper
+    self.fields = []
+    self.lists = []
+    for key, value_type in metadata_table.items():
+      if value_type.endswith("_list"):
+        self.lists.append((key, VALUE_CONVERTERS[value_type]))
+      else:
+        self.fields.append((key, VALUE_CONVERTERS[value_type]))
+
+  def extract(self, page):
+    """Extract the advanced fields from a parsed Buganizer issue. Fields whose value
+    is 'empty' or which are not on the page are left out.
+
+    Args:
+        page (parsed_page.ParsedPage): the parsed Buganizer issue
+
+    Returns:
+        dict: the typed value of each advanced field, keyed by the field's display name
+    """
+    advanced_fields = {}
+    metadata_fields = page.metadata_fields()
+    for field_class, converter in self.fields:
+      if field_class not in metadata_fields:
+        continue
+      label, value = metadata_fields[field_class]
+      if value != "empty" and (self.mapper is None or self.mapper.has_field(label)):
+        advanced_fields[label] = converter(value)
+
+    metadata_lists = page.metadata_lists()
+    for list_name, converter in self.lists:
+      if self.mapper is None or self.mapper.has_field(list_name):
+        advanced_fields[list_name] = converter(metadata_lists.get(list_name, []))
+    return advanced_fields
@@ -0,0 +1,42 @@
+"""Test file for metadata_extractor.py"""
+import unittest
+import constants
+from benchmark import fixture_pages
+from metadata_extractor import metadata_extractor
+from parsed_page import parsed_page
+
+class TestsMetadataExtractor(unittest.TestCase):
+  """Test methods from metadata_extractor.py
+
+  Args:
+    unittest (unittest.TestCase): unittest Testcase
+  """
+  def test_extract_queue_info(self):
+    """Test extract() on a QueueInfo issue.
+    Assert that every field is found under its display name with its typed value.
+    """
+    extractor = metadata_extractor.MetadataExtractor(constants.QUEUE_INFO_METADATA)
+    page = parsed_page.ParsedPage(fixture_pages.queue_info_issue_page())
+    advanced_fields = extractor.extract(page)
+    assert advanced_fields == {
+        "Severity": "S2", "Found In": "1.0, 1.1", "In Prod": True,
+        "Verifier": "verifier@google.com", "Targeted To": "2.0", "Queue Id": 42,
+        "MDB group name": "hermes-mdb", "Ops Owner": "ops@google.com",
+        "GVO Owner": "gvo@google.com", "Tech Owner": "tech@google.com",
+        "Is Dashboard Queue": True, "Reviews per Item": 3, "Fragment Name": "fragment",
+        "Item Expiry (Sec)": 3600, "Is Experimental Review Enabled": False,
+        "Experimental Probability": 10}
+
+  def test_extract_routing_targets(self):
+    """Test extract() on a RoutingTargets issue with empty fields.
+    Assert that empty fields are left out and the queue lists are parsed.
+    """
+    extractor = metadata_extractor.MetadataExtractor(constants.ROUTING_TARGETS_METADATA)
+    page = parsed_page.ParsedPage(fixture_pages.routing_targets_issue_page())
+    advanced_fields = extractor.extract(page)
+    assert advanced_fields == {
+        "Severity": "S1", "In Prod": False, "Queue Id": 7,
+        "Add Queues to Route To": [11, 12], "Remove Queues to Route To": [13]}
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,107 @@
+"""This module holds the ParsedPage class which parses the source html of a Buganizer page
+once, so that every scraper and parser reading the page shares the same parsed document.
+"""
+from web_scraping_utility import html_parser
+
+METADATA_FIELD_CLASS = "bv2-issue-metadata-field-inner"
+METADATA_FIELD_CLASS_PREFIX = "bv2-issue-metadata-field-"
+#The only elements read from the issue list page
+ISSUE_LIST_TAGS = ("title", "thead", "tbody")
+
+class ParsedPage():
+  """The parsed source html of a Buganizer page."""
+
+  def __init__(self, source_html, parser=None, only_tags=None):
+    """Parse the source html of a Buganizer page.
+
+    Args:
+        source_html (str): the html of the Buganizer page
+        parser (str): the html parser backend to use, see html_parser.parse()
+        only_tags (tuple): if given, the only tags, with their contents, that are read
+                           from the page, eg. ISSUE_LIST_TAGS
+    """
+    self.source_html = source_html
+    self.document = html_parser.parse(source_html, parser, only_tags)
+    self._metadata_fields = None
+    self._metadata_lists = None
+
+  def title(self):
+    """Get the title of the page.
+
+    Returns:
+        str: the title of the page, or None if the page has no title
+    """
+    return self.document.title()
+
+  def table_header_titles(self):
+    """Get the column titles of the issue list table.
+
+    Returns:
+        list: the text of every header cell of the issue list table
+    """
+    return self.document.table_header_titles()
+
+  def table_rows(self):
+    """Get the rows of the issue list table.
+
+    Returns:
+        list: the (issue id, list of cell texts) of every issue list row
+    """
+    return self.document.table_rows()
+
+  def component_link_texts(self):
+    """Get the component path links of the issue.
+
+    Returns:
+        list: the text of every link to a component search
+    """
+    return self.document.component_link_texts()
+
+  def comments(self):
+    """Get the comment stream of the issue.
+
+    Returns:
+        list: the (author, text) of every comment, the text is None for comments
+              without plain text
+    """
+    return self.document.comments()
+
+  def metadata_fields(self):
+    """Get every issue metadata field of the page. The page is walked once, on first use.
+
+    Returns:
+        dict: the (label, value) of each metadata field, keyed by the field class without
+              the bv2-issue-metadata-field- prefix, eg. 'severity' or 'customField688197'
+    """
+    if self._metadata_fields is None:
+      self._scrape_metadata()
+    return self._metadata_fields
+
+  def metadata_lists(self):
+    """Get the values of every issue metadata list of the page, such as the
+    RoutingTargets queues. The page is walked once, on first use.
+
+    Returns:
+        dict: the list of values of each metadata list, keyed by the list name
+    """
+    if self._metadata_lists is None:
+      self._scrape_metadata()
+    return self._metadata_lists
+
+  def _scrape_metadata(self):
+    """Walk the page once, collecting the metadata field divs and the metadata list buttons."""
+    self._metadata_fields = {}
+    self._metadata_lists = {}
+
+    for tag_name, tag_classes, _, aria_label in self.document.metadata_tags():
+      if tag_name == "div":
+        for tag_class in tag_classes:
+          if tag_class != METADATA_FIELD_CLASS and \
+            tag_class.startswith(METADATA_FIELD_CLASS_PREFIX):
+            label, _, value = aria_label.partition(" value is ")
+            self._metadata_fields[tag_class[len(METADATA_FIELD_CLASS_PREFIX):]] = (label, value)
+      else:
+        #The button labels read "Remove <value> from <list name>"
+        value, _, list_name = aria_label.replace("Remove ", "", 1).partition(" from ")
+        if list_name:
+          self._metadata_lists.setdefault(list_name, []).append(value)
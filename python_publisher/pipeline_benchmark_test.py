@@ -0,0 +1,40 @@
+"""Test file for benchmark/pipeline_benchmark.py"""
+import argparse
+import unittest
+import logs.logger
+from benchmark import pipeline_benchmark
+from config_change_request import config_change_request
+from publish_queue import publish_queue
+from pubsub_publisher import pubsub_publisher
+from web_scraping_utility import html_parser
+
+class TestsPipelineBenchmark(unittest.TestCase):
+  """Test a short run of the pipeline benchmark
+
+  Args:
+    unittest (unittest.TestCase): unittest Testcase
+  """
+  def setUp(self):
+    """Restore the functions and the shared publisher replaced by the benchmark."""
+    factory = config_change_request.ConfigurationTypeFactory
+    for owner, name in ((html_parser, "parse"), (factory, "make"),
+                        (factory, "make_enqueue_rules")):
+      self.addCleanup(setattr, owner, name, getattr(owner, name))
+    self.addCleanup(pubsub_publisher.set_publisher, None)
+    self.addCleanup(publish_queue.set_publish_queue, None)
+
+  def test_synthetic_issues_are_published(self):
+    """Test run() with a few synthetic issues of every configuration type.
+    Assert that a request is published for every issue and that every stage is timed.
+    """
+    args = argparse.Namespace(corpus=None, issues=6, filler_nodes=10, drivers=2,
+                              page_latency_ms=0, publish_latency_ms=0, output=None,
+                              compare=None)
+    results = pipeline_benchmark.run(args, logs.logger.RecordingLogger())
+    assert results["issues"] == 6
+    assert results["published"] == 6
+    assert {"list_page", "issue", "build_request", "publish"} <= set(results["stages"])
+    assert results["stages"]["publish"]["count"] == 6
+
+if __name__ == "__main__":
+  unittest.main()
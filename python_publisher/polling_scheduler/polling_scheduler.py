@@ -0,0 +1,105 @@
+"""This module holds the PollingScheduler class which decides how long the publisher waits
+between passes over the Buganizer issue list, and limits how many pages are loaded per minute.
+"""
+import collections
+import random
+import threading
+import time
+import constants
+
+class SystemClock():
+  """The real clock used by the PollingScheduler outside of tests."""
+
+  def time(self):
+    """Returns:
+        float: the current time in seconds
+    """
+    return time.monotonic()
+
+  def sleep(self, seconds):
+    """Block the current thread.
+
+    Args:
+        seconds (float): the number of seconds to sleep
+    """
+    time.sleep(seconds)
+
+class PollingScheduler():
+  """Polls quickly right after new issues or comments appear and backs off exponentially,
+  with jitter, while nothing changes.
+  """
+
+  def __init__(self, clock=None, rng=None):
+    """Setup the PollingScheduler
+
+    Args:
+        clock (SystemClock): the clock used to sleep and read the time, a fake clock in tests
+        rng (random.Random): the random number generator used for jitter
+    """
+    self.clock = clock or SystemClock()
+    self.rng = rng or random.Random()
+    self.min_interval = constants.POLL_MIN_INTERVAL_SEC
+    self.max_interval = constants.POLL_MAX_INTERVAL_SEC
+    self.backoff_factor = constants.POLL_BACKOFF_FACTOR
+    self.jitter = constants.POLL_JITTER
+    self.max_page_loads_per_minute = constants.MAX_PAGE_LOADS_PER_MINUTE
+    self.max_http_reads_per_minute = constants.MAX_HTTP_READS_PER_MINUTE
+    self.current_interval = self.min_interval
+    self._page_load_times = collections.deque()
+    self._http_read_times = collections.deque()
+    self._page_load_lock = threading.Lock()
+
+  def record_pass(self, changed):
+    """Adjust the polling interval after a pass over the issue list.
+
+    Args:
+        changed (bool): whether the pass found new or changed issues
+    """
+    if changed:
+      self.current_interval = self.min_interval
+    else:
+      self.current_interval = min(self.current_interval * self.backoff_factor,
+                                  self.max_interval)
+
+  def next_delay(self):
+    """Get the delay before the next pass, the current interval with jitter applied.
+
+    Returns:
+        float: the number of seconds to wait before the next pass
+    """
+    jitter = self.rng.uniform(-self.jitter, self.jitter)
+    return max(0, self.current_interval * (1 + jitter))
+
+  def wait_for_next_pass(self):
+    """Sleep until the next pass over the issue list should start.
+
+    Returns:
+        float: the number of seconds slept
+    """
+    delay = self.next_delay()
+    self.clock.sleep(delay)
+    return delay
+
+  def acquire_page_load(self, over_http=False):
+    """Block until a page load is allowed by the per minute limit of its kind, then record
+    the page load. Web driver loads and HTTP reads are limited separately. The lock is not
+    held while sleeping, so other callers are not queued behind one waiting page load.
+
+    Args:
+        over_http (bool): whether the page is read over HTTP instead of with a web driver
+    """
+    if over_http:
+      page_load_times, limit = self._http_read_times, self.max_http_reads_per_minute
+    else:
+      page_load_times, limit = self._page_load_times, self.max_page_loads_per_minute
+    while True:
+      with self._page_load_lock:
+        now = self.clock.time()
+        while page_load_times and now - page_load_times[0] >= 60:
+          page_load_times.popleft()
+
+        if len(page_load_times) < limit:
+          page_load_times.append(now)
+          return
+        delay = 60 - (now - page_load_times[0])
+      self.clock.sleep(delay)
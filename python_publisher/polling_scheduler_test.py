@@ -0,0 +1,133 @@
+"""Test file for polling_scheduler.py"""
+import random
+import threading
+import unittest
+import constants
+from polling_scheduler import polling_scheduler
+
+class FakeClock():
+  """A clock that only advances when slept on."""
+  def __init__(self):
+    self.now = 0.0
+    self.slept = []
+
+  def time(self):
+    """Returns:
+        float: the fake current time in seconds
+    """
+    return self.now
+
+  def sleep(self, seconds):
+    """Advance the fake time without blocking.
+
+    Args:
+        seconds (float): the number of seconds to advance
+    """
+    self.slept.append(seconds)
+    self.now += seconds
+
+class BlockingClock(FakeClock):
+  """A fake clock whose sleeps block until released."""
+  def __init__(self):
+    super().__init__()
+    self.sleeping = threading.Event()
+    self.released = threading.Event()
+
+  def sleep(self, seconds):
+    """Wait until released, then advance the fake time.
+
+    Args:
+        seconds (float): the number of seconds to advance
+    """
+    self.sleeping.set()
+    self.released.wait()
+    super().sleep(seconds)
+
+class TestsPollingScheduler(unittest.TestCase):
+  """Test methods from polling_scheduler.py
+
+  Args:
+    unittest (unittest.TestCase): unittest Testcase
+  """
+  def test_backoff_until_max_interval(self):
+    """Test record_pass() for passes that found no changes.
+    Assert that the interval grows exponentially and is capped.
+    """
+    scheduler = polling_scheduler.PollingScheduler(FakeClock())
+    scheduler.record_pass(False)
+    assert scheduler.current_interval == constants.POLL_MIN_INTERVAL_SEC * \
+      constants.POLL_BACKOFF_FACTOR
+    for _ in range(100):
+      scheduler.record_pass(False)
+    assert scheduler.current_interval == constants.POLL_MAX_INTERVAL_SEC
+
+  def test_change_resets_interval(self):
+    """Test record_pass() for a pass that found changes after a quiet period.
+    Assert that the interval drops back to the minimum.
+    """
+    scheduler = polling_scheduler.PollingScheduler(FakeClock())
+    for _ in range(5):
+      scheduler.record_pass(False)
+    scheduler.record_pass(True)
+    assert scheduler.current_interval == constants.POLL_MIN_INTERVAL_SEC
+
+  def test_wait_for_next_pass_jitter(self):
+    """Test wait_for_next_pass() with jitter.
+    Assert that the fake clock sleeps within the jitter bounds of the interval.
+    """
+    clock = FakeClock()
+    scheduler = polling_scheduler.PollingScheduler(clock, random.Random(0))
+    for _ in range(50):
+      scheduler.wait_for_next_pass()
+    low = constants.POLL_MIN_INTERVAL_SEC * (1 - constants.POLL_JITTER)
+    high = constants.POLL_MIN_INTERVAL_SEC * (1 + constants.POLL_JITTER)
+    assert all(low <= delay <= high for delay in clock.slept)
+    assert len(set(clock.slept)) > 1
+
+  def test_page_load_limit(self):
+    """Test acquire_page_load() beyond the per minute page load limit.
+    Assert that the page load waits until the oldest page load is a minute old.
+    """
+    clock = FakeClock()
+    scheduler = polling_scheduler.PollingScheduler(clock)
+    for _ in range(constants.MAX_PAGE_LOADS_PER_MINUTE):
+      scheduler.acquire_page_load()
+    assert clock.now == 0
+    scheduler.acquire_page_load()
+    assert clock.now == 60
+
+  def test_http_read_limit(self):
+    """Test acquire_page_load() for HTTP reads once the web driver page loads are exhausted.
+    Assert that HTTP reads only wait once their own per minute limit is reached.
+    """
+    clock = FakeClock()
+    scheduler = polling_scheduler.PollingScheduler(clock)
+    for _ in range(constants.MAX_PAGE_LOADS_PER_MINUTE):
+      scheduler.acquire_page_load()
+    for _ in range(constants.MAX_HTTP_READS_PER_MINUTE):
+      scheduler.acquire_page_load(over_http=True)
+    assert clock.now == 0
+    scheduler.acquire_page_load(over_http=True)
+    assert clock.now == 60
+
+  def test_waiting_page_load_does_not_block_others(self):
+    """Test acquire_page_load() for an HTTP read while a web driver page load waits.
+    Assert that the HTTP read is not queued behind the sleeping page load.
+    """
+    clock = BlockingClock()
+    scheduler = polling_scheduler.PollingScheduler(clock)
+    for _ in range(constants.MAX_PAGE_LOADS_PER_MINUTE):
+      scheduler.acquire_page_load()
+    waiting = threading.Thread(target=scheduler.acquire_page_load)
+    waiting.start()
+    assert clock.sleeping.wait(timeout=5)
+    reading = threading.Thread(target=scheduler.acquire_page_load, kwargs={"over_http": True})
+    reading.start()
+    reading.join(timeout=5)
+    assert not reading.is_alive()
+    clock.released.set()
+    waiting.join(timeout=5)
+    assert not waiting.is_alive() and clock.now == 60
+
+if __name__ == '__main__':
+  unittest.main()
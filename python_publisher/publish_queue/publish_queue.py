@@ -0,0 +1,505 @@
+"""This module holds the PublishQueue class which decouples scraping from publishing.
+Configuration change requests are put on a bounded queue and published by a background
+worker, so scraping continues while publishes are in flight and only blocks once the queued
+requests and the requests waiting for a retry reach the queue size. Failed publishes are
+retried with exponential backoff by one retry scheduler, which also publishes the requests
+held back while an earlier request of their issue is unconfirmed, so the requests of an issue
+are published in the order they were submitted. Every request is confirmed by the id of its
+Buganizer issue once Pub/Sub accepted it. With a spool, every request is written to disk
+before it is queued and removed once it is confirmed, and a spooled request is retried until
+it is confirmed or replaced by a newer request of its issue, however long Pub/Sub is
+unavailable.
+Optionally, the requests queued while the worker was busy are published together in one
+batch envelope, see batch_envelope.py.
+"""
+from concurrent import futures
+import heapq
+import itertools
+import queue
+import threading
+import time
+import constants
+from batch_envelope import batch_envelope
+from pubsub_publisher import pubsub_publisher
+
+_shared_publish_queue = None
+_shared_publish_queue_lock = threading.Lock()
+
+class SupersededError(Exception):
+  """Raised by the confirmation of a spooled request which was replaced by a newer request
+  of its issue before it was published."""
+  def __init__(self, issue_id):
+    """Setup the SupersededError
+
+    Args:
+        issue_id (str): the id of the Buganizer issue of the request
+    """
+    super().__init__("The request of issue " + issue_id + " was replaced by a newer request.")
+    self.issue_id = issue_id
+
+class PublishQueue():
+  """A bounded queue of serialized configuration change requests served by one background
+  worker which hands them to the publisher, and one retry scheduler which publishes the
+  failed requests once their backoff is over.
+  """
+
+  def __init__(self, publisher=None, logger=None, max_size=None, max_attempts=None,
+               retry_base_sec=None, spool=None, batch_size=None, retry_max_sec=None):
+    """Setup the PublishQueue and start its worker.
+
+    Args:
+        publisher (pubsub_publisher.PubSubPublisher): publishes the requests, the publisher
+                                                      shared by the process by default
+        logger (logs.logger.Logger): logs the requests which failed every attempt, if given
+        max_size (int): the number of queued requests, and of requests waiting for a retry
+                        or for an earlier request of their issue, after which submit()
+                        blocks, constants.PUBLISH_QUEUE_SIZE by default
+        max_attempts (int): the number of attempts to publish a request which is not
+                            spooled, constants.PUBLISH_MAX_ATTEMPTS by default
+        retry_base_sec (float): the delay before the first retry, doubled for every
+                                further retry, constants.PUBLISH_RETRY_BASE_SEC by default
+        spool (request_spool.RequestSpool): keeps every request on disk until it is
+                                            confirmed, if given
+        batch_size (int): the most requests published together in one batch envelope,
+                          constants.PUBLISH_BATCH_ENVELOPE_SIZE by default, 1 or less
+                          publishes every request in its own message
+        retry_max_sec (float): the longest delay between two retries,
+                               constants.PUBLISH_RETRY_MAX_SEC by default
+    """
+    self.spool = spool
+    self.batch_size = constants.PUBLISH_BATCH_ENVELOPE_SIZE if batch_size is None \
+      else batch_size
+    self.publisher = publisher or pubsub_publisher.get_publisher()
+    self.logger = logger
+    self.max_attempts = max_attempts or constants.PUBLISH_MAX_ATTEMPTS
+    self.retry_base_sec = constants.PUBLISH_RETRY_BASE_SEC if retry_base_sec is None \
+      else retry_base_sec
+    self.retry_max_sec = retry_max_sec or constants.PUBLISH_RETRY_MAX_SEC
+    self.max_size = max_size or constants.PUBLISH_QUEUE_SIZE
+    self._queue = queue.Queue(maxsize=self.max_size)
+    self._condition = threading.Condition()
+    self._in_flight = 0
+    #The (due time, order, requests, attempt) of every publish waiting for the retry
+    #scheduler, ordered by due time
+    self._retries = []
+    self._retry_order = itertools.count()
+    #The number of requests waiting for a retry or held back behind their issue
+    self._backlog_count = 0
+    #The issues with a request being published or waiting for a retry
+    self._active_issues = set()
+    #The requests of every issue held back until its earlier requests are done, in order
+    self._held_requests = {}
+    self._stopping = False
+    #Whether the spool depth warning was logged since the spool was last below the limit
+    self._spool_depth_warned = False
+    self.confirmed_count = 0
+    self.failed_count = 0
+    self.retried_count = 0
+    self.superseded_count = 0
+    #The message id of the latest confirmed request of each issue
+    self.confirmed_issues = {}
+    self._worker = threading.Thread(target=self._run, daemon=True)
+    self._worker.start()
+    self._retry_worker = threading.Thread(target=self._run_retries, daemon=True)
+    self._retry_worker.start()
+
+  def submit(self, issue_id, data, sequence_number=None, latest=False):
+    """Queue a request for publishing, blocking while the queue is full or while the
+    requests waiting for a retry or for their issue fill it.
+
+    Args:
+        issue_id (str): the id of the Buganizer issue of the request
+        data (bytes): the serialized configuration change request
+        sequence_number (int): the spool sequence number of a replayed request, a new
+                               request is appended to the spool by default
+        latest (bool): whether the request replaces the unconfirmed request of its issue
+                       in the spool, see request_spool.RequestSpool.append()
+
+    Returns:
+        concurrent.futures.Future: resolves to the message id once the request is
+                                   confirmed, or fails once every attempt failed or with a
+                                   SupersededError once it was replaced
+    """
+    if self.spool and sequence_number is None:
+      sequence_number = self.spool.append(issue_id, data, latest)
+      self._check_spool_depth()
+    confirmation = futures.Future()
+    with self._condition:
+      while self._queue.qsize() + self._backlog_count >= self.max_size:
+        self._condition.wait()
+    self._queue.put((issue_id, data, confirmation, sequence_number))
+    return confirmation
+
+  def _check_spool_depth(self):
+    """Log a warning once the unconfirmed requests in the spool reach
+    constants.SPOOL_WARN_PENDING_REQUESTS, and again after it fell below it and reached it
+    again.
+    """
+    pending_count = self.spool.pending_count()
+    if pending_count < constants.SPOOL_WARN_PENDING_REQUESTS:
+      self._spool_depth_warned = False
+      return
+    if self._spool_depth_warned:
+      return
+    self._spool_depth_warned = True
+    if self.logger:
+      self.logger.log("WARNING: " + str(pending_count) + " configuration change requests "        "are waiting in the spool for Pub/Sub to confirm them.\n")
+
+  def replay_spool(self):
+    """Queue every request left in the spool by a previous run, in batches of
+    constants.SPOOL_REPLAY_BATCH_SIZE, blocking while the queue is full.
+
+    Returns:
+        list: the issue id, the serialized request and the confirmation future of every
+              replayed request
+    """
+    replayed_requests = []
+    if not self.spool:
+      return replayed_requests
+    for batch in self.spool.pending_batches(constants.SPOOL_REPLAY_BATCH_SIZE):
+      for sequence_number, issue_id, data in batch:
+        replayed_requests.append((issue_id, data,
+                                  self.submit(issue_id, data, sequence_number)))
+    return replayed_requests
+
+  def _run(self):
+    """Hand every queued request to the publisher until stop() is called. With a batch
+    size above one, the requests already queued are published together in one envelope.
+    """
+    stopping = False
+    while not stopping:
+      request = self._queue.get()
+      if request is None:
+        self._queue.task_done()
+        return
+      requests = [request]
+      while len(requests) < self.batch_size:
+        try:
+          request = self._queue.get_nowait()
+        except queue.Empty:
+          break
+        if request is None:
+          self._queue.task_done()
+          stopping = True
+          break
+        requests.append(request)
+
+      taken_count = len(requests)
+      with self._condition:
+        self._in_flight += taken_count
+        ready_requests = self._hold_busy_issues(requests)
+        #Room was made in the queue for the submits waiting on the backlog
+        self._condition.notify_all()
+      if self.spool and len(ready_requests) < taken_count:
+        self._drop_superseded_backlog({request[0] for request in requests} -
+                                      {request[0] for request in ready_requests})
+      requests = ready_requests
+      if requests:
+        self._publish(requests, 1)
+      for _ in range(taken_count):
+        self._queue.task_done()
+
+  def _hold_busy_issues(self, requests):
+    """Hold back the requests of the issues whose earlier requests are still being
+    published or waiting for a retry, and mark the issues of the other requests as busy.
+    Called with self._condition held.
+
+    Args:
+        requests (list): the issue id, the serialized request, the confirmation future and
+                         the spool sequence number of every request
+
+    Returns:
+        list: the requests to publish now
+    """
+    ready_requests = []
+    for request in requests:
+      issue_id = request[0]
+      if issue_id in self._active_issues:
+        self._held_requests.setdefault(issue_id, []).append(request)
+        self._backlog_count += 1
+      else:
+        self._active_issues.add(issue_id)
+        ready_requests.append(request)
+    return ready_requests
+
+  def _drop_superseded_backlog(self, issue_ids):
+    """Stop retrying or holding back the spooled requests of issues which were replaced by
+    a newer request of their issue, without waiting for their retry to be due.
+
+    Args:
+        issue_ids (set): the ids of the issues which received a new request
+    """
+    superseded_requests = []
+    with self._condition:
+      for issue_id in issue_ids:
+        held_requests = self._held_requests.get(issue_id, [])
+        current_requests = [request for request in held_requests
+                            if self.spool.is_pending(request[3])]
+        dropped_count = len(held_requests) - len(current_requests)
+        if dropped_count:
+          superseded_requests.extend(request for request in held_requests
+                                     if request not in current_requests)
+          self._backlog_count -= dropped_count
+          self._in_flight -= dropped_count
+          if current_requests:
+            self._held_requests[issue_id] = current_requests
+          else:
+            del self._held_requests[issue_id]
+
+      retries = []
+      dropped_requests = []
+      for due_time, order, requests, attempt in self._retries:
+        current_requests = [request for request in requests
+                            if request[0] not in issue_ids or
+                            self.spool.is_pending(request[3])]
+        dropped_requests.extend(request for request in requests
+                                if request not in current_requests)
+        if current_requests:
+          retries.append((due_time, order, current_requests, attempt))
+      if dropped_requests:
+        heapq.heapify(retries)
+        self._retries = retries
+        self._backlog_count -= len(dropped_requests)
+        #Schedules the held requests of their issues right away
+        self._release(dropped_requests)
+        superseded_requests.extend(dropped_requests)
+      self.superseded_count += len(superseded_requests)
+      self._condition.notify_all()
+    for issue_id, _, confirmation, _ in superseded_requests:
+      confirmation.set_exception(SupersededError(issue_id))
+
+  def _release(self, requests):
+    """Mark requests as confirmed, failed or replaced, and schedule the next held request of
+    their issues. Called with self._condition held.
+
+    Args:
+        requests (list): the issue id, the serialized request, the confirmation future and
+                         the spool sequence number of every request
+    """
+    self._in_flight -= len(requests)
+    for request in requests:
+      issue_id = request[0]
+      held_requests = self._held_requests.get(issue_id)
+      if not held_requests:
+        self._active_issues.discard(issue_id)
+        continue
+      next_request = held_requests.pop(0)
+      if not held_requests:
+        del self._held_requests[issue_id]
+      #Published by the retry scheduler as soon as it wakes up
+      self._backlog_count -= 1
+      self._schedule([next_request], 1, 0)
+    self._condition.notify_all()
+
+  def _schedule(self, requests, attempt, delay):
+    """Hand requests to the retry scheduler. Called with self._condition held.
+
+    Args:
+        requests (list): the issue id, the serialized request, the confirmation future and
+                         the spool sequence number of every request
+        attempt (int): the number of the attempt to publish them, starting at 1
+        delay (float): the number of seconds to wait before publishing them
+    """
+    heapq.heappush(self._retries, (time.monotonic() + delay, next(self._retry_order),
+                                   requests, attempt))
+    self._backlog_count += len(requests)
+    self._condition.notify_all()
+
+  def _run_retries(self):
+    """Publish the scheduled requests once they are due until stop() is called."""
+    while True:
+      with self._condition:
+        while not self._stopping and \
+          (not self._retries or self._retries[0][0] > time.monotonic()):
+          self._condition.wait(None if not self._retries else
+                               self._retries[0][0] - time.monotonic())
+        if self._stopping:
+          return
+        _, _, requests, attempt = heapq.heappop(self._retries)
+        self._backlog_count -= len(requests)
+        self._condition.notify_all()
+      self._publish(requests, attempt)
+
+  def _publish(self, requests, attempt):
+    """Publish one attempt of a request, or of a batch of requests in one envelope.
+
+    Args:
+        requests (list): the issue id, the serialized request, the confirmation future and
+                         the spool sequence number of every request
+        attempt (int): the attempt number, starting at 1
+    """
+    requests = self._drop_superseded(requests)
+    if not requests:
+      return
+    try:
+      if len(requests) == 1:
+        future = self.publisher.publish(requests[0][1])
+      else:
+        future = self.publisher.publish(
+            batch_envelope.pack([request[1] for request in requests]),
+            **batch_envelope.BATCH_ATTRIBUTES)
+    except Exception as error:
+      self._on_failure(requests, attempt, error)
+      return
+    future.add_done_callback(lambda future: self._on_done(requests, attempt, future))
+
+  def _drop_superseded(self, requests):
+    """Stop publishing the spooled requests which were replaced by a newer request of their
+    issue while they were queued or waiting for a retry.
+
+    Args:
+        requests (list): the issue id, the serialized request, the confirmation future and
+                         the spool sequence number of every request
+
+    Returns:
+        list: the requests still to publish
+    """
+    if not self.spool:
+      return requests
+    current_requests = []
+    superseded_requests = []
+    for request in requests:
+      if self.spool.is_pending(request[3]):
+        current_requests.append(request)
+      else:
+        superseded_requests.append(request)
+    if superseded_requests:
+      with self._condition:
+        self.superseded_count += len(superseded_requests)
+        self._release(superseded_requests)
+      for issue_id, _, confirmation, _ in superseded_requests:
+        confirmation.set_exception(SupersededError(issue_id))
+    return current_requests
+
+  def _on_done(self, requests, attempt, future):
+    """Confirm published requests, or retry them.
+
+    Args:
+        requests (list): the issue id, the serialized request, the confirmation future and
+                         the spool sequence number of every request
+        attempt (int): the attempt number, starting at 1
+        future (concurrent.futures.Future): the future of the publish
+    """
+    error = future.exception()
+    if error is not None:
+      self._on_failure(requests, attempt, error)
+      return
+    message_id = future.result()
+    for _, _, _, sequence_number in requests:
+      if sequence_number is not None:
+        self.spool.confirm(sequence_number)
+    with self._condition:
+      for issue_id, _, _, _ in requests:
+        self.confirmed_issues[issue_id] = message_id
+      self.confirmed_count += len(requests)
+      self._release(requests)
+    for _, _, confirmation, _ in requests:
+      confirmation.set_result(message_id)
+
+  def _on_failure(self, requests, attempt, error):
+    """Schedule failed requests for a retry after a backoff, or give up after the last
+    attempt. Spooled requests are never given up, as their issue may not be visited again:
+    they stay in the spool and are retried every retry_max_sec seconds at most once the
+    attempts ran out. The later requests of their issues stay held back meanwhile.
+
+    Args:
+        requests (list): the issue id, the serialized request, the confirmation future and
+                         the spool sequence number of every request
+        attempt (int): the attempt number, starting at 1
+        error (Exception): the reason the publish failed
+    """
+    if attempt >= self.max_attempts and not self.spool:
+      with self._condition:
+        self.failed_count += len(requests)
+        self._release(requests)
+      for issue_id, _, confirmation, _ in requests:
+        if self.logger:
+          self.logger.log("ERROR: Failed to publish the configuration change request of "\
+            "issue " + issue_id + " after " + str(attempt) + " attempts: " + str(error) + "\n")
+        confirmation.set_exception(error)
+      return
+    if attempt == self.max_attempts and self.logger:
+      for issue_id, _, _, _ in requests:
+        self.logger.log("ERROR: Failed to publish the configuration change request of "\
+          "issue " + issue_id + " after " + str(attempt) + " attempts: " + str(error) + \
+            ", keeping it in the spool and retrying.\n")
+
+    with self._condition:
+      self.retried_count += 1
+      #The exponent is capped as the delay is capped anyway
+      delay = min(self.retry_base_sec * 2 ** min(attempt - 1, 30), self.retry_max_sec)
+      self._schedule(requests, attempt + 1, delay)
+
+  def depth(self):
+    """Returns:
+        int: the number of requests queued or in flight
+    """
+    with self._condition:
+      return self._queue.qsize() + self._in_flight
+
+  def stats(self):
+    """Returns:
+        dict: the number of requests queued, in flight, waiting for a retry or for their
+              issue, confirmed, failed, retried and replaced by a newer request
+    """
+    with self._condition:
+      return {"queued": self._queue.qsize(), "in_flight": self._in_flight,
+              "backlog": self._backlog_count,
+              "confirmed": self.confirmed_count, "failed": self.failed_count,
+              "retried": self.retried_count, "superseded": self.superseded_count}
+
+  def join(self, timeout=None):
+    """Wait until every request is confirmed or failed.
+
+    Args:
+        timeout (float): the maximum number of seconds to wait, no limit by default
+
+    Returns:
+        bool: True if no request is queued or in flight anymore
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    with self._condition:
+      while self._queue.unfinished_tasks or self._in_flight:
+        remaining = None if deadline is None else deadline - time.monotonic()
+        if remaining is not None and remaining <= 0:
+          return False
+        #Queued requests do not notify, so check again at least every 100ms
+        self._condition.wait(0.1 if remaining is None else min(0.1, remaining))
+    return True
+
+  def stop(self, timeout=None):
+    """Wait for every request and stop the worker and the retry scheduler.
+
+    Args:
+        timeout (float): the maximum number of seconds to wait, no limit by default
+    """
+    self.join(timeout)
+    self._queue.put(None)
+    self._worker.join(timeout)
+    with self._condition:
+      self._stopping = True
+      self._condition.notify_all()
+    self._retry_worker.join(timeout)
+
+def get_publish_queue():
+  """Get the publish queue shared by the whole process, creating it on first use.
+
+  Returns:
+      PublishQueue: the shared publish queue
+  """
+  global _shared_publish_queue
+  with _shared_publish_queue_lock:
+    if _shared_publish_queue is None:
+      _shared_publish_queue = PublishQueue()
+    return _shared_publish_queue
+
+def set_publish_queue(publish_queue):
+  """Replace the publish queue shared by the whole process.
+
+  Args:
+      publish_queue (PublishQueue): the publish queue to share, or None to create a new
+                                    one on the next get_publish_queue() call
+  """
+  global _shared_publish_queue
+  with _shared_publish_queue_lock:
+    _shared_publish_queue = publish_queue
@@ -0,0 +1,117 @@
+"""Test file for publish_queue.py"""
+import threading
+import unittest
+import logs.logger
+from benchmark import fake_publisher
+from publish_queue import publish_queue
+from pubsub_publisher import pubsub_publisher
+
+logger = logs.logger.RecordingLogger()
+
+class StalledPublisher():
+  """A stand-in for the publisher whose publishes block until released."""
+  def __init__(self):
+    self.released = threading.Event()
+    self.publisher = pubsub_publisher.PubSubPublisher(fake_publisher.FakePublisherClient())
+
+  def publish(self, data):
+    """Wait until released, then publish."""
+    self.released.wait()
+    return self.publisher.publish(data)
+
+class FailingPublisher():
+  """A stand-in for the publisher whose first publishes fail."""
+  def __init__(self, failures):
+    self.failures = failures
+    self.client = fake_publisher.FakePublisherClient()
+    self.publisher = pubsub_publisher.PubSubPublisher(self.client)
+
+  def publish(self, data):
+    """Fail while failures are left, then publish."""
+    if self.failures:
+      self.failures -= 1
+      raise RuntimeError("publish failed")
+    return self.publisher.publish(data)
+
+class TestsPublishQueue(unittest.TestCase):
+  """Test methods from publish_queue.py
+
+  Args:
+    unittest (unittest.TestCase): unittest Testcase
+  """
+  def test_failed_publish_is_retried(self):
+    """Test submit() when the first attempt of the second request fails.
+    Assert that both requests are confirmed by their issue id.
+    """
+    publisher = pubsub_publisher.PubSubPublisher(
+        fake_publisher.FakePublisherClient(fail_every=2))
+    requests = publish_queue.PublishQueue(publisher, logger, retry_base_sec=0.01)
+    confirmations = [requests.submit(issue_id, b"data") for issue_id in ("1", "2")]
+    assert [confirmation.result(timeout=5) for confirmation in confirmations] == ["1", "3"]
+    requests.stop(timeout=5)
+    assert requests.confirmed_issues == {"1": "1", "2": "3"}
+    assert requests.stats()["retried"] == 1
+
+  def test_request_fails_after_last_attempt(self):
+    """Test submit() when every attempt fails.
+    Assert that the confirmation fails after max_attempts attempts.
+    """
+    publisher = pubsub_publisher.PubSubPublisher(
+        fake_publisher.FakePublisherClient(fail_every=1))
+    requests = publish_queue.PublishQueue(publisher, logger, max_attempts=3,
+                                          retry_base_sec=0.01)
+    confirmation = requests.submit("1", b"data")
+    with self.assertRaises(RuntimeError):
+      confirmation.result(timeout=5)
+    requests.stop(timeout=5)
+    assert requests.stats()["failed"] == 1 and requests.stats()["retried"] == 2
+
+  def test_depth_while_publisher_stalls(self):
+    """Test depth() while the publisher is stalled.
+    Assert that every submitted request is counted until it is confirmed.
+    """
+    publisher = StalledPublisher()
+    requests = publish_queue.PublishQueue(publisher, logger, max_size=5)
+    for issue_id in ("1", "2", "3"):
+      requests.submit(issue_id, b"data")
+    assert requests.depth() == 3
+    publisher.released.set()
+    assert requests.join(timeout=5)
+    assert requests.depth() == 0
+    requests.stop(timeout=5)
+
+  def test_retry_keeps_issue_order(self):
+    """Test submit() for two requests of one issue when the first publish fails.
+    Assert that the second request is held back until the first one is retried and
+    confirmed, so the requests are published in the order they were submitted.
+    """
+    publisher = FailingPublisher(failures=1)
+    requests = publish_queue.PublishQueue(publisher, logger, retry_base_sec=0.05)
+    first = requests.submit("1", b"first")
+    second = requests.submit("1", b"second")
+    assert second.result(timeout=5) and first.result(timeout=5)
+    requests.stop(timeout=5)
+    assert [data for _, data in publisher.client.messages] == [b"first", b"second"]
+
+  def test_submit_blocks_on_retry_backlog(self):
+    """Test submit() while the requests waiting for a retry fill the queue.
+    Assert that submit() blocks until a retried request is confirmed.
+    """
+    publisher = FailingPublisher(failures=2)
+    requests = publish_queue.PublishQueue(publisher, logger, max_size=2,
+                                          retry_base_sec=0.3)
+    for issue_id in ("1", "2"):
+      requests.submit(issue_id, b"data")
+    blocked_submit = threading.Thread(target=requests.submit, args=("3", b"data"))
+    blocked_submit.start()
+    blocked_submit.join(timeout=0.1)
+    assert blocked_submit.is_alive()
+    assert requests.stats()["backlog"] == 2
+    blocked_submit.join(timeout=5)
+    assert not blocked_submit.is_alive()
+    assert requests.join(timeout=5)
+    requests.stop(timeout=5)
+    assert requests.stats()["confirmed"] == 3
+
+if __name__ == '__main__':
+  unittest.main()
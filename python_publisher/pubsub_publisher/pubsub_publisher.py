@@ -0,0 +1,182 @@
+"""This module holds the PubSubPublisher class which owns the one Pub/Sub publisher client
+of the process. The client batches messages and applies flow control according to
+constants.py, and every publish future is tracked to report publish latency and failures.
+The Pub/Sub library takes most of the startup time of the process, so it is only imported
+once the first message is published.
+"""
+import collections
+import statistics
+import threading
+import time
+import constants
+
+#The number of most recent publish latencies kept for the latency percentiles
+LATENCY_WINDOW = 1000
+
+_shared_publisher = None
+_shared_publisher_lock = threading.Lock()
+
+def make_client():
+  """Create a Pub/Sub publisher client with the batch settings and the flow control
+  of constants.py.
+
+  Returns:
+      google.cloud.pubsub_v1.PublisherClient: the publisher client
+  """
+  from google.cloud import pubsub_v1
+
+  batch_settings = pubsub_v1.types.BatchSettings(
+      max_messages=constants.PUBLISH_MAX_MESSAGES,
+      max_bytes=constants.PUBLISH_MAX_BYTES,
+      max_latency=constants.PUBLISH_MAX_LATENCY_SEC)
+  flow_control = pubsub_v1.types.PublishFlowControl(
+      message_limit=constants.PUBLISH_FLOW_CONTROL_MESSAGES,
+      byte_limit=constants.PUBLISH_FLOW_CONTROL_BYTES,
+      limit_exceeded_behavior=pubsub_v1.types.LimitExceededBehavior.BLOCK)
+  return pubsub_v1.PublisherClient(
+      batch_settings=batch_settings,
+      publisher_options=pubsub_v1.types.PublisherOptions(flow_control=flow_control))
+
+class PubSubPublisher():
+  """Publishes messages to the configuration change topic with one long-lived client and
+  keeps track of every message still in flight.
+  """
+
+  def __init__(self, client=None, logger=None):
+    """Setup the PubSubPublisher
+
+    Args:
+        client (google.cloud.pubsub_v1.PublisherClient): the publisher client, a client
+                                                         configured by make_client() on
+                                                         the first publish by default
+        logger (logs.logger.Logger): logs failed publishes, if given
+    """
+    self._client = client
+    self.logger = logger
+    self.topic_path = None
+    self._lock = threading.Lock()
+    self._pending_futures = set()
+    self._latencies = collections.deque(maxlen=LATENCY_WINDOW)
+    self.published_count = 0
+    self.failed_count = 0
+
+  def publish(self, data, **attributes):
+    """Publish a message. The call returns as soon as the message is batched.
+
+    Args:
+        data (bytes): the serialized message
+        **attributes (str): the attributes of the message, eg. format="batch"
+
+    Returns:
+        concurrent.futures.Future: resolves to the message id once the message is published
+    """
+    client = self.client()
+    start = time.monotonic()
+    future = client.publish(self.topic_path, data=data, **attributes)
+    with self._lock:
+      self._pending_futures.add(future)
+    future.add_done_callback(lambda future: self._on_done(future, start))
+    return future
+
+  def _on_done(self, future, start):
+    """Record the outcome of a publish.
+
+    Args:
+        future (concurrent.futures.Future): the future of the publish
+        start (float): the monotonic time the message was handed to the client
+    """
+    error = future.exception()
+    with self._lock:
+      self._pending_futures.discard(future)
+      if error is None:
+        self.published_count += 1
+        self._latencies.append(time.monotonic() - start)
+      else:
+        self.failed_count += 1
+    if error is not None and self.logger:
+      self.logger.log("ERROR: Failed to publish a configuration change request: " + \
+        str(error) + "\n")
+
+  def flush(self, timeout=None):
+    """Wait for every message in flight.
+
+    Args:
+        timeout (float): the maximum number of seconds to wait, no limit by default
+
+    Returns:
+        bool: True if no message is in flight anymore
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+      with self._lock:
+        pending_futures = list(self._pending_futures)
+      if not pending_futures:
+        return True
+      for future in pending_futures:
+        remaining = None if deadline is None else deadline - time.monotonic()
+        if remaining is not None and remaining <= 0:
+          return False
+        try:
+          future.result(remaining)
+        except Exception:
+          pass
+
+  def stats(self):
+    """Report the publishes so far.
+
+    Returns:
+        dict: the number of messages published, failed and in flight, and the median and
+              99th percentile publish latency in milliseconds over the most recent
+              LATENCY_WINDOW publishes, None before the first publish
+    """
+    with self._lock:
+      latencies = sorted(self._latencies)
+      report = {"published": self.published_count, "failed": self.failed_count,
+                "pending": len(self._pending_futures),
+                "p50_latency_ms": None, "p99_latency_ms": None}
+    if latencies:
+      report["p50_latency_ms"] = statistics.median(latencies) * 1000
+      report["p99_latency_ms"] = latencies[min(len(latencies) - 1,
+                                               int(len(latencies) * 0.99))] * 1000
+    return report
+
+  def client(self):
+    """Get the publisher client, creating it on first use.
+
+    Returns:
+        google.cloud.pubsub_v1.PublisherClient: the publisher client
+    """
+    with self._lock:
+      if self._client is None:
+        self._client = make_client()
+      if self.topic_path is None:
+        self.topic_path = self._client.topic_path(constants.PROJECT_ID, constants.TOPIC_NAME)
+      return self._client
+
+  def stop(self):
+    """Publish every batched message and stop the client, if it was created."""
+    if self._client is not None:
+      self._client.stop()
+
+def get_publisher():
+  """Get the publisher shared by the whole process, creating it on first use.
+
+  Returns:
+      PubSubPublisher: the shared publisher
+  """
+  global _shared_publisher
+  with _shared_publisher_lock:
+    if _shared_publisher is None:
+      _shared_publisher = PubSubPublisher()
+    return _shared_publisher
+
+def set_publisher(publisher):
+  """Replace the publisher shared by the whole process, eg. with one using a fake client.
+
+  Args:
+      publisher (PubSubPublisher): the publisher to share, or None to create a new one
+                                   on the next get_publisher() call
+  """
+  global _shared_publisher
+  with _shared_publisher_lock:
+    _shared_publisher = publisher
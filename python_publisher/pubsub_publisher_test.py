@@ -0,0 +1,51 @@
+"""Test file for pubsub_publisher.py"""
+import unittest
+import logs.logger
+from benchmark import fake_publisher
+from config_change_request import config_change_pb2
+from config_change_request import config_change_request
+from publish_queue import publish_queue
+from pubsub_publisher import pubsub_publisher
+
+logger = logs.logger.RecordingLogger()
+
+class TestsPubSubPublisher(unittest.TestCase):
+  """Test methods from pubsub_publisher.py
+
+  Args:
+    unittest (unittest.TestCase): unittest Testcase
+  """
+  def tearDown(self):
+    publish_queue.set_publish_queue(None)
+    pubsub_publisher.set_publisher(None)
+
+  def test_stats_count_failures(self):
+    """Test stats() after publishes of which one fails.
+    Assert that every publish is accounted for once flushed.
+    """
+    publisher = pubsub_publisher.PubSubPublisher(
+        fake_publisher.FakePublisherClient(latency=0.01, fail_every=3), logger)
+    for _ in range(6):
+      publisher.publish(b"data")
+    assert publisher.flush(timeout=5)
+    stats = publisher.stats()
+    publisher.stop()
+    assert (stats["published"], stats["failed"], stats["pending"]) == (4, 2, 0)
+    assert stats["p50_latency_ms"] >= 10
+
+  def test_factory_uses_shared_publisher(self):
+    """Test ConfigurationTypeFactory.publish() with two factories.
+    Assert that both requests go through the one shared client.
+    """
+    client = fake_publisher.FakePublisherClient()
+    pubsub_publisher.set_publisher(pubsub_publisher.PubSubPublisher(client))
+    for issue_id in ("1", "2"):
+      proto = config_change_pb2.ConfigChangeRequest(issue_id=issue_id)
+      config_change_request.ConfigurationTypeFactory().publish(proto).result(timeout=5)
+    publish_queue.get_publish_queue().stop(timeout=5)
+    client.stop()
+    assert [config_change_pb2.ConfigChangeRequest.FromString(data).issue_id
+            for _, data in client.messages] == ["1", "2"]
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,74 @@
+"""This module holds the RequestDeduplicator class which remembers the hash of the latest
+configuration change request published for each Buganizer issue, so that a request whose
+content did not change since it was last published is not published again.
+"""
+import collections
+import threading
+import constants
+from polling_scheduler import polling_scheduler
+
+class RequestDeduplicator():
+  """An LRU map from issue id to the hash of its latest published request. Entries expire
+  after a TTL, after which an unchanged request is no longer skipped in memory and is
+  compared with the latest request recorded in issue_state_store.IssueStateStore instead.
+  """
+
+  def __init__(self, max_entries=None, ttl_sec=None, clock=None):
+    """Setup the RequestDeduplicator
+
+    Args:
+        max_entries (int): the number of issues remembered, the least recently used issue
+                           is forgotten first, constants.DEDUP_MAX_ENTRIES by default
+        ttl_sec (float): the seconds a published hash is remembered,
+                         constants.DEDUP_TTL_SEC by default
+        clock (polling_scheduler.SystemClock): the clock used to read the time, a fake
+                                               clock in tests
+    """
+    self.max_entries = max_entries or constants.DEDUP_MAX_ENTRIES
+    self.ttl_sec = ttl_sec or constants.DEDUP_TTL_SEC
+    self.clock = clock or polling_scheduler.SystemClock()
+    self._lock = threading.Lock()
+    #The (request hash, time recorded) of each issue, least recently used first
+    self._entries = collections.OrderedDict()
+    self.duplicate_count = 0
+
+  def claim(self, issue_id, request_hash):
+    """Check whether a request changed since it was last published for its issue, and if
+    so remember it as published, so that a concurrent identical request is skipped.
+
+    Args:
+        issue_id (str): the id of the Buganizer issue
+        request_hash (str): the hash of the serialized request
+
+    Returns:
+        bool: True if the request should be published, False if it is a duplicate
+    """
+    now = self.clock.time()
+    with self._lock:
+      entry = self._entries.get(issue_id)
+      if entry is not None and entry[0] == request_hash and now - entry[1] < self.ttl_sec:
+        self._entries.move_to_end(issue_id)
+        self.duplicate_count += 1
+        return False
+      self._entries[issue_id] = (request_hash, now)
+      self._entries.move_to_end(issue_id)
+      while len(self._entries) > self.max_entries:
+        self._entries.popitem(last=False)
+      return True
+
+  def release(self, issue_id, request_hash):
+    """Forget a claimed request which could not be published, so that it is published
+    again on the next pass.
+
+    Args:
+        issue_id (str): the id of the Buganizer issue
+        request_hash (str): the hash of the serialized request
+    """
+    with self._lock:
+      entry = self._entries.get(issue_id)
+      if entry is not None and entry[0] == request_hash:
+        del self._entries[issue_id]
+
+  def __len__(self):
+    with self._lock:
+      return len(self._entries)
@@ -0,0 +1,73 @@
+"""Test file for request_deduplicator.py"""
+import unittest
+from request_deduplicator import request_deduplicator
+
+class FakeClock():
+  """A clock that only advances when slept on."""
+  def __init__(self):
+    self.now = 0.0
+
+  def time(self):
+    """Returns:
+        float: the fake current time in seconds
+    """
+    return self.now
+
+  def sleep(self, seconds):
+    """Advance the fake time without blocking.
+
+    Args:
+        seconds (float): the number of seconds to advance
+    """
+    self.now += seconds
+
+class TestsRequestDeduplicator(unittest.TestCase):
+  """Test methods from request_deduplicator.py
+
+  Args:
+    unittest (unittest.TestCase): unittest Testcase
+  """
+  def test_unchanged_request_is_skipped(self):
+    """Test claim() for an unchanged and then a changed request of one issue.
+    Assert that only the changed request is published.
+    """
+    deduplicator = request_deduplicator.RequestDeduplicator(clock=FakeClock())
+    assert deduplicator.claim("1", "a")
+    assert not deduplicator.claim("1", "a")
+    assert deduplicator.claim("1", "b")
+    assert deduplicator.duplicate_count == 1
+
+  def test_entries_expire(self):
+    """Test claim() for an unchanged request after the TTL.
+    Assert that the request is published again.
+    """
+    clock = FakeClock()
+    deduplicator = request_deduplicator.RequestDeduplicator(ttl_sec=10, clock=clock)
+    deduplicator.claim("1", "a")
+    clock.sleep(10)
+    assert deduplicator.claim("1", "a")
+
+  def test_least_recently_used_issue_is_evicted(self):
+    """Test claim() for more issues than max_entries.
+    Assert that the least recently used issue is forgotten.
+    """
+    deduplicator = request_deduplicator.RequestDeduplicator(max_entries=2, clock=FakeClock())
+    deduplicator.claim("1", "a")
+    deduplicator.claim("2", "a")
+    deduplicator.claim("1", "a")
+    deduplicator.claim("3", "a")
+    assert len(deduplicator) == 2
+    assert not deduplicator.claim("1", "a")
+    assert deduplicator.claim("2", "a")
+
+  def test_released_request_is_published_again(self):
+    """Test release() after a publish failed.
+    Assert that the same request is published on the next pass.
+    """
+    deduplicator = request_deduplicator.RequestDeduplicator(clock=FakeClock())
+    deduplicator.claim("1", "a")
+    deduplicator.release("1", "a")
+    assert deduplicator.claim("1", "a")
+
+if __name__ == '__main__':
+  unittest.main()
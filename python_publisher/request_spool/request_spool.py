@@ -0,0 +1,278 @@
+"""This module holds the RequestSpool class, a write-ahead spool of the configuration change
+requests waiting to be published. Every request is appended to a local file before it is
+published and is only removed once Pub/Sub confirmed it, so requests published during an
+outage or lost in a crash are replayed on the next start. A request which is rebuilt from the
+issue fields on every visit replaces the unconfirmed request of its issue, as only the latest
+request of an issue is published.
+
+The spool is an append-only file of length-prefixed records. A request record holds the
+issue id and the serialized request, a latest request record does too and replaces the
+previous latest request record of its issue, an ack record marks a request as confirmed.
+Appends from concurrent threads share one fsync. A torn record at the end of the file, left
+by a crash, is dropped when the spool is opened. The file is emptied once no request is left,
+and rewritten with only the unconfirmed requests once most of its records are acked.
+"""
+import os
+import struct
+import threading
+import zlib
+import constants
+
+REQUEST_RECORD = 1
+ACK_RECORD = 2
+LATEST_REQUEST_RECORD = 3
+#Record type, sequence number, issue id length, data length and CRC32 of the issue id and data
+RECORD_HEADER = struct.Struct(">BQHII")
+
+def pack_record(record_type, sequence_number, issue_id=b"", data=b""):
+  """Pack a record.
+
+  Args:
+      record_type (int): REQUEST_RECORD, ACK_RECORD or LATEST_REQUEST_RECORD
+      sequence_number (int): the sequence number of the request
+      issue_id (bytes): the id of the Buganizer issue of the request
+      data (bytes): the serialized request
+
+  Returns:
+      bytes: the record
+  """
+  payload = issue_id + data
+  return RECORD_HEADER.pack(record_type, sequence_number, len(issue_id), len(data),
+                            zlib.crc32(payload)) + payload
+
+def read_records(spool_bytes):
+  """Read the complete records of a spool file.
+
+  Args:
+      spool_bytes (bytes): the content of the spool file
+
+  Returns:
+      tuple: the list of (record type, sequence number, issue id, data) of every complete
+             record, and the length of the file up to the end of the last one
+  """
+  records = []
+  offset = 0
+  while offset + RECORD_HEADER.size <= len(spool_bytes):
+    record_type, sequence_number, issue_id_length, data_length, crc = \
+      RECORD_HEADER.unpack_from(spool_bytes, offset)
+    payload_start = offset + RECORD_HEADER.size
+    payload_end = payload_start + issue_id_length + data_length
+    payload = spool_bytes[payload_start:payload_end]
+    if payload_end > len(spool_bytes) or zlib.crc32(payload) != crc or \
+      record_type not in (REQUEST_RECORD, ACK_RECORD, LATEST_REQUEST_RECORD):
+      break
+    records.append((record_type, sequence_number, payload[:issue_id_length].decode("utf-8"),
+                    payload[issue_id_length:]))
+    offset = payload_end
+  return records, offset
+
+class RequestSpool():
+  """A durable spool of the requests which were not confirmed yet."""
+
+  def __init__(self, path, compact_min_records=None, compact_ratio=None):
+    """Open the spool, creating the file if needed, and load the unconfirmed requests.
+
+    Args:
+        path (str): the path of the spool file
+        compact_min_records (int): the number of acked requests after which the file may be
+                                   rewritten, constants.SPOOL_COMPACT_MIN_RECORDS by default
+        compact_ratio (float): the file is rewritten once the acked requests outnumber the
+                               unconfirmed ones this many times,
+                               constants.SPOOL_COMPACT_RATIO by default
+    """
+    self.path = path
+    self.compact_min_records = compact_min_records or constants.SPOOL_COMPACT_MIN_RECORDS
+    self.compact_ratio = compact_ratio or constants.SPOOL_COMPACT_RATIO
+    self._lock = threading.Lock()
+    self._sync_lock = threading.Lock()
+    #The (issue id, data) of every unconfirmed request, keyed by sequence number
+    self._pending = {}
+    #The sequence number of the unconfirmed latest request of every issue
+    self._latest = {}
+    self._next_sequence_number = 1
+    self._written_sequence_number = 0
+    self._synced_sequence_number = 0
+    #The number of acked requests still in the file
+    self._acked_count = 0
+
+    spool_bytes = b""
+    if os.path.exists(path):
+      with open(path, "rb") as spool_file:
+        spool_bytes = spool_file.read()
+    records, valid_length = read_records(spool_bytes)
+    for record_type, sequence_number, issue_id, data in records:
+      if record_type == ACK_RECORD:
+        self._remove(sequence_number)
+      else:
+        self._add(record_type, sequence_number, issue_id, data)
+      self._next_sequence_number = max(self._next_sequence_number, sequence_number + 1)
+
+    if valid_length != len(spool_bytes) or len(records) != len(self._pending):
+      self._rewrite()
+    self._file = open(path, "ab")
+
+  def _add(self, record_type, sequence_number, issue_id, data):
+    """Add a request to the unconfirmed requests, replacing the previous latest request of
+    its issue if it is a latest request. Called with self._lock held.
+
+    Args:
+        record_type (int): REQUEST_RECORD or LATEST_REQUEST_RECORD
+        sequence_number (int): the sequence number of the request
+        issue_id (str): the id of the Buganizer issue of the request
+        data (bytes): the serialized request
+
+    Returns:
+        bool: True if a previous request was replaced
+    """
+    self._pending[sequence_number] = (issue_id, data)
+    if record_type != LATEST_REQUEST_RECORD:
+      return False
+    replaced_sequence_number = self._latest.get(issue_id)
+    self._latest[issue_id] = sequence_number
+    return self._remove(replaced_sequence_number)
+
+  def _remove(self, sequence_number):
+    """Remove a request from the unconfirmed requests. Called with self._lock held.
+
+    Args:
+        sequence_number (int): the sequence number of the request
+
+    Returns:
+        bool: True if the request was still unconfirmed
+    """
+    request = self._pending.pop(sequence_number, None)
+    if request is None:
+      return False
+    if self._latest.get(request[0]) == sequence_number:
+      del self._latest[request[0]]
+    return True
+
+  def _rewrite(self):
+    """Replace the spool file with one holding only the unconfirmed requests."""
+    temporary_path = self.path + ".tmp"
+    with open(temporary_path, "wb") as spool_file:
+      for sequence_number, (issue_id, data) in sorted(self._pending.items()):
+        record_type = LATEST_REQUEST_RECORD if self._latest.get(issue_id) == sequence_number \
+          else REQUEST_RECORD
+        spool_file.write(pack_record(record_type, sequence_number,
+                                     issue_id.encode("utf-8"), data))
+      spool_file.flush()
+      os.fsync(spool_file.fileno())
+    os.replace(temporary_path, self.path)
+    directory = os.open(os.path.dirname(os.path.abspath(self.path)), os.O_RDONLY)
+    try:
+      os.fsync(directory)
+    finally:
+      os.close(directory)
+
+  def append(self, issue_id, data, latest=False):
+    """Append a request to the spool. The request is on disk when the call returns;
+    concurrent appends are written with one fsync.
+
+    Args:
+        issue_id (str): the id of the Buganizer issue of the request
+        data (bytes): the serialized request
+        latest (bool): whether the request replaces the unconfirmed latest request of its
+                       issue, for requests rebuilt from the issue fields on every visit
+
+    Returns:
+        int: the sequence number of the request, used to confirm it
+    """
+    record_type = LATEST_REQUEST_RECORD if latest else REQUEST_RECORD
+    with self._lock:
+      sequence_number = self._next_sequence_number
+      self._next_sequence_number += 1
+      self._file.write(pack_record(record_type, sequence_number,
+                                   issue_id.encode("utf-8"), data))
+      #The replaced request is dropped on the next start as well, without an ack record
+      if self._add(record_type, sequence_number, issue_id, data):
+        self._acked_count += 1
+      self._written_sequence_number = sequence_number
+
+    with self._sync_lock:
+      #Another thread may have synced this record while this one waited
+      if self._synced_sequence_number < sequence_number:
+        with self._lock:
+          self._file.flush()
+          synced_sequence_number = self._written_sequence_number
+        os.fsync(self._file.fileno())
+        self._synced_sequence_number = synced_sequence_number
+    return sequence_number
+
+  def confirm(self, sequence_number):
+    """Remove a published request from the spool. The spool file is emptied once every
+    request is confirmed, and compacted once most of its requests are.
+
+    Args:
+        sequence_number (int): the sequence number returned by append()
+    """
+    with self._lock:
+      if not self._remove(sequence_number):
+        return
+      if not self._pending:
+        self._file.flush()
+        self._file.truncate(0)
+        self._acked_count = 0
+        return
+      #A lost ack only replays an already published request, so it is not synced
+      self._file.write(pack_record(ACK_RECORD, sequence_number))
+      self._acked_count += 1
+      if self._acked_count < max(self.compact_min_records,
+                                 self.compact_ratio * len(self._pending)):
+        return
+    self.compact()
+
+  def compact(self):
+    """Rewrite the spool file with only the unconfirmed requests."""
+    #Taken in the order of append(), which syncs the file outside of self._lock
+    with self._sync_lock, self._lock:
+      self._file.close()
+      self._rewrite()
+      self._file = open(self.path, "ab")
+      self._acked_count = 0
+      self._synced_sequence_number = self._written_sequence_number
+
+  def is_pending(self, sequence_number):
+    """Check whether a request is still waiting to be published.
+
+    Args:
+        sequence_number (int): the sequence number returned by append()
+
+    Returns:
+        bool: False once the request is confirmed or replaced by a newer request
+    """
+    with self._lock:
+      return sequence_number in self._pending
+
+  def pending_count(self):
+    """Returns:
+        int: the number of unconfirmed requests
+    """
+    with self._lock:
+      return len(self._pending)
+
+  def pending_batches(self, batch_size):
+    """Iterate over the unconfirmed requests in the order they were appended.
+
+    Args:
+        batch_size (int): the number of requests in each batch
+
+    Yields:
+        list: the (sequence number, issue id, data) of up to batch_size requests
+    """
+    with self._lock:
+      sequence_numbers = sorted(self._pending)
+    for start in range(0, len(sequence_numbers), batch_size):
+      batch = []
+      with self._lock:
+        for sequence_number in sequence_numbers[start:start + batch_size]:
+          if sequence_number in self._pending:
+            batch.append((sequence_number,) + self._pending[sequence_number])
+      yield batch
+
+  def close(self):
+    """Close the spool file."""
+    with self._lock:
+      self._file.flush()
+      os.fsync(self._file.fileno())
+      self._file.close()
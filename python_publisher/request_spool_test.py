@@ -0,0 +1,208 @@
+"""Test file for request_spool.py"""
+from concurrent import futures
+import os
+import tempfile
+import time
+import unittest
+import constants
+import logs.logger
+from benchmark import fake_publisher
+from publish_queue import publish_queue
+from pubsub_publisher import pubsub_publisher
+from request_spool import request_spool
+
+logger = logs.logger.RecordingLogger()
+
+class OutagePublisher():
+  """A stand-in for the publisher whose first publishes fail, as during a Pub/Sub outage."""
+  def __init__(self, failures):
+    """Setup the OutagePublisher
+
+    Args:
+        failures (int): the number of publishes which fail
+    """
+    self.failures = failures
+    self.messages = []
+
+  def publish(self, data):
+    """Publish a message, unless the outage is still ongoing.
+
+    Returns:
+        concurrent.futures.Future: resolves to the message id, or fails during the outage
+    """
+    future = futures.Future()
+    if self.failures:
+      self.failures -= 1
+      future.set_exception(RuntimeError("Pub/Sub is unavailable"))
+    else:
+      self.messages.append(data)
+      future.set_result(str(len(self.messages)))
+    return future
+
+class TestsRequestSpool(unittest.TestCase):
+  """Test methods from request_spool.py
+
+  Args:
+    unittest (unittest.TestCase): unittest Testcase
+  """
+  def setUp(self):
+    self.directory = tempfile.TemporaryDirectory()
+    self.path = os.path.join(self.directory.name, "request_spool.dat")
+
+  def tearDown(self):
+    self.directory.cleanup()
+
+  def test_unconfirmed_requests_survive_restart(self):
+    """Test reopening the spool after one of two requests was confirmed.
+    Assert that only the unconfirmed request is left.
+    """
+    spool = request_spool.RequestSpool(self.path)
+    confirmed = spool.append("1", b"first")
+    spool.append("2", b"second")
+    spool.confirm(confirmed)
+    spool.close()
+
+    spool = request_spool.RequestSpool(self.path)
+    assert [record[1:] for batch in spool.pending_batches(10) for record in batch] == \
+      [("2", b"second")]
+    spool.close()
+
+  def test_torn_record_is_dropped(self):
+    """Test reopening a spool whose last record was cut short by a crash.
+    Assert that the complete records are kept and the file is repaired.
+    """
+    spool = request_spool.RequestSpool(self.path)
+    spool.append("1", b"first")
+    spool.close()
+    with open(self.path, "ab") as spool_file:
+      spool_file.write(request_spool.pack_record(request_spool.REQUEST_RECORD, 2, b"2",
+                                                 b"second")[:-3])
+
+    spool = request_spool.RequestSpool(self.path)
+    sequence_number = spool.append("3", b"third")
+    spool.close()
+    spool = request_spool.RequestSpool(self.path)
+    assert spool.pending_count() == 2 and sequence_number == 2
+    spool.close()
+
+  def test_spool_is_compacted(self):
+    """Test confirming many requests while an older one stays unconfirmed.
+    Assert that the file is rewritten instead of growing with every request.
+    """
+    spool = request_spool.RequestSpool(self.path, compact_min_records=10, compact_ratio=4)
+    spool.append("stuck", b"stuck")
+    for issue_id in range(100):
+      spool.confirm(spool.append(str(issue_id), b"data"))
+    spool.close()
+    assert os.path.getsize(self.path) < 20 * len(request_spool.pack_record(
+        request_spool.REQUEST_RECORD, 1, b"99", b"data"))
+
+    spool = request_spool.RequestSpool(self.path)
+    assert [record[1:] for batch in spool.pending_batches(10) for record in batch] == \
+      [("stuck", b"stuck")]
+    spool.close()
+
+  def test_request_outlives_outage(self):
+    """Test a spooled request which fails more attempts than max_attempts.
+    Assert that it stays in the spool and is published once Pub/Sub is back.
+    """
+    publisher = OutagePublisher(failures=5)
+    spool = request_spool.RequestSpool(self.path)
+    requests = publish_queue.PublishQueue(publisher, logger, max_attempts=2, retry_base_sec=0,
+                                          spool=spool, retry_max_sec=0.01)
+    confirmation = requests.submit("1", b"data")
+    assert confirmation.result(timeout=5) == "1"
+    requests.stop(timeout=5)
+    spool.close()
+    assert publisher.messages == [b"data"] and requests.stats()["failed"] == 0
+
+    spool = request_spool.RequestSpool(self.path)
+    assert spool.pending_count() == 0
+    spool.close()
+
+  def test_latest_request_replaces_previous(self):
+    """Test spooling a newer latest request of an issue while the previous one waits.
+    Assert that only the newer request is kept, also after a restart, and that the previous
+    one is not published.
+    """
+    publisher = OutagePublisher(failures=1)
+    spool = request_spool.RequestSpool(self.path)
+    requests = publish_queue.PublishQueue(publisher, logger, retry_base_sec=0.2, spool=spool)
+    previous = requests.submit("1", b"previous", latest=True)
+    requests.submit("2", b"other", latest=True)
+    spool.append("1", b"latest", latest=True)
+    with self.assertRaises(publish_queue.SupersededError):
+      previous.result(timeout=5)
+    requests.stop(timeout=5)
+    spool.close()
+    assert b"previous" not in publisher.messages
+
+    spool = request_spool.RequestSpool(self.path)
+    assert [record[1:] for batch in spool.pending_batches(10) for record in batch] == \
+      [("1", b"latest")]
+    spool.close()
+
+  def test_superseded_retry_is_dropped_before_it_is_due(self):
+    """Test submitting a newer latest request of an issue while the previous one waits for
+    a retry.
+    Assert that the previous request is dropped right away, without waiting for its retry,
+    and that the newer request is published.
+    """
+    publisher = OutagePublisher(failures=1)
+    spool = request_spool.RequestSpool(self.path)
+    requests = publish_queue.PublishQueue(publisher, logger, retry_base_sec=60, spool=spool)
+    previous = requests.submit("1", b"previous", latest=True)
+    deadline = time.monotonic() + 5
+    while requests.stats()["backlog"] != 1 and time.monotonic() < deadline:
+      time.sleep(0.01)
+    latest = requests.submit("1", b"latest", latest=True)
+    with self.assertRaises(publish_queue.SupersededError):
+      previous.result(timeout=5)
+    assert latest.result(timeout=5) == "1"
+    requests.stop(timeout=5)
+    spool.close()
+    assert publisher.messages == [b"latest"] and requests.stats()["superseded"] == 1
+
+  def test_spool_depth_warning(self):
+    """Test submitting requests while Pub/Sub is unavailable beyond the spool warning depth.
+    Assert that the warning is logged once.
+    """
+    recording_logger = logs.logger.RecordingLogger()
+    spool = request_spool.RequestSpool(self.path)
+    requests = publish_queue.PublishQueue(OutagePublisher(failures=100), recording_logger,
+                                          retry_base_sec=60, spool=spool)
+    warn_pending_requests = constants.SPOOL_WARN_PENDING_REQUESTS
+    constants.SPOOL_WARN_PENDING_REQUESTS = 2
+    try:
+      for issue_id in range(4):
+        requests.submit(str(issue_id), b"data")
+    finally:
+      constants.SPOOL_WARN_PENDING_REQUESTS = warn_pending_requests
+    spool.close()
+    warnings = [message for message in recording_logger.messages if "WARNING" in message]
+    assert len(warnings) == 1 and warnings[0].startswith("WARNING: 2 ")
+
+  def test_replay_drains_spool(self):
+    """Test replaying a spool through the publish queue after an outage.
+    Assert that every request is published and the spool file is emptied.
+    """
+    spool = request_spool.RequestSpool(self.path)
+    for issue_id in range(5):
+      spool.append(str(issue_id), b"data")
+    spool.close()
+
+    client = fake_publisher.FakePublisherClient()
+    spool = request_spool.RequestSpool(self.path)
+    requests = publish_queue.PublishQueue(pubsub_publisher.PubSubPublisher(client), logger,
+                                          spool=spool)
+    replayed_requests = requests.replay_spool()
+    for _, _, confirmation in replayed_requests:
+      confirmation.result(timeout=5)
+    requests.stop(timeout=5)
+    spool.close()
+    client.stop()
+    assert len(replayed_requests) == 5 and len(client.messages) == 5
+    assert os.path.getsize(self.path) == 0
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,235 @@
+"""This module holds the ValidationIndex class which keeps the queue ids and feature names
+known to the Historical Traffic Database in memory, so that the changes of an EnqueueRules
+request can be checked before it is published instead of after a full simulation.
+
+The index is loaded from the Queues, Videos and EnqueueRule tables, see SPANNER_SCHEMA.md.
+Each refresh only reads the rows whose primary key sorts after the last row already read.
+Rows inserted with a smaller key, and deleted rows, are picked up by the full reload done
+every constants.VALIDATION_INDEX_FULL_REFRESH_SEC.
+"""
+import threading
+import constants
+from polling_scheduler import polling_scheduler
+
+#The column read from each table, and whether its values are queue ids or feature names
+INDEX_TABLES = (("Queues", "Id", "queues"), ("Videos", "Features", "features"),
+                ("EnqueueRule", "Rule", "features"))
+
+_shared_index = None
+_shared_index_lock = threading.Lock()
+
+class SpannerIndexSource():
+  """Reads the indexed tables of the Historical Traffic Database in primary key order."""
+
+  def __init__(self, instance_id=None, database_id=None):
+    """Setup the SpannerIndexSource. The database is only opened by the first read.
+
+    Args:
+        instance_id (str): the Spanner instance, constants.SPANNER_INSTANCE_ID by default
+        database_id (str): the Spanner database, constants.SPANNER_DATABASE_ID by default
+    """
+    self.instance_id = instance_id or constants.SPANNER_INSTANCE_ID
+    self.database_id = database_id or constants.SPANNER_DATABASE_ID
+    self._database = None
+
+  def database(self):
+    """Get the database, opening it on first use. The Spanner library is imported here,
+    so it does not slow down the start and processes which do not validate requests never
+    import it.
+
+    Returns:
+        google.cloud.spanner_v1.database.Database: the Historical Traffic Database
+    """
+    if self._database is None:
+      from google.cloud import spanner
+
+      instance = spanner.Client().instance(self.instance_id)
+      self._database = instance.database(self.database_id)
+    return self._database
+
+  def read_rows(self, table, column, after_id, limit):
+    """Read the next rows of a table.
+
+    Args:
+        table (str): the name of the table
+        column (str): the column to read
+        after_id (str): only rows whose Id sorts after it are read, every row if None
+        limit (int): the most rows to read
+
+    Returns:
+        list: the (Id, column value) of every row read, in Id order
+    """
+    query = "SELECT Id, " + column + " FROM " + table
+    params = {"limit": limit}
+    if after_id is not None:
+      query += " WHERE Id > @after_id"
+      params["after_id"] = after_id
+    query += " ORDER BY Id LIMIT @limit"
+    with self.database().snapshot() as snapshot:
+      return [tuple(row) for row in snapshot.execute_sql(query, params=params)]
+
+class ValidationIndex():
+  """The queue ids and feature names of the Historical Traffic Database, checked in O(1)."""
+
+  def __init__(self, source, logger=None, clock=None):
+    """Setup the ValidationIndex. Nothing is read before the first refresh().
+
+    Args:
+        source (SpannerIndexSource): reads the indexed tables
+        logger (logs.logger.Logger): logs failed refreshes, if given
+        clock (polling_scheduler.SystemClock): the clock used to read the time, a fake
+                                               clock in tests
+    """
+    self.source = source
+    self.logger = logger
+    self.clock = clock or polling_scheduler.SystemClock()
+    self.queues = set()
+    self.features = set()
+    #The Id of the last row read from each table
+    self._last_ids = {}
+    self._full_refresh_time = None
+    self._refresh_time = None
+    self._lock = threading.Lock()
+
+  def is_ready(self):
+    """Returns:
+        bool: True once the index was fully loaded
+    """
+    return self._full_refresh_time is not None
+
+  def refresh(self):
+    """Read the rows added since the last refresh, or reload every table once
+    constants.VALIDATION_INDEX_FULL_REFRESH_SEC passed. A failed refresh keeps the index
+    as it was.
+
+    Returns:
+        bool: True if the refresh succeeded
+    """
+    with self._lock:
+      now = self.clock.time()
+      full_refresh = self._full_refresh_time is None or \
+        now - self._full_refresh_time >= constants.VALIDATION_INDEX_FULL_REFRESH_SEC
+      values = {"queues": set(), "features": set()}
+      last_ids = {} if full_refresh else dict(self._last_ids)
+      try:
+        for table, column, kind in INDEX_TABLES:
+          last_ids[table] = self._read_table(table, column, last_ids.get(table), values[kind])
+      except Exception as error:
+        if self.logger:
+          self.logger.log("ERROR: Failed to refresh the validation index: " + str(error) + \
+            "\n")
+        return False
+
+      if full_refresh:
+        self.queues = values["queues"]
+        self.features = values["features"]
+        self._full_refresh_time = now
+      else:
+        self.queues.update(values["queues"])
+        self.features.update(values["features"])
+      self._last_ids = last_ids
+      self._refresh_time = now
+      return True
+
+  def _read_table(self, table, column, after_id, values):
+    """Read every row of a table after a row, page by page.
+
+    Args:
+        table (str): the name of the table
+        column (str): the column to read
+        after_id (str): only rows whose Id sorts after it are read, every row if None
+        values (set): the values of the column are added to it
+
+    Returns:
+        str: the Id of the last row read, after_id if no row was read
+    """
+    while True:
+      rows = self.source.read_rows(table, column, after_id,
+                                   constants.VALIDATION_INDEX_PAGE_SIZE)
+      for row_id, value in rows:
+        if column == "Id":
+          values.add(row_id)
+        elif isinstance(value, str):
+          #Rules stored as text list their features separated by commas
+          values.update(feature.strip() for feature in value.split(","))
+        else:
+          values.update(value)
+      if rows:
+        after_id = rows[-1][0]
+      if len(rows) < constants.VALIDATION_INDEX_PAGE_SIZE:
+        return after_id
+
+  def _refresh_after_miss(self):
+    """Refresh the index after an unknown value was looked up, at most once every
+    constants.VALIDATION_INDEX_MISS_REFRESH_SEC, so that a queue or feature created since
+    the last refresh is not rejected.
+
+    Returns:
+        bool: True if the index was refreshed
+    """
+    if self._refresh_time is not None and \
+      self.clock.time() - self._refresh_time < constants.VALIDATION_INDEX_MISS_REFRESH_SEC:
+      return False
+    return self.refresh()
+
+  def has_queue(self, queue_id):
+    """Check whether a queue exists.
+
+    Args:
+        queue_id (str): the id of the queue
+
+    Returns:
+        bool: True if the queue exists, or if the index is not loaded
+    """
+    return not self.unknown_queues([queue_id])
+
+  def unknown_queues(self, queue_ids):
+    """Find the queues which do not exist.
+
+    Args:
+        queue_ids (list): the ids of the queues
+
+    Returns:
+        list: the queues which do not exist, empty if the index is not loaded
+    """
+    if not self.is_ready():
+      return []
+    unknown = [queue_id for queue_id in queue_ids if queue_id not in self.queues]
+    if unknown and self._refresh_after_miss():
+      unknown = [queue_id for queue_id in unknown if queue_id not in self.queues]
+    return unknown
+
+  def unknown_features(self, features):
+    """Find the features which do not exist.
+
+    Args:
+        features (list): the names of the features
+
+    Returns:
+        list: the features which do not exist, empty if the index is not loaded
+    """
+    if not self.is_ready():
+      return []
+    unknown = [feature for feature in features if feature not in self.features]
+    if unknown and self._refresh_after_miss():
+      unknown = [feature for feature in unknown if feature not in self.features]
+    return unknown
+
+def get_index():
+  """Get the validation index shared by the whole process.
+
+  Returns:
+      ValidationIndex: the shared index, None if requests are not validated
+  """
+  with _shared_index_lock:
+    return _shared_index
+
+def set_index(index):
+  """Replace the validation index shared by the whole process.
+
+  Args:
+      index (ValidationIndex): the index to share, or None to stop validating requests
+  """
+  global _shared_index
+  with _shared_index_lock:
+    _shared_index = index
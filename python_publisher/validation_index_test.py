@@ -0,0 +1,121 @@
+"""Test file for validation_index.py"""
+import sys
+import unittest
+from benchmark import fixture_pages
+from config_change_request import config_change_pb2
+from enqueue_rules_parser import enqueue_rules_parser
+from validation_index import validation_index
+
+class FakeClock():
+  """A clock that only advances when slept on."""
+  def __init__(self):
+    self.now = 0.0
+
+  def time(self):
+    """Returns:
+        float: the fake current time in seconds
+    """
+    return self.now
+
+  def sleep(self, seconds):
+    """Advance the fake time without blocking.
+
+    Args:
+        seconds (float): the number of seconds to advance
+    """
+    self.now += seconds
+
+class FakeIndexSource():
+  """A stand-in for the Historical Traffic Database holding the indexed tables in memory."""
+  def __init__(self):
+    self.tables = {"Queues": {"Q0": "Q0", "Q1": "Q1"},
+                   "Videos": {"1": ["f1", "f2"]},
+                   "EnqueueRule": {"1": ["f3"]}}
+    self.reads = []
+
+  def read_rows(self, table, column, after_id, limit):
+    """Read the next rows of a table in Id order."""
+    self.reads.append((table, after_id))
+    row_ids = sorted(row_id for row_id in self.tables[table]
+                     if after_id is None or row_id > after_id)
+    return [(row_id, self.tables[table][row_id]) for row_id in row_ids[:limit]]
+
+class TestsValidationIndex(unittest.TestCase):
+  """Test methods from validation_index.py
+
+  Args:
+    unittest (unittest.TestCase): unittest Testcase
+  """
+  def test_refresh_reads_new_rows(self):
+    """Test refresh() after a queue and a feature are added.
+    Assert that only the new rows are read and that they are known afterwards.
+    """
+    source = FakeIndexSource()
+    index = validation_index.ValidationIndex(source, clock=FakeClock())
+    assert index.has_queue("Q9")
+    index.refresh()
+    assert not index.has_queue("Q9")
+    source.tables["Queues"]["Q9"] = "Q9"
+    source.tables["Videos"]["2"] = ["f9"]
+    source.reads.clear()
+    index.refresh()
+    assert ("Queues", "Q1") in source.reads and ("Videos", "1") in source.reads
+    assert index.has_queue("Q9") and index.unknown_features(["f1", "f3", "f9"]) == []
+
+  def test_unknown_value_refreshes_after_delay(self):
+    """Test has_queue() for a queue created after the last refresh.
+    Assert that the index is refreshed only once the miss refresh delay passed.
+    """
+    source = FakeIndexSource()
+    clock = FakeClock()
+    index = validation_index.ValidationIndex(source, clock=clock)
+    index.refresh()
+    source.tables["Queues"]["Q9"] = "Q9"
+    assert not index.has_queue("Q9")
+    clock.sleep(validation_index.constants.VALIDATION_INDEX_MISS_REFRESH_SEC)
+    assert index.has_queue("Q9")
+
+  def test_parse_changes_reports_unknown_values(self):
+    """Test parse_changes() with an index and a template using an unknown queue and feature.
+    Assert that both are reported and only the valid change is added.
+    """
+    index = validation_index.ValidationIndex(FakeIndexSource(), clock=FakeClock())
+    index.refresh()
+    template = fixture_pages.enqueue_rules_template(3).replace("f2, f3", "f7", 1)
+    enqueue_rules = config_change_pb2.EnqueueRules()
+    lines = enqueue_rules_parser.iter_lines(template)
+    next(lines)
+    errors = enqueue_rules_parser.parse_changes(lines, enqueue_rules, "reporter",
+                                                validation_index=index)
+    assert errors == ["Line 4: the features 'f7' do not exist.",
+                      "Line 11: the queue 'Q2' does not exist."]
+    assert [change.queue for change in enqueue_rules.changes] == ["Q1"]
+
+  def test_parse_changes_checks_every_queue(self):
+    """Test parse_changes() with an index and a queue entry listing several queues.
+    Assert that each queue is checked and only the unknown ones are reported.
+    """
+    index = validation_index.ValidationIndex(FakeIndexSource(), clock=FakeClock())
+    index.refresh()
+    template = "\n".join(["Configuration: EnqueueRules",
+                          "Method: Add", "QueueId: Q0, Q1", "Features: f1", "Priority: 0",
+                          "Method: Add", "QueueId: Q0, Q8, Q9", "Features: f1", "Priority: 1"])
+    enqueue_rules = config_change_pb2.EnqueueRules()
+    lines = enqueue_rules_parser.iter_lines(template)
+    next(lines)
+    errors = enqueue_rules_parser.parse_changes(lines, enqueue_rules, "reporter",
+                                                validation_index=index)
+    assert errors == ["Line 7: the queues 'Q8', 'Q9' do not exist."]
+    assert [change.queue for change in enqueue_rules.changes] == ["Q0, Q1"]
+
+  def test_spanner_source_opens_lazily(self):
+    """Test creating the Spanner source.
+    Assert that the Spanner library is not imported before the first read.
+    """
+    spanner_imported = "google.cloud.spanner" in sys.modules
+    source = validation_index.SpannerIndexSource()
+    assert source._database is None
+    assert ("google.cloud.spanner" in sys.modules) == spanner_imported
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,229 @@
+"""This module holds the html parser backends used to read Buganizer pages. Each backend
+parses a page into a document answering the few queries the scrapers make: the page title,
+the issue list table, the issue metadata, the component path links and the comment stream.
+
+The backends are tried in the order of constants.HTML_PARSERS and the first installed one
+is used. BeautifulSoup with the built-in "html.parser" is always installed and remains the
+fallback. BeautifulSoup is slow to import, so it is only imported by the first page parsed
+with one of its builders.
+"""
+import constants
+
+try:
+  from selectolax import lexbor
+except ImportError:
+  lexbor = None
+
+try:
+  import lxml
+except ImportError:
+  lxml = None
+
+METADATA_FIELD_CLASS = "bv2-issue-metadata-field-inner"
+METADATA_LIST_ID_PREFIX = "bv2-issue-metadata-list"
+COMMENT_CLASS = "bv2-event ng-star-inserted"
+COMMENT_USER_CLASS = "bv2-event-user-id"
+COMMENT_TEXT_TAG = "b-plain-format-unquoted-section"
+COMMENT_TEXT_CLASS = "ng-star-inserted"
+
+class SoupDocument():
+  """A page parsed by BeautifulSoup, with the "lxml" or the built-in "html.parser" builder."""
+
+  def __init__(self, source_html, builder, only_tags=None):
+    """Parse a page.
+
+    Args:
+        source_html (str): the html of the page
+        builder (str): the BeautifulSoup tree builder, "lxml" or "html.parser"
+        only_tags (tuple): if given, only these tags and their contents are built into the
+                           tree, every other element is skipped while tokenizing
+    """
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    parse_only = SoupStrainer(list(only_tags)) if only_tags else None
+    self.soup = BeautifulSoup(source_html, builder, parse_only=parse_only)
+
+  def title(self):
+    """Returns:
+        str: the title of the page, or None if the page has no title
+    """
+    if self.soup.title is None:
+      return None
+    return self.soup.title.string
+
+  def table_header_titles(self):
+    """Returns:
+        list: the text of every header cell of the first table header
+    """
+    thead = self.soup.find("thead")
+    if thead is None:
+      return []
+    return [_th.get_text(strip=True) for _th in thead.find_all("th")]
+
+  def table_rows(self):
+    """Returns:
+        list: the (data-row-id, list of cell texts) of every table body row
+    """
+    rows = []
+    for tbody in self.soup.find_all("tbody"):
+      for _tr in tbody.find_all("tr"):
+        rows.append((_tr.get("data-row-id"),
+                     [_td.get_text(strip=True) for _td in _tr.find_all("td")]))
+    return rows
+
+  def metadata_tags(self):
+    """Returns:
+        list: the (tag name, classes, id, aria-label) of every issue metadata field div and
+              issue metadata list button, in document order
+    """
+    return [(tag.name, tag.get("class", []), tag.get("id", ""), tag["aria-label"])
+            for tag in self.soup.find_all(is_metadata_tag)]
+
+  def component_link_texts(self):
+    """Returns:
+        list: the text of every link to a component search
+    """
+    return [link.get_text() for link in self.soup.find_all(
+        "a", href=lambda href: href and "componentid:" in href)]
+
+  def comments(self):
+    """Returns:
+        list: the (author, text) of every comment of the comment stream, the text is None
+              for comments without plain text
+    """
+    comments = []
+    for comment in self.soup.find_all("li", COMMENT_CLASS):
+      user_tag = comment.find("span", COMMENT_USER_CLASS)
+      text_tag = comment.find(COMMENT_TEXT_TAG, COMMENT_TEXT_CLASS)
+      comments.append((user_tag.get("data-hovercard-id") if user_tag else None,
+                       text_tag.get_text(separator="\n") if text_tag else None))
+    return comments
+
+class LexborDocument():
+  """A page parsed by the selectolax lexbor C parser and queried with CSS selectors."""
+
+  def __init__(self, source_html, only_tags=None):
+    """Parse a page. The C parser builds the whole tree faster than the BeautifulSoup
+    backends can skip unwanted elements, so only_tags is not used.
+
+    Args:
+        source_html (str): the html of the page
+        only_tags (tuple): the tags the caller reads, unused
+    """
+    self.tree = lexbor.LexborHTMLParser(source_html)
+
+  def title(self):
+    """Returns:
+        str: the title of the page, or None if the page has no title
+    """
+    title = self.tree.css_first("title")
+    if title is None:
+      return None
+    return title.text()
+
+  def table_header_titles(self):
+    """Returns:
+        list: the text of every header cell of the first table header
+    """
+    thead = self.tree.css_first("thead")
+    if thead is None:
+      return []
+    return [_th.text(strip=True) for _th in thead.css("th")]
+
+  def table_rows(self):
+    """Returns:
+        list: the (data-row-id, list of cell texts) of every table body row
+    """
+    return [(_tr.attributes.get("data-row-id"), [_td.text(strip=True) for _td in _tr.css("td")])
+            for _tr in self.tree.css("tbody tr")]
+
+  def metadata_tags(self):
+    """Returns:
+        list: the (tag name, classes, id, aria-label) of every issue metadata field div and
+              issue metadata list button, in document order
+    """
+    tags = self.tree.css("div." + METADATA_FIELD_CLASS + "[aria-label], button[id^=\"" + \
+      METADATA_LIST_ID_PREFIX + "\"][aria-label]")
+    return [(tag.tag, (tag.attributes.get("class") or "").split(),
+             tag.attributes.get("id") or "", tag.attributes["aria-label"]) for tag in tags]
+
+  def component_link_texts(self):
+    """Returns:
+        list: the text of every link to a component search
+    """
+    return [link.text() for link in self.tree.css("a[href*=\"componentid:\"]")]
+
+  def comments(self):
+    """Returns:
+        list: the (author, text) of every comment of the comment stream, the text is None
+              for comments without plain text
+    """
+    comments = []
+    for comment in self.tree.css("li." + COMMENT_CLASS.replace(" ", ".")):
+      user_tag = comment.css_first("span." + COMMENT_USER_CLASS)
+      text_tag = comment.css_first(COMMENT_TEXT_TAG + "." + COMMENT_TEXT_CLASS)
+      comments.append((user_tag.attributes.get("data-hovercard-id") if user_tag else None,
+                       text_tag.text(separator="\n") if text_tag else None))
+    return comments
+
+def is_metadata_tag(tag):
+  """Check whether a tag is an issue metadata field div or an issue metadata list button.
+
+  Args:
+      tag (bs4.element.Tag): the tag to check
+
+  Returns:
+      bool: True for metadata field divs and metadata list buttons
+  """
+  if tag.name == "div":
+    return METADATA_FIELD_CLASS in tag.get("class", ()) and tag.has_attr("aria-label")
+  if tag.name == "button":
+    return tag.get("id", "").startswith(METADATA_LIST_ID_PREFIX) and tag.has_attr("aria-label")
+  return False
+
+def available_parsers():
+  """Returns:
+      list: the names of the installed parser backends
+  """
+  parsers = []
+  if lexbor is not None:
+    parsers.append("lexbor")
+  if lxml is not None:
+    parsers.append("lxml")
+  parsers.append("html.parser")
+  return parsers
+
+def select_parser(preferred_parsers=None):
+  """Select the first installed parser backend.
+
+  Args:
+      preferred_parsers (tuple): the parser backends in order of preference,
+                                 constants.HTML_PARSERS by default
+
+  Returns:
+      str: the name of the selected parser backend
+  """
+  installed_parsers = available_parsers()
+  for parser in preferred_parsers or constants.HTML_PARSERS:
+    if parser in installed_parsers:
+      return parser
+  return "html.parser"
+
+def parse(source_html, parser=None, only_tags=None):
+  """Parse a page with a parser backend.
+
+  Args:
+      source_html (str): the html of the page
+      parser (str): the parser backend to use, the first installed backend of
+                    constants.HTML_PARSERS by default
+      only_tags (tuple): if given, the only tags, with their contents, the caller reads
+
+  Returns:
+      SoupDocument or LexborDocument: the parsed page
+  """
+  parser = parser or SELECTED_PARSER
+  if parser == "lexbor":
+    return LexborDocument(source_html, only_tags)
+  return SoupDocument(source_html, parser, only_tags)
+
+SELECTED_PARSER = select_parser()
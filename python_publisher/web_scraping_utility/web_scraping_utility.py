@@ -1,34 +1,73 @@
 """This module holds the WebScrapingUtility class which does all Buganizer html scraping
   for issues under a componentid.
 """
+import contextlib
+import shutil
+import tempfile
 import time
-from bs4 import BeautifulSoup
-from selenium import webdriver, common
+from concurrent import futures
+from selenium import common
 from message_parsing_utility import message_parsing_utility
+from fingerprint_tracker import fingerprint_tracker
+from driver_pool import driver_pool
+from http_page_reader import http_page_reader
+from parsed_page import parsed_page
+from metadata_extractor import metadata_extractor
+from field_mapper import field_mapper
 import constants
 
+#Text served only once a page holds the markup that is scraped
+ISSUE_LIST_PAGE_MARKER = "<tbody"
+ISSUE_PAGE_MARKER = "bv2-issue-metadata-field-reporter"
+CONFIG_TYPES = ("EnqueueRule", "RoutingTargets", "QueueInfo")
+
 class WebScrapingUtility():
   """Responsible for all Buganizer html scraping."""
-  def __init__(self, logger):
+  def __init__(self, logger, scheduler=None, state_store=None):
     """Setup the WebScrapingUtility
 
     Args:
         logger (logs.logger.Logger): the systems error logger
+        scheduler (polling_scheduler.PollingScheduler): limits the number of page loads
+                                                        per minute, if given
+        state_store (issue_state_store.IssueStateStore): persists the comment cursors and
+                                                         published requests of each issue,
+                                                         kept in memory by default
     """
-    self.driver = self.setup_webdriver()
-    self._message_parsing_util = message_parsing_utility.MessageParsingUtility(logger)
+    self.scheduler = scheduler
     self.logger = logger
-
-  def setup_webdriver(self):
+    #The Chrome profile copied for every extra session, removed when the session ends
+    self.profile_copies = {}
+    self.driver = self.setup_webdriver()
+    self.driver_pool = driver_pool.DriverPool(self.setup_driver_pool(),
+                                              self.setup_profile_copy_webdriver)
+    self.http_page_reader = None
+    if constants.READ_MODE == "http":
+      self.http_page_reader = http_page_reader.HttpPageReader(logger)
+    self.fingerprint_tracker = fingerprint_tracker.FingerprintTracker()
+    self._message_parsing_util = message_parsing_utility.MessageParsingUtility(
+        logger, state_store, self.fingerprint_tracker)
+    self.queue_info_extractor = metadata_extractor.MetadataExtractor(
+        constants.QUEUE_INFO_METADATA, field_mapper.get_mapper("QueueInfo"))
+    self.routing_targets_extractor = metadata_extractor.MetadataExtractor(
+        constants.ROUTING_TARGETS_METADATA, field_mapper.get_mapper("RoutingTargets"))
+
+  def setup_webdriver(self, profile_path=None):
     """Completes all neccessary setup for the selenium web driver.
 
+        Args:
+            profile_path (str): the Chrome profile to load, constants.PROFILE_PATH by default
+
         Returns:
             selenium.webdriver.chrome.webdriver.WebDriver: the fully loaded Chrome
                                                           web driver with the desired profile.
     """
+    #Imported here as only the processes which launch a browser need the web driver
+    from selenium import webdriver
+
     try:
       options = webdriver.ChromeOptions()
-      options.add_argument("user-data-dir=" + constants.PROFILE_PATH)
+      options.add_argument("user-data-dir=" + (profile_path or constants.PROFILE_PATH))
       driver = webdriver.Chrome(executable_path=constants.DRIVER_PATH,
                                 options=options)
       return driver
@@ -40,16 +79,108 @@ class WebScrapingUtility():
     except Exception:
       return None
 
+  def setup_driver_pool(self):
+    """Start the web driver sessions used to visit issues concurrently. Chrome cannot
+    open one profile in two sessions, so every session after the first one loads its
+    own copy of the Chrome profile.
+
+        Returns:
+            list: the web driver sessions, starting with self.driver
+    """
+    if not self.driver:
+      return []
+
+    drivers = [self.driver]
+    for _ in range(1, constants.DRIVER_POOL_SIZE):
+      driver = self.setup_profile_copy_webdriver()
+      if driver:
+        drivers.append(driver)
+    return drivers
+
+  def setup_profile_copy_webdriver(self):
+    """Start a web driver session with its own copy of the Chrome profile. The copy is
+    removed when the session ends.
+
+        Returns:
+            selenium.webdriver.chrome.webdriver.WebDriver: the web driver session, or None
+                                                          if it could not be started
+    """
+    profile_copy_path = tempfile.mkdtemp(prefix="hermes-profile-")
+    try:
+      shutil.copytree(constants.PROFILE_PATH, profile_copy_path, dirs_exist_ok=True,
+                      ignore=shutil.ignore_patterns("Singleton*", "*.lock"))
+      driver = self.setup_webdriver(profile_copy_path)
+    except Exception:
+      driver = None
+    if driver is None:
+      shutil.rmtree(profile_copy_path, ignore_errors=True)
+      return None
+    self.profile_copies[driver] = profile_copy_path
+    return driver
+
+  def replace_driver(self, driver):
+    """Quit a broken web driver session and put a new one in its place in the pool.
+
+    Args:
+        driver (selenium.webdriver.chrome.webdriver.WebDriver): the broken session, leased
+                                                                by the caller if pooled
+    """
+    if driver in self.driver_pool.drivers:
+      replacement = self.driver_pool.replace(driver)
+    else:
+      try:
+        driver.quit()
+      except Exception:
+        pass
+      replacement = None
+    if driver is self.driver:
+      self.driver = replacement
+    if driver in self.profile_copies:
+      shutil.rmtree(self.profile_copies.pop(driver), ignore_errors=True)
+
   def quit_scrape(self):
-    """Terminate the webdriver.
+    """Terminate the webdriver and every web driver session in the pool, and remove the
+    copies of the Chrome profile.
     """
-    if self.driver:
+    if self.driver and self.driver not in self.driver_pool.drivers:
       self.driver.quit()
-      self.driver = None
+    self.driver_pool.quit()
+    self.driver = None
+    for profile_copy_path in self.profile_copies.values():
+      shutil.rmtree(profile_copy_path, ignore_errors=True)
+    self.profile_copies = {}
+    if self.http_page_reader:
+      self.http_page_reader.close()
+
+  def load_page(self, url, driver=None):
+    """Load a url in the Chrome Browser once the page load limit allows it.
+
+    Args:
+        url (str): the url to load
+        driver (selenium.webdriver.chrome.webdriver.WebDriver): the web driver session
+                                                                to use, self.driver by default
+    """
+    if self.scheduler:
+      self.scheduler.acquire_page_load()
+    (driver or self.driver).get(url)
+
+  def get_page_over_http(self, url, marker):
+    """Read a url over HTTP once the HTTP read limit allows it.
+
+    Args:
+        url (str): the url to read
+        marker (str): text which the page holds once it serves the scraped markup
+
+    Returns:
+        str: the html of the page, or None if the web driver must load it instead
+    """
+    if self.scheduler:
+      self.scheduler.acquire_page_load(over_http=True)
+    return self.http_page_reader.get_page(url, marker)
 
   def scrape_issues(self, url):
-    """Opens the Buganizer url in the Chrome Browser and scrapes the webpage's source html
-        to get the links for all the issues under the componentid.
+    """Scrapes the links of all the issues under the componentid, reading every page of
+        the Buganizer search results.
 
         Args:
             url (str): the Buganizer url to scrape
@@ -57,293 +188,358 @@ class WebScrapingUtility():
         Return:
             list : List with all the buganizer issues found under the componentid.
     """
-    try:
-      self.driver.get(url)
-    except common.exceptions.InvalidSessionIdException:
-      self.driver.close()
-      error_message = "ERROR: Failed to reach URL, check "\
-      "specified URL in constants.py\n"
-      self.logger.log(error_message)
-      return []
-    except Exception:
-      self.driver.close()
-      error_message = "ERROR: Failed to reach URL, check "\
-      "specified URL in constants.py\n"
-      self.logger.log(error_message)
-      return []
+    return list(self.scrape_issue_pages(url))
 
-    source_html = self.driver.page_source
-    soup = BeautifulSoup(source_html, "html.parser")
-    page_title = soup.title.string
-    buganizer_issues = []
+  def scrape_issue_pages(self, url):
+    """Reads the pages of the Buganizer search results one at a time and yields the link
+        of every issue found, in the order of the search results, so that the first issues
+        can be visited while the next pages are read. Reading stops at the first page
+        without new issues, at a page shorter than the first one, or after
+        constants.MAX_ISSUE_LIST_PAGES pages.
+
+        Once every page was read, the state kept for issues which are no longer listed
+        is deleted.
+
+        Args:
+            url (str): the Buganizer url to scrape, sorted by created_time:desc to visit
+                       new issues first
+
+        Yields:
+            str: the link of each buganizer issue found under the componentid.
+    """
+    seen_issues = set()
+    first_page_length = None
+    for page_number in range(1, constants.MAX_ISSUE_LIST_PAGES + 1):
+      page_url = url
+      if page_number > 1:
+        page_url += constants.ISSUE_LIST_PAGE_PARAMETER % page_number
+      page = self.read_issue_list_page(page_url)
+      if page is None:
+        #Issues past a page that could not be read may still be open
+        return
+
+      page_issues = self.scrape_issue_links(page)
+      new_issues = [issue for issue in page_issues if issue not in seen_issues]
+      if not new_issues:
+        break
+      seen_issues.update(new_issues)
+      for issue in new_issues:
+        yield issue
+
+      if first_page_length is None:
+        first_page_length = len(page_issues)
+      elif len(page_issues) < first_page_length:
+        break
+    else:
+      #More issues than constants.MAX_ISSUE_LIST_PAGES pages may be open
+      return
+
+    if seen_issues:
+      self._message_parsing_util.evict_closed_issues(seen_issues)
+
+  def read_issue_list_page(self, url):
+    """Reads one page of the Buganizer search results over HTTP, or opens it in the Chrome
+        Browser with a web driver session leased from the pool when the HTTP read path
+        fails.
+
+        Args:
+            url (str): the url of the page of search results
 
-    if "Buganizer" not in page_title or "componentid" not in page_title:
-      if "MOMA Single Sign On" in page_title:
-        error_message = "ERROR: You must log into your MOMA account "\
-        "first. Select the 'Use Security Code' option and generate a security code at go/sc.\n"
+        Return:
+            parsed_page.ParsedPage : the page of search results, or None if it could not
+                                     be read.
+    """
+    if self.http_page_reader:
+      source_html = self.get_page_over_http(url, ISSUE_LIST_PAGE_MARKER)
+      if source_html is not None:
+        page = parsed_page.ParsedPage(source_html, only_tags=parsed_page.ISSUE_LIST_TAGS)
+        page_title = page.title()
+        if page_title and "Buganizer" in page_title and "componentid" in page_title:
+          return page
+
+    if self.driver_pool.size > 0:
+      lease = self.driver_pool.lease()
+    elif self.driver:
+      lease = contextlib.nullcontext(self.driver)
+    else:
+      return None
+
+    with lease as driver:
+      if driver is None:
+        return None
+      try:
+        self.load_page(url, driver)
+      except Exception:
+        #The session is replaced, as handing it back would fail every later lease
+        self.replace_driver(driver)
+        error_message = "ERROR: Failed to reach URL, check "\
+        "specified URL in constants.py\n"
+        self.logger.log(error_message)
+        return None
+
+      page_title = driver.title or ""
+
+      if "Buganizer" not in page_title or "componentid" not in page_title:
+        if "MOMA Single Sign On" in page_title:
+          error_message = "ERROR: You must log into your MOMA account "\
+          "first. Select the 'Use Security Code' option and generate a security code at go/sc.\n"
+          self.logger.log(error_message)
+
+          deadline = time.monotonic() + constants.MOMA_LOGIN_TIMEOUT_SEC
+          while "Buganizer" not in page_title:
+            if time.monotonic() >= deadline:
+              self.logger.log("ERROR: No MOMA login within " + \
+                str(constants.MOMA_LOGIN_TIMEOUT_SEC) + " seconds, retrying on the next "\
+                  "pass.\n")
+              break
+            time.sleep(1)
+            page_title = driver.title or ""
+
+          return None
+        error_message = "ERROR: URL does not link to a Buganizer "\
+          "componentid, check specified URL "\
+          "in constants.py\n"
         self.logger.log(error_message)
+        return None
 
-        while "Buganizer" not in page_title:
-          source_html = self.driver.page_source
-          soup = BeautifulSoup(source_html, "html.parser")
-          page_title = soup.title.string
-          time.sleep(1)
+      if self.http_page_reader:
+        self.http_page_reader.load_cookies(driver.get_cookies())
+      return parsed_page.ParsedPage(driver.page_source, only_tags=parsed_page.ISSUE_LIST_TAGS)
 
-        return buganizer_issues
-      error_message = "ERROR: URL does not link to a Buganizer "\
-        "componentid, check specified URL "\
-        "in constants.py\n"
-      self.logger.log(error_message)
-      return buganizer_issues
+  def scrape_issue_links(self, page):
+    """Scrapes the links of all the issues on the Buganizer issue list page and records
+        the fingerprint of each issue.
 
-    for tbody in soup.find_all('tbody'):
-      for _tr in tbody.find_all('tr'):
-        issue_link = "https://b.corp.google.com/issues/" + _tr.get(
-            'data-row-id')
-        buganizer_issues.append(issue_link)
+        Args:
+            page (parsed_page.ParsedPage): the parsed Buganizer issue list page
+
+        Return:
+            list : List with all the buganizer issues found under the componentid.
+    """
+    buganizer_issues = []
+    fingerprint_column_indexes = self.get_fingerprint_column_indexes(page.table_header_titles())
+
+    for row_id, cells in page.table_rows():
+      issue_link = "https://b.corp.google.com/issues/" + row_id
+      buganizer_issues.append(issue_link)
+      self.fingerprint_tracker.observe(issue_link, self.get_issue_fingerprint(
+          cells, fingerprint_column_indexes))
     return buganizer_issues
 
+  def get_fingerprint_column_indexes(self, header_titles):
+    """Find the position of each fingerprint column in the issue list table header.
+
+    Args:
+        header_titles (list): the column titles of the issue list table
+
+    Returns:
+        list: the index of each column in constants.FINGERPRINT_COLUMNS, or None for
+              columns which are not shown on the issue list page
+    """
+    column_indexes = []
+    for column in constants.FINGERPRINT_COLUMNS:
+      if column in header_titles:
+        column_indexes.append(header_titles.index(column))
+      else:
+        column_indexes.append(None)
+    return column_indexes
+
+  def get_issue_fingerprint(self, cells, column_indexes):
+    """Build the fingerprint of an issue from its row on the issue list page.
+
+    Args:
+        cells (list): the cell texts of the issue's table row
+        column_indexes (list): the index of each fingerprint column in the row
+
+    Returns:
+        tuple: the text of each fingerprint column, None for missing columns
+    """
+    fingerprint = []
+    for column_index in column_indexes:
+      if column_index is None or column_index >= len(cells):
+        fingerprint.append(None)
+      else:
+        fingerprint.append(cells[column_index])
+    return tuple(fingerprint)
+
   def visit_all_issues_in_list(self, issues):
     """
     From the list of buganizer issues, visit each issue with the webdriver,
     find the reporter from an html tag send issue html to message_parsing_utility to be parsed.
+    Issues whose fingerprint did not change since they were last visited are skipped.
+
+    Issues are visited concurrently, one thread per issue, so every issue is still parsed
+    and published in order. Issues are read over HTTP when possible, otherwise each thread
+    leases a web driver session from the pool.
+
+    Issues are submitted as they are found, so visits start while the next pages of an
+    issue list generator such as scrape_issue_pages() are read.
 
     Args:
-            issues (list): the Buganizer urls to scrape
+            issues (iterable): the Buganizer urls to scrape
     """
-    for issue in issues:
-      self.driver.implicitly_wait(3)
-      self.driver.get(issue)
-      config_type_text = self.driver.find_element_by_xpath("/html/body/b-service-bootstrap/"\
-        "app-root/div[7]/div/div/edit-issue-page/b-resolving-issue-references/div[2]/div[1]/"\
-          "div[3]/div/div/div[2]/div[2]/div[3]/div/div[1]/div/span/span[6]/span/span/a").text
-
-      source_html = self.driver.page_source
-      soup = BeautifulSoup(source_html, "html.parser")
-
-      advanced_fields = {}
-      advanced_fields["Issue Id"] = issue.replace("https://b.corp.google.com/issues/", "")
-      reporter_tag = soup.find("div", "bv2-issue-metadata-field-inner "\
-        "bv2-issue-metadata-field-reporter")
-      reporter = reporter_tag["aria-label"].replace(
-          " value is ", "\n").split("\n")
-      advanced_fields[reporter[0]] = reporter[1]
-      assignee_tag = soup.find("div", "bv2-issue-metadata-field-inner bv2-issue-metadata-"\
-        "field-assignee")
-      assignee = assignee_tag["aria-label"].replace(
-          " value is ", "\n").split("\n")
-      if assignee[1] != "empty":
-        advanced_fields[assignee[0]] = assignee[1]
-
-      if "EnqueueRule" in config_type_text:
-        config_type = "EnqueueRules"
-      elif "RoutingTargets" in config_type_text:
-        config_type = "RoutingTargets"
-      elif "QueueInfo" in config_type_text:
-        config_type = "QueueInfo"
-
-      advanced_fields["Config Type"] = config_type
-
-      if config_type == "QueueInfo":
-        if assignee[1] != constants.AUTOMATION_USER:
+    if self.http_page_reader:
+      workers_count = constants.HTTP_POOL_SIZE
+    else:
+      workers_count = max(1, self.driver_pool.size)
+
+    submitted_issues = set()
+    with futures.ThreadPoolExecutor(max_workers=workers_count) as executor:
+      visits = []
+      for issue in self.fingerprint_tracker.filter_changed(issues):
+        if issue in submitted_issues:
           continue
+        submitted_issues.add(issue)
+        visits.append(executor.submit(self.visit_pooled_issue, issue))
 
-        self.scrape_queue_info(advanced_fields)
-      elif config_type == "RoutingTargets":
-        if assignee[1] != constants.AUTOMATION_USER:
-          continue
-        self.scrape_routing_targets(advanced_fields)
-      elif config_type == "EnqueueRules":
-        self._message_parsing_util.parse_page(soup, reporter[1], issue)
+      for visit in visits:
+        visit.result()
 
-  def scrape_queue_info(self, advanced_fields):
-    """Scrape all advanced fields from a RoutingTarget Buganizer Issue
+  def visit_pooled_issue(self, issue):
+    """Visit a single Buganizer issue, and count it as visited and remember its fingerprint
+    once it is processed.
+    Issues which could not be read are visited again by the next pass.
 
     Args:
-        advanced_fields (dict): dictionary that holds all advanced fields values
+            issue (str): the URL of the Buganizer issue
     """
-    source_html = self.driver.page_source
-    soup = BeautifulSoup(source_html, "html.parser")
-    severity_tag = soup.find("div", "bv2-issue-metadata-field-inner "\
-      "bv2-issue-metadata-field-severity")
-    severity = severity_tag["aria-label"].replace(
-        " value is ", "\n").split("\n")
-    found_in_tag = soup.find("div", "bv2-issue-metadata-field-inner "\
-      "bv2-issue-metadata-field-foundInVersion")
-    found_in = found_in_tag["aria-label"].replace(
-        " value is ", "\n").split("\n")
-    in_prod_tag = soup.find("div", "bv2-issue-metadata-field-inner "\
-      "bv2-issue-metadata-field-inProd")
-    in_prod = in_prod_tag["aria-label"].replace(
-        " value is ", "\n").split("\n")
-    verifier_tag = soup.find("div", "bv2-issue-metadata-field-inner "\
-      "bv2-issue-metadata-field-verifier")
-    verifier = verifier_tag["aria-label"].replace(
-        " value is ", "\n").split("\n")
-    targeted_to_tag = soup.find("div", "bv2-issue-metadata-field-inner "\
-      "bv2-issue-metadata-field-targetedToVersion")
-    targeted_to = targeted_to_tag["aria-label"].replace(
-        " value is ", "\n").split("\n")
-    queue_id_tag = soup.find("div", "bv2-issue-metadata-field-inner "\
-      "bv2-issue-metadata-field-customField688197")
-    queue_id = queue_id_tag["aria-label"].replace(
-        " value is ", "\n").split("\n")
-    mdb_group_name_tag = soup.find("div", "bv2-issue-metadata-field-inner "\
-      "bv2-issue-metadata-field-customField686879")
-    mdb_group_name = mdb_group_name_tag["aria-label"].replace(
-        " value is ", "\n").split("\n")
-    ops_owner_tag = soup.find("div", "bv2-issue-metadata-field-inner "\
-      "bv2-issue-metadata-field-customField686850")
-    ops_owner = ops_owner_tag["aria-label"].replace(
-        " value is ", "\n").split("\n")
-    gvo_owner_tag = soup.find("div", "bv2-issue-metadata-field-inner "\
-      "bv2-issue-metadata-field-customField686358")
-    gvo_owner = gvo_owner_tag["aria-label"].replace(
-        " value is ", "\n").split("\n")
-    tech_owner_tag = soup.find("div", "bv2-issue-metadata-field-inner "\
-      "bv2-issue-metadata-field-customField686980")
-    tech_owner = tech_owner_tag["aria-label"].replace(
-        " value is ", "\n").split("\n")
-    is_dashboard_queue_tag = soup.find("div", "bv2-issue-metadata-field-inner "\
-      "bv2-issue-metadata-field-customField686718")
-    is_dashboard_queue = is_dashboard_queue_tag["aria-label"].replace(
-        " value is ", "\n").split("\n")
-    reviews_per_item_tag = soup.find("div", "bv2-issue-metadata-field-inner "\
-      "bv2-issue-metadata-field-customField687560")
-    reviews_per_item = reviews_per_item_tag["aria-label"].replace(
-        " value is ", "\n").split("\n")
-    fragment_name_tag = soup.find("div", "bv2-issue-metadata-field-inner "\
-      "bv2-issue-metadata-field-customField686833")
-    fragment_name = fragment_name_tag["aria-label"].replace(
-        " value is ", "\n").split("\n")
-    item_expiry_sec_tag = soup.find("div", "bv2-issue-metadata-field-inner "\
-      "bv2-issue-metadata-field-customField686748")
-    item_expiry_sec = item_expiry_sec_tag["aria-label"].replace(
-        " value is ", "\n").split("\n")
-    is_experimental_review_enabled_tag = soup.find("div", "bv2-issue-metadata-field-inner "\
-      "bv2-issue-metadata-field-customField688166")
-    is_experimental_review_enabled = is_experimental_review_enabled_tag["aria-label"].replace(
-        " value is ", "\n").split("\n")
-    experimental_probability_tag = soup.find("div", "bv2-issue-metadata-field-inner "\
-      "bv2-issue-metadata-field-customField686699")
-    experimental_probability = experimental_probability_tag["aria-label"].replace(
-        " value is ", "\n").split("\n")
-
-    advanced_fields[severity[0]] = severity[1]
-    if verifier[1] != "empty":
-      advanced_fields[verifier[0]] = verifier[1]
-    if found_in[1] != "empty":
-      advanced_fields[found_in[0]] = found_in[1]
-    if in_prod[1] != "empty":
-      if in_prod[1] == "Yes":
-        advanced_fields[in_prod[0]] = True
-      else:
-        advanced_fields[in_prod[0]] = False
-    if targeted_to[1] != "empty":
-      advanced_fields[targeted_to[0]] = targeted_to[1]
-    if queue_id[1] != "empty":
-      advanced_fields[queue_id[0]] = int(queue_id[1])
-    if mdb_group_name[1] != "empty":
-      advanced_fields[mdb_group_name[0]] = mdb_group_name[1]
-    if ops_owner[1] != "empty":
-      advanced_fields[ops_owner[0]] = ops_owner[1]
-    if gvo_owner[1] != "empty":
-      advanced_fields[gvo_owner[0]] = gvo_owner[1]
-    if tech_owner[1] != "empty":
-      advanced_fields[tech_owner[0]] = tech_owner[1]
-    if is_dashboard_queue[1] != "empty":
-      if is_dashboard_queue[1] == "true":
-        advanced_fields[is_dashboard_queue[0]] = True
-      else:
-        advanced_fields[is_dashboard_queue[0]] = False
-    if reviews_per_item[1] != "empty":
-      advanced_fields[reviews_per_item[0]] = int(reviews_per_item[1])
-    if fragment_name[1] != "empty":
-      advanced_fields[fragment_name[0]] = fragment_name[1]
-    if item_expiry_sec[1] != "empty":
-      advanced_fields[item_expiry_sec[0]] = int(item_expiry_sec[1])
-    if is_experimental_review_enabled[1] != "empty":
-      if is_dashboard_queue[1] == "true":
-        advanced_fields[is_experimental_review_enabled[0]] = True
-      else:
-        advanced_fields[is_experimental_review_enabled[0]] = False
-    if experimental_probability[1] != "empty":
-      advanced_fields[experimental_probability[0]] = int(experimental_probability[1])
+    if self.visit_issue(issue):
+      self.fingerprint_tracker.record_visited(issue)
+
+  def visit_issue(self, issue):
+    """Read a single Buganizer issue over HTTP, or visit it with a web driver session leased
+    from the pool when the HTTP read path fails, and scrape or parse it according to its
+    configuration type.
+
+    Args:
+            issue (str): the URL of the Buganizer issue
+
+    Returns:
+            bool: True if the issue was read and processed
+    """
+    if self.http_page_reader:
+      source_html = self.get_page_over_http(issue, ISSUE_PAGE_MARKER)
+      if source_html is not None and self.scrape_issue_page(issue, source_html):
+        return True
+
+    if self.driver_pool.size == 0:
+      self.logger.log("ERROR: No web driver session left to visit " + issue + "\n")
+      return False
+    with self.driver_pool.lease() as driver:
+      if driver is None:
+        self.logger.log("ERROR: No web driver session left to visit " + issue + "\n")
+        return False
+      try:
+        driver.implicitly_wait(3)
+        self.load_page(issue, driver)
+        config_type_text = driver.find_element_by_xpath("/html/body/b-service-bootstrap/"\
+          "app-root/div[7]/div/div/edit-issue-page/b-resolving-issue-references/div[2]/"\
+            "div[1]/div[3]/div/div/div[2]/div[2]/div[3]/div/div[1]/div/span/span[6]/span/"\
+              "span/a").text
+        source_html = driver.page_source
+      except common.exceptions.NoSuchElementException:
+        self.logger.log("ERROR: Failed to find the configuration type of " + issue + "\n")
+        return False
+      except Exception:
+        #The session is replaced, as handing it back would fail every later lease
+        self.replace_driver(driver)
+        self.logger.log("ERROR: Failed to load " + issue + "\n")
+        return False
+      return self.scrape_issue_page(issue, source_html, config_type_text, driver)
+
+  def scrape_config_type_text(self, page):
+    """Find the component path link naming the configuration type of an issue.
+
+    Args:
+            page (parsed_page.ParsedPage): the parsed Buganizer issue
 
+    Returns:
+            str: the text of the component link, or None if the issue page has none
+    """
+    for config_type_text in page.component_link_texts():
+      if any(config_type in config_type_text for config_type in CONFIG_TYPES):
+        return config_type_text
+    return None
+
+  def scrape_issue_page(self, issue, source_html, config_type_text=None, driver=None):
+    """Scrape or parse a Buganizer issue page according to its configuration type.
+    The page is parsed once and shared by every field scraper and the comment parser.
+
+    Args:
+            issue (str): the URL of the Buganizer issue
+            source_html (str): the html of the Buganizer issue
+            config_type_text (str): the text of the component link naming the configuration
+                                    type, found in source_html if not given
+            driver (selenium.webdriver.chrome.webdriver.WebDriver): the web driver session
+                                                                    showing the issue, if any
+
+    Returns:
+            bool: False if the configuration type of the issue could not be found
+    """
+    page = parsed_page.ParsedPage(source_html)
+    if config_type_text is None:
+      config_type_text = self.scrape_config_type_text(page)
+      if config_type_text is None:
+        return False
+
+    advanced_fields = {}
+    advanced_fields["Issue Id"] = issue.replace("https://b.corp.google.com/issues/", "")
+    metadata_fields = page.metadata_fields()
+    reporter = metadata_fields["reporter"]
+    advanced_fields[reporter[0]] = reporter[1]
+    assignee = metadata_fields["assignee"]
+    if assignee[1] != "empty":
+      advanced_fields[assignee[0]] = assignee[1]
+
+    if "EnqueueRule" in config_type_text:
+      config_type = "EnqueueRules"
+    elif "RoutingTargets" in config_type_text:
+      config_type = "RoutingTargets"
+    elif "QueueInfo" in config_type_text:
+      config_type = "QueueInfo"
+
+    advanced_fields["Config Type"] = config_type
+
+    if config_type == "QueueInfo":
+      if assignee[1] != constants.AUTOMATION_USER:
+        return True
+
+      self.scrape_queue_info(advanced_fields, page)
+    elif config_type == "RoutingTargets":
+      if assignee[1] != constants.AUTOMATION_USER:
+        return True
+      self.scrape_routing_targets(advanced_fields, page, driver)
+    elif config_type == "EnqueueRules":
+      self._message_parsing_util.parse_page(page, reporter[1], issue)
+    return True
+
+  def scrape_queue_info(self, advanced_fields, page):
+    """Scrape all advanced fields from a QueueInfo Buganizer Issue
+
+    Args:
+        advanced_fields (dict): dictionary that holds all advanced fields values
+        page (parsed_page.ParsedPage): the parsed Buganizer issue
+    """
+    advanced_fields.update(self.queue_info_extractor.extract(page))
     self._message_parsing_util.publish_buganizer_fields(advanced_fields)
 
-  def scrape_routing_targets(self, advanced_fields):
+  def scrape_routing_targets(self, advanced_fields, page, driver=None):
     """Scrape all advanced fields from a RoutingTarget Buganizer Issue
 
     Args:
         advanced_fields (dict): dictionary that holds all advanced fields values
+        page (parsed_page.ParsedPage): the parsed Buganizer issue
+        driver (selenium.webdriver.chrome.webdriver.WebDriver): the web driver session
+                                                                showing the issue, if any
     """
-    source_html = self.driver.page_source
-    soup = BeautifulSoup(source_html, "html.parser")
-    try:
-      show_all = self.driver.find_element_by_id("bv2-issue-metadata-list-4-more")
-      show_all.click()
-      show_all = self.driver.find_element_by_id("bv2-issue-metadata-list-5-more")
-      show_all.click()
-    except common.exceptions.NoSuchElementException:
-      pass
-
-    severity_tag = soup.find("div", "bv2-issue-metadata-field-inner "\
-      "bv2-issue-metadata-field-severity")
-    severity = severity_tag["aria-label"].replace(
-        " value is ", "\n").split("\n")
-    found_in_tag = soup.find("div", "bv2-issue-metadata-field-inner "\
-      "bv2-issue-metadata-field-foundInVersion")
-    found_in = found_in_tag["aria-label"].replace(
-        " value is ", "\n").split("\n")
-    in_prod_tag = soup.find("div", "bv2-issue-metadata-field-inner "\
-      "bv2-issue-metadata-field-inProd")
-    in_prod = in_prod_tag["aria-label"].replace(
-        " value is ", "\n").split("\n")
-    verifier_tag = soup.find("div", "bv2-issue-metadata-field-inner "\
-      "bv2-issue-metadata-field-verifier")
-    verifier = verifier_tag["aria-label"].replace(
-        " value is ", "\n").split("\n")
-    targeted_to_tag = soup.find("div", "bv2-issue-metadata-field-inner "\
-      "bv2-issue-metadata-field-targetedToVersion")
-    targeted_to = targeted_to_tag["aria-label"].replace(
-        " value is ", "\n").split("\n")
-    queue_id_tag = soup.find("div", "bv2-issue-metadata-field-inner "\
-      "bv2-issue-metadata-field-customField688193")
-    queue_id = queue_id_tag["aria-label"].replace(
-        " value is ", "\n").split("\n")
-
-    queues_to_add = []
-    queues_to_remove = []
-
-    for tag in soup.find_all("button", id=lambda value: value and value.startswith(
-            "bv2-issue-metadata-list")):
-      queue_method_string = tag["aria-label"]
-      if "Add Queues to Route To" in queue_method_string:
-        queue_method_string = queue_method_string.replace("Remove ", "")
-        queue_method_string = queue_method_string.replace(" from Add Queues to Route To", "")
-        queues_to_add.append(int(queue_method_string))
-      elif "Remove Queues to Route To" in queue_method_string:
-        queue_method_string = queue_method_string.replace("Remove ", "")
-        queue_method_string = queue_method_string.replace(" from Queues to Route To", "")
-        queues_to_remove.append(int(queue_method_string))
-
-    advanced_fields["Add Queues to Route To"] = queues_to_add
-    advanced_fields["Remove Queues to Route To"] = queues_to_remove
-
-    advanced_fields[severity[0]] = severity[1]
-    if verifier[1] != "empty":
-      advanced_fields[verifier[0]] = verifier[1]
-    if found_in[1] != "empty":
-      advanced_fields[found_in[0]] = found_in[1]
-    if in_prod[1] != "empty":
-      if in_prod[1] == "Yes":
-        advanced_fields[in_prod[0]] = True
-      else:
-        advanced_fields[in_prod[0]] = False
-    if targeted_to[1] != "empty":
-      advanced_fields[targeted_to[0]] = targeted_to[1]
-    if queue_id[1] != "empty":
-      advanced_fields[queue_id[0]] = int(queue_id[1])
-
+    if driver:
+      try:
+        show_all = driver.find_element_by_id("bv2-issue-metadata-list-4-more")
+        show_all.click()
+        show_all = driver.find_element_by_id("bv2-issue-metadata-list-5-more")
+        show_all.click()
+      except common.exceptions.NoSuchElementException:
+        pass
+
+    advanced_fields.update(self.routing_targets_extractor.extract(page))
     self._message_parsing_util.publish_buganizer_fields(advanced_fields)
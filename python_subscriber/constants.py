@@ -13,3 +13,33 @@ PROFILE_PATH = "/usr/local/google/home/sauloferreira/.config/chrome-remote-deskt
   "google-chrome/Profile 3"
 #Automation user
 AUTOMATION_USER = "runchenyan@google.com"
+#Workers processing the responses of different issues in parallel, each with its own
+#Chrome web driver session
+WORKER_POOL_SIZE = 4
+#Seconds between the reports of the throughput of every worker
+WORKER_STATS_INTERVAL_SEC = 60
+#Pub/Sub flow control: the messages and bytes held by the subscriber at once, and how long
+#the lease of a message being processed is extended, by at least SUBSCRIBER_LEASE_EXTENSION_SEC
+#each time
+SUBSCRIBER_MAX_MESSAGES = 2 * WORKER_POOL_SIZE
+SUBSCRIBER_MAX_BYTES = 10 * 1024 * 1024
+SUBSCRIBER_MAX_LEASE_SEC = 30 * 60
+SUBSCRIBER_LEASE_EXTENSION_SEC = 60
+#Ids of the processed messages remembered to acknowledge their redelivered copies at once
+FINISHED_MESSAGES_MAX = 10000
+#SQLite database remembering the responses already handled for every issue, so a duplicate
+#response is acknowledged without any browser work, for RESPONSE_CACHE_TTL_SEC and at most
+#RESPONSE_CACHE_MAX_ENTRIES responses, least recently used first out
+RESPONSE_CACHE_PATH = "response_cache.db"
+RESPONSE_CACHE_MAX_ENTRIES = 10000
+RESPONSE_CACHE_TTL_SEC = 7 * 24 * 60 * 60
+#Deadlines of the Buganizer interactions: loading an issue page, waiting for an element to be
+#ready and waiting for an image upload to finish. A step which misses its deadline fails the
+#response, which is delivered again, and releases the worker
+PAGE_LOAD_TIMEOUT_SEC = 30
+STEP_TIMEOUT_SEC = 10
+UPLOAD_TIMEOUT_SEC = 60
+#Seconds between two checks of the element a step waits for
+STEP_POLL_SEC = 0.1
+#Latest durations of every step kept for the latency reports
+STEP_LATENCY_SAMPLES = 1000
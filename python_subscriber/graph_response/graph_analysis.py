@@ -1,11 +1,13 @@
 """This module holds the GraphAnalysis class which is responsible for
 generating an impact analysis graph .png image from an Impact Analysis Response
-protobuf object.
+protobuf object. pandas and matplotlib are slow to import, so they are only imported
+once the first graph is drawn.
 """
 import os
-import matplotlib.pyplot as plt
-import matplotlib
-import pandas as pd
+import threading
+
+#pyplot draws every figure through global state, so one graph is drawn at a time
+PLOT_LOCK = threading.Lock()
 
 class GraphAnalysis():
     """Responsible for generating an impact analysis graph .png image
@@ -29,6 +31,19 @@ class GraphAnalysis():
 
     def graph_impact(self, impact_analysis):
         """Creates the impact analysis .png image and saves it to the project's directory.
+        Graphs requested from several threads are drawn one at a time.
+
+        Args:
+                impact_analysis (ImpactAnalsisResponse): the ImpactAnalysisResponse Protobuf object
+
+        Returns:
+                str: the path to the graph impact analysis .png file
+        """
+        with PLOT_LOCK:
+            return self.draw_impact(impact_analysis)
+
+    def draw_impact(self, impact_analysis):
+        """Draws the impact analysis graph and saves it as a .png image named after the issue.
 
         Args:
                 impact_analysis (ImpactAnalsisResponse): the ImpactAnalysisResponse Protobuf object
@@ -36,11 +51,16 @@ class GraphAnalysis():
         Returns:
                 str: the path to the graph impact analysis .png file
         """
+        import matplotlib
+        # The graph is only saved, and Tk cannot draw outside of the main thread.
+        matplotlib.use('agg')
+        import matplotlib.pyplot as plt
+        import pandas as pd
+
         data = {"Previous SLA" : {}, "New SLA" : {}}
         i = 0
         queue_impact_list = impact_analysis.queue_Impact_analysis_list
         queue_impact_list.sort(key=self.compare_impact)
-        matplotlib.use('tkagg')
         # Find the lowest y value for desired/new/prev SLA.
         y_min = queue_impact_list[0].previous_SLA_min
 
@@ -81,7 +101,8 @@ class GraphAnalysis():
         plt.ylim(ymin=y_min/2)
         plt.xticks(rotation=0)
 
-        path = os.getcwd() + "/impact.png"
+        path = os.getcwd() + "/impact-" + impact_analysis.request.issue_id + ".png"
         plt.savefig(path)
+        plt.close()
 
         return path
@@ -0,0 +1,135 @@
+"""This module holds the IssuePage class, the page object of a Buganizer issue. It keeps the
+XPaths of the elements the subscriber reads and edits in one place, reads the Status and
+Assignee of the issue with a single script and resolves the elements of the comment in one
+pass, so each response takes a few Selenium round trips instead of one for every element.
+The Status and Assignee controls are re-rendered once a comment is posted, so they are only
+resolved right before they are clicked.
+"""
+import constants
+
+ISSUE_PAGE_XPATH = "/html/body/b-service-bootstrap/app-root/div[7]/div/div/edit-issue-page/"\
+  "b-resolving-issue-references/div[2]/div[1]/div[3]"
+SIDEBAR_XPATH = ISSUE_PAGE_XPATH + "/b-resizable-sidebar/div/div[1]/div/div"
+COMMENT_BOX_XPATH = ISSUE_PAGE_XPATH + "/div/div/div[2]/div[3]/div/bv2-comment-box/div"
+XPATHS = {
+    "status": SIDEBAR_XPATH + "/span/span/div/div[1]/div[1]/div[2]/div[1]/truncated-span",
+    "fixed_option": SIDEBAR_XPATH + "/span/span/div/div[2]/div/div[1]/div/div[4]",
+    "assignee": SIDEBAR_XPATH + "/div[6]/div[1]/div[1]/div[1]/div[2]",
+    "assignee_input": SIDEBAR_XPATH + "/div[6]/div[1]/div[2]/div/div[1]/input",
+    "assignee_submit": SIDEBAR_XPATH + "/div[6]/div[1]/div[2]/div/div[2]/b-button[1]/button",
+    "comment_text": COMMENT_BOX_XPATH + "/div[1]/b-comment-draft/b-comment-draft-textarea/"\
+      "textarea",
+    "comment_submit": COMMENT_BOX_XPATH + "/div[3]/div[1]/div/b-button/button",
+    "attachment_input": COMMENT_BOX_XPATH + "/div[3]/div[2]/div/div[2]/input",
+}
+XPATHS["status_text"] = XPATHS["status"] + "/span"
+XPATHS["assignee_text"] = XPATHS["assignee"] + "/div[1]/div/b-user-membership-chip/span/span/"\
+  "span"
+
+#Resolves the XPaths of arguments[0] by name. Returns the elements, or their text if
+#arguments[1] is true, or null until every element is on the page.
+FIND_ELEMENTS_SCRIPT = """
+var found = {};
+for (var name in arguments[0]) {
+  var element = document.evaluate(arguments[0][name], document, null,
+      XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+  if (element === null) {
+    return null;
+  }
+  found[name] = arguments[1] ? element.innerText.trim() : element;
+}
+return found;
+"""
+
+class IssuePage():
+  """The Buganizer issue page opened by a worker."""
+
+  def __init__(self, web_scraping_util):
+    """Setup the IssuePage
+
+    Args:
+        web_scraping_util (web_scraping_utility.WebScrapingUtility): the worker whose web
+                                                                     driver shows the page
+    """
+    self.web_scraping_util = web_scraping_util
+
+  def open(self, issue_id):
+    """Open a Buganizer issue.
+
+    Args:
+        issue_id (str): the id of the Buganizer issue
+    """
+    self.web_scraping_util.get_issue("https://b.corp.google.com/issues/" + issue_id)
+
+  def find_elements(self, step, names, text=False):
+    """Wait until the named elements are on the page, and resolve them with one script.
+
+    Args:
+        step (str): the name of the step, reported if it stalls
+        names (list): the names of the elements in XPATHS
+        text (bool): True to return the text of the elements instead of the elements
+
+    Raises:
+        web_scraping_utility.StepTimeoutError: if an element is missing after the deadline
+
+    Returns:
+        dict: the element, or its text, of every name
+    """
+    xpaths = {name: XPATHS[name] for name in names}
+    return self.web_scraping_util.wait_for(
+        step, lambda driver: driver.execute_script(FIND_ELEMENTS_SCRIPT, xpaths, text))
+
+  def read_state(self):
+    """Read the Status and the Assignee of the issue.
+
+    Returns:
+        tuple: the Status and the Assignee values
+    """
+    state = self.find_elements("read state", ["status_text", "assignee_text"], text=True)
+    return state["status_text"], state["assignee_text"]
+
+  def submit(self, comment="", image_path=None, mark_fixed=False, assignee=None):
+    """Post a comment with its attachment, then change the Status and the Assignee of the
+    issue. The elements of the comment are resolved in one pass. The Status and Assignee
+    controls are resolved again right before each is used, as Buganizer re-renders them.
+
+    Args:
+        comment (str): the text of the comment, none if empty
+        image_path (str): the file path of an image attached to the comment
+        mark_fixed (bool): True to set the Status to Fixed
+        assignee (str): the new Assignee, unchanged if None
+
+    Raises:
+        web_scraping_utility.StepTimeoutError: if a step does not complete before its deadline
+    """
+    from selenium.webdriver.common.keys import Keys
+
+    if comment or image_path:
+      names = ["comment_text", "comment_submit"]
+      if image_path:
+        names.append("attachment_input")
+      elements = self.find_elements("find elements", names)
+
+    if comment:
+      elements["comment_text"].send_keys(comment)
+    if image_path:
+      elements["attachment_input"].send_keys(image_path)
+    if comment or image_path:
+      #The button is enabled once the comment is entered and the attachment uploaded
+      comment_button = elements["comment_submit"]
+      self.web_scraping_util.wait_for(
+          "upload image" if image_path else "submit comment",
+          lambda driver: comment_button.is_enabled(),
+          constants.UPLOAD_TIMEOUT_SEC if image_path else None)
+      comment_button.click()
+
+    if mark_fixed:
+      self.find_elements("find status", ["status"])["status"].click()
+      self.find_elements("select fixed", ["fixed_option"])["fixed_option"].click()
+    if assignee is not None:
+      self.find_elements("find assignee", ["assignee"])["assignee"].click()
+      assignee_editor = self.find_elements("edit assignee",
+                                           ["assignee_input", "assignee_submit"])
+      assignee_editor["assignee_input"].clear()
+      assignee_editor["assignee_input"].send_keys(assignee, Keys.ENTER)
+      assignee_editor["assignee_submit"].click()
@@ -0,0 +1,108 @@
+"""Test file for issue_page.py"""
+import unittest
+import web_scraping_utility
+from issue_page import issue_page
+
+class FakeElement():
+  """A stand-in for a web element which records its commands on the driver."""
+  def __init__(self, driver, name):
+    self.driver = driver
+    self.name = name
+
+  def send_keys(self, *values):
+    """Type into the element."""
+    self.driver.commands.append(("send_keys", self.name))
+
+  def clear(self):
+    """Clear the element."""
+    self.driver.commands.append(("clear", self.name))
+
+  def click(self):
+    """Click the element."""
+    self.driver.commands.append(("click", self.name))
+
+  def is_enabled(self):
+    """Returns:
+        bool: True, the element is always enabled
+    """
+    self.driver.commands.append(("is_enabled", self.name))
+    return True
+
+class FakeDriver():
+  """A stand-in for the web driver of an issue page whose Status is New and whose Assignee is
+  the automation user. Every command sent to the browser is recorded."""
+  def __init__(self):
+    self.commands = []
+
+  def get(self, url):
+    """Load a page."""
+    self.commands.append(("get", url))
+
+  def execute_script(self, script, xpaths, text):
+    """Run issue_page.FIND_ELEMENTS_SCRIPT."""
+    self.commands.append(("execute_script", sorted(xpaths)))
+    if text:
+      return {"status_text": "New", "assignee_text": "automation@google.com"}
+    return {name: FakeElement(self, name) for name in xpaths}
+
+class OfflineScrapingUtility(web_scraping_utility.WebScrapingUtility):
+  """A WebScrapingUtility which does not launch Chrome."""
+  def setup_webdriver(self, profile_path=None):
+    """Returns:
+        FakeDriver: a stand-in for the web driver
+    """
+    return FakeDriver()
+
+class TestsIssuePage(unittest.TestCase):
+  """Test methods from issue_page.py
+
+  Args:
+    unittest (unittest.TestCase): unittest Testcase
+  """
+  def setUp(self):
+    self.utility = OfflineScrapingUtility(logger=None)
+    self.driver = self.utility.driver
+    self.page = issue_page.IssuePage(self.utility)
+
+  def test_read_state_in_one_script(self):
+    """Test reading the Status and the Assignee of an issue.
+    Assert that they are read with one command after the page is loaded.
+    """
+    self.page.open("100")
+    assert self.page.read_state() == ("New", "automation@google.com")
+    assert self.driver.commands == [
+        ("get", "https://b.corp.google.com/issues/100"),
+        ("execute_script", ["assignee_text", "status_text"])]
+
+  def test_submit_image_and_fix(self):
+    """Test posting a graph and marking the issue Fixed.
+    Assert that the comment elements are resolved in one pass, that the comment is posted
+    before the Status is changed, and that the Status is resolved after the comment is posted.
+    """
+    self.page.submit(image_path="impact-100.png", mark_fixed=True)
+    assert self.driver.commands == [
+        ("execute_script", ["attachment_input", "comment_submit", "comment_text"]),
+        ("send_keys", "attachment_input"),
+        ("is_enabled", "comment_submit"),
+        ("click", "comment_submit"),
+        ("execute_script", ["status"]),
+        ("click", "status"),
+        ("execute_script", ["fixed_option"]),
+        ("click", "fixed_option")]
+
+  def test_submit_comment_and_assignee(self):
+    """Test posting an error and giving the issue back to its reporter.
+    Assert that the reporter is entered in one command.
+    """
+    self.page.submit(comment="error", assignee="reporter@google.com")
+    assert ("send_keys", "comment_text") in self.driver.commands
+    assert self.driver.commands[-6:] == [
+        ("execute_script", ["assignee"]),
+        ("click", "assignee"),
+        ("execute_script", ["assignee_input", "assignee_submit"]),
+        ("clear", "assignee_input"),
+        ("send_keys", "assignee_input"),
+        ("click", "assignee_submit")]
+
+if __name__ == "__main__":
+  unittest.main()
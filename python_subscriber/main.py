@@ -1,33 +1,94 @@
 """This module holds the System class which contains the Pub/Sub subscriber
-client and completes any necessary setup for scraping.
+client and completes any necessary setup for scraping. Heavy dependencies are imported on
+first use, so the process starts quickly.
 """
 import os
+import shutil
+import tempfile
 from concurrent import futures
-from google.cloud import pubsub_v1
 from google.protobuf.message import DecodeError
 import web_scraping_utility
 import impact_analysis_response_pb2
 from graph_response import graph_analysis
+from issue_page import issue_page
+from redelivery_tracker import redelivery_tracker
+from response_cache import response_cache
+from worker_pool import worker_pool
 import constants
 import logs.logger
 
 class System():
   """Completes necessary setup for scraping."""
   def __init__(self):
-    logger = logs.logger.Logger()
-    self.web_scraping_util = web_scraping_utility.WebScrapingUtility(logger)
-    self.set = set()
+    self.logger = logs.logger.Logger()
+    self.step_latencies = web_scraping_utility.StepLatencies()
+    #The copies of the Chrome profile loaded by the workers, removed on shutdown
+    self.profile_copy_paths = []
+    self.workers = self.setup_workers()
+    self.web_scraping_util = self.workers[0]
+    self.worker_pool = worker_pool.IssueWorkerPool(self.workers, self.process_message,
+                                                   self.logger)
+    self.redelivery_tracker = redelivery_tracker.RedeliveryTracker()
+    self.response_cache = response_cache.ResponseCache(constants.RESPONSE_CACHE_PATH)
 
+  def setup_workers(self):
+    """Start one web driver session for each worker. Chrome cannot open one profile in two
+    sessions, so every worker after the first one loads its own copy of the Chrome profile,
+    which is removed on shutdown, or at once if the session does not start. Workers whose
+    profile could not be copied are skipped.
+
+    Returns:
+        list: the WebScrapingUtility of every worker whose web driver started, at least one
+    """
+    workers = [web_scraping_utility.WebScrapingUtility(self.logger,
+                                                       step_latencies=self.step_latencies)]
+    for _ in range(1, constants.WORKER_POOL_SIZE):
+      profile_copy_path = tempfile.mkdtemp(prefix="hermes-subscriber-profile-")
+      try:
+        shutil.copytree(constants.PROFILE_PATH, profile_copy_path, dirs_exist_ok=True,
+                        ignore=shutil.ignore_patterns("Singleton*", "*.lock"))
+      except Exception as error:
+        self.logger.log("ERROR: Failed to copy the Chrome profile for a worker, check "\
+          "PROFILE_PATH in constants.py: " + str(error) + "\n")
+        shutil.rmtree(profile_copy_path, ignore_errors=True)
+        continue
+      worker = web_scraping_utility.WebScrapingUtility(self.logger, profile_copy_path,
+                                                       self.step_latencies)
+      if worker.driver:
+        workers.append(worker)
+        self.profile_copy_paths.append(profile_copy_path)
+      else:
+        shutil.rmtree(profile_copy_path, ignore_errors=True)
+    return workers
+
+  def shutdown(self):
+    """Wait for the responses being processed, then quit the web driver session of every
+    worker and remove the copies of the Chrome profile."""
+    self.worker_pool.shutdown()
+    for worker in self.workers:
+      worker.quit()
+    for profile_copy_path in self.profile_copy_paths:
+      shutil.rmtree(profile_copy_path, ignore_errors=True)
+    self.profile_copy_paths = []
+    self.response_cache.close()
 
   def subscribe(self, project_id, subscription_id):
     """Creates a subscriber client and pulls Impact Analysis Response
-    protobuf objects from a Pub/Sub topic.
+    protobuf objects from a Pub/Sub topic. Every response is handed to the worker pool,
+    and the throughput of every worker is logged every constants.WORKER_STATS_INTERVAL_SEC.
+
+    The client holds at most constants.SUBSCRIBER_MAX_MESSAGES messages and keeps extending
+    the lease of every message until it is acknowledged, for up to
+    constants.SUBSCRIBER_MAX_LEASE_SEC, so slow responses are not delivered again.
     """
+    from google.cloud import pubsub_v1
+
     subscriber = pubsub_v1.SubscriberClient()
     subscription_path = subscriber.subscription_path(project_id, subscription_id)
 
     def callback(message):
-      """Processes PubSub message and deal with it accordingly.
+      """Deserializes a PubSub message and queues it for its issue, unless the same
+      response was already handled for the issue.
 
       Args:
           message (serialized proto): the serialized impact analysis protobuf
@@ -37,63 +98,144 @@ class System():
       try:
         impact_analysis_response.ParseFromString(message.data)
       except DecodeError: #Pub Sub message couldn't be deserialized
-        error_message = "Decode Error: Unable to parse pubsub message: " + message.data
-        self.web_scraping_util.logger.log(error_message)
-
-      issue = "https://b.corp.google.com/issues/" + impact_analysis_response.request.issue_id
-      self.web_scraping_util.get_issue(issue)
-      status = self.web_scraping_util.get_issue_status()
-      assignee = self.web_scraping_util.get_issue_assignee()
+        error_message = "Decode Error: Unable to parse pubsub message: " + str(message.data)
+        self.logger.log(error_message)
+        message.ack()
+        return
 
-      if status == "Fixed" or assignee != constants.AUTOMATION_USER:
+      #Hashed before processing, which sorts the queue impact analysis list in place
+      proto_hash = response_cache.response_hash(impact_analysis_response)
+      if self.is_duplicate(impact_analysis_response, proto_hash):
         message.ack()
         return
-      elif len(impact_analysis_response.queue_Impact_analysis_list) != 0 \
-      and len(impact_analysis_response.error_message) == 0:
-        grapher = graph_analysis.GraphAnalysis()
-        png_path = grapher.graph_impact(impact_analysis_response)
-        self.web_scraping_util.post_image(png_path)
-        self.web_scraping_util.mark_as_fixed()
-        os.remove(png_path)
-      elif len(impact_analysis_response.queue_Impact_analysis_list) == 0:
-        error_message = "There is no impact analysis for this change request. " + \
-        impact_analysis_response.error_message
-        self.web_scraping_util.logger.log(error_message)
-        self.web_scraping_util.print_error_to_buganizer(error_message)
+      if not self.redelivery_tracker.start(message):
+        return
+      self.worker_pool.submit(impact_analysis_response.request.issue_id,
+                              (impact_analysis_response, message, proto_hash))
 
-        self.web_scraping_util.mark_as_fixed()
-      else:
-        error_message = "There is no impact analysis for this change request. " + \
-        impact_analysis_response.error_message + "Please re-assign the issue Assignee "\
-          "value to the automation user '" + constants.AUTOMATION_USER + \
-            "' when you are finished editing the issue."
-        self.web_scraping_util.logger.log(error_message)
-        self.web_scraping_util.print_error_to_buganizer(error_message)
-
-        if impact_analysis_response.request.config_type == "EnqueueRules":
-          self.web_scraping_util.set_assignee_to_reporter(
-              impact_analysis_response.request.enqueue_rules.changes[0].reporter)
-        elif impact_analysis_response.request.config_type == "RoutingTargets":
-          self.web_scraping_util.set_assignee_to_reporter(
-              impact_analysis_response.request.routing_targets.reporter)
-        else:
-          self.web_scraping_util.set_assignee_to_reporter(
-              impact_analysis_response.request.queue_info.reporter)
-      message.ack()
-
-    #Limit the amount of messages processed in the subscriber callback function to one
+    #The callback only queues the message, the workers of the pool process it
     executor = futures.ThreadPoolExecutor(max_workers=1)
     scheduler = pubsub_v1.subscriber.scheduler.ThreadScheduler(executor)
+    flow_control = pubsub_v1.types.FlowControl(
+        max_messages=constants.SUBSCRIBER_MAX_MESSAGES,
+        max_bytes=constants.SUBSCRIBER_MAX_BYTES,
+        max_lease_duration=constants.SUBSCRIBER_MAX_LEASE_SEC,
+        min_duration_per_lease_extension=constants.SUBSCRIBER_LEASE_EXTENSION_SEC)
     future = subscriber.subscribe(subscription_path, callback=callback,
-                                  scheduler=scheduler)
+                                  flow_control=flow_control, scheduler=scheduler)
 
-    with subscriber:
-      try:
-        future.result()
-      except TimeoutError:
-        future.cancel()
+    try:
+      with subscriber:
+        while True:
+          try:
+            future.result(timeout=constants.WORKER_STATS_INTERVAL_SEC)
+            break
+          except futures.TimeoutError:
+            self.log_worker_stats()
+    finally:
+      self.shutdown()
     return
 
+  def log_worker_stats(self):
+    """Log the number of responses processed by every worker and its throughput, the
+    number of messages delivered again and the latency of every Buganizer step."""
+    for worker_index, worker_stats in enumerate(self.worker_pool.stats()):
+      self.logger.log("INFO: Worker " + str(worker_index) + ": " + \
+        str(worker_stats["processed"]) + " responses, " + \
+          str(round(worker_stats["per_minute"], 1)) + " per minute, busy " + \
+            str(round(worker_stats["busy_sec"])) + " s.\n")
+    self.logger.log("INFO: Redelivered messages: " + \
+      str(self.redelivery_tracker.redelivered_count) + ", duplicate responses: " + \
+        str(self.response_cache.duplicate_count) + ".\n")
+    for step, step_stats in sorted(self.step_latencies.stats().items()):
+      self.logger.log("INFO: Step '" + step + "': " + str(step_stats["count"]) + \
+        " samples, p50 " + str(round(step_stats["p50_ms"])) + " ms, max " + \
+          str(round(step_stats["max_ms"])) + " ms.\n")
+
+  def is_duplicate(self, impact_analysis_response, proto_hash):
+    """Check whether the same response was already handled for its issue.
+
+    Args:
+        impact_analysis_response (ImpactAnalysisResponse): the response
+        proto_hash (str): the hash of the response as it was received, see
+                          response_cache.response_hash()
+
+    Returns:
+        bool: True if the response must be acknowledged without being processed
+    """
+    return self.response_cache.contains(impact_analysis_response.request.issue_id, proto_hash)
+
+  def process_message(self, web_scraping_util, item):
+    """Processes an Impact Analysis Response with a worker and deals with it accordingly.
+    The message is nacked if processing fails, so it is delivered again. A response
+    identical to one handled while it was waiting for its issue is only acknowledged.
+
+    Args:
+        web_scraping_util (web_scraping_utility.WebScrapingUtility): the worker
+        item (tuple): the ImpactAnalysisResponse, its Pub/Sub message and its hash
+    """
+    impact_analysis_response, message, proto_hash = item
+    if self.is_duplicate(impact_analysis_response, proto_hash):
+      self.redelivery_tracker.finish(message, True)
+      return
+    try:
+      updated = self.process_response(web_scraping_util, impact_analysis_response)
+    except Exception:
+      self.redelivery_tracker.finish(message, False)
+      raise
+    #A response which left the issue untouched is not remembered, so it is handled again
+    #once the issue is given back to the automation user
+    if updated:
+      self.response_cache.add(impact_analysis_response.request.issue_id, proto_hash)
+    self.redelivery_tracker.finish(message, True)
+
+  def process_response(self, web_scraping_util, impact_analysis_response):
+    """Closes or invalidates the Buganizer issue of an Impact Analysis Response, with one
+    combined update of the issue page.
+
+    Args:
+        web_scraping_util (web_scraping_utility.WebScrapingUtility): the worker
+        impact_analysis_response (ImpactAnalysisResponse): the response
+
+    Returns:
+        bool: False if the issue is already Fixed or not assigned to the automation user and
+              was left untouched, True otherwise
+    """
+    page = issue_page.IssuePage(web_scraping_util)
+    page.open(impact_analysis_response.request.issue_id)
+    status, assignee = page.read_state()
+
+    if status == "Fixed" or assignee != constants.AUTOMATION_USER:
+      return False
+    elif len(impact_analysis_response.queue_Impact_analysis_list) != 0 \
+    and len(impact_analysis_response.error_message) == 0:
+      grapher = graph_analysis.GraphAnalysis()
+      png_path = grapher.graph_impact(impact_analysis_response)
+      try:
+        page.submit(image_path=png_path, mark_fixed=True)
+      finally:
+        os.remove(png_path)
+    elif len(impact_analysis_response.queue_Impact_analysis_list) == 0:
+      error_message = "There is no impact analysis for this change request. " + \
+      impact_analysis_response.error_message
+      web_scraping_util.logger.log(error_message)
+      page.submit(comment=error_message, mark_fixed=True)
+    else:
+      error_message = "There is no impact analysis for this change request. " + \
+      impact_analysis_response.error_message + "Please re-assign the issue Assignee "\
+        "value to the automation user '" + constants.AUTOMATION_USER + \
+          "' when you are finished editing the issue."
+      web_scraping_util.logger.log(error_message)
+
+      if impact_analysis_response.request.config_type == "EnqueueRules":
+        reporter = impact_analysis_response.request.enqueue_rules.changes[0].reporter
+      elif impact_analysis_response.request.config_type == "RoutingTargets":
+        reporter = impact_analysis_response.request.routing_targets.reporter
+      else:
+        reporter = impact_analysis_response.request.queue_info.reporter
+      page.submit(comment=error_message, assignee=reporter)
+    return True
+
 if __name__ == '__main__':
   system = System()
   system.subscribe(constants.PROJECT_ID, constants.SUBSCRIPTION_ID)
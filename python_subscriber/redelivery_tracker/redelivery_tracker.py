@@ -0,0 +1,86 @@
+"""This module holds the RedeliveryTracker class which acknowledges the Pub/Sub messages of
+the subscriber and recognizes redelivered messages by their message id. Pub/Sub delivers a
+message again when its lease expires before it is acknowledged, and processing the copy
+would post the same graph to Buganizer twice.
+
+A copy of a message which is still being processed is held, without being processed, until
+the message is finished and is then acknowledged or nacked with it. A copy of a message which
+was already processed is acknowledged at once.
+"""
+import collections
+import threading
+import constants
+
+class RedeliveryTracker():
+  """Tracks the messages being processed and the recently finished ones."""
+
+  def __init__(self, max_finished=None):
+    """Setup the RedeliveryTracker
+
+    Args:
+        max_finished (int): the number of finished message ids remembered, least recently
+                            finished first out, constants.FINISHED_MESSAGES_MAX by default
+    """
+    self.max_finished = max_finished or constants.FINISHED_MESSAGES_MAX
+    self._lock = threading.Lock()
+    #The copies delivered again of every message being processed
+    self._in_progress = {}
+    self._finished = collections.OrderedDict()
+    self.redelivered_count = 0
+
+  def start(self, message):
+    """Check a delivered message before it is processed.
+
+    Args:
+        message (google.cloud.pubsub_v1.subscriber.message.Message): the delivered message
+
+    Returns:
+        bool: True if the message must be processed, False for a redelivered copy, which
+              is acknowledged by this tracker
+    """
+    with self._lock:
+      if message.message_id in self._in_progress:
+        self._in_progress[message.message_id].append(message)
+        self.redelivered_count += 1
+        return False
+      if message.message_id in self._finished:
+        self._finished.move_to_end(message.message_id)
+        self.redelivered_count += 1
+        finished = True
+      else:
+        #A message delivered before a restart is only known by its delivery attempt
+        if (getattr(message, "delivery_attempt", None) or 1) > 1:
+          self.redelivered_count += 1
+        self._in_progress[message.message_id] = []
+        finished = False
+    if finished:
+      message.ack()
+    return not finished
+
+  def finish(self, message, succeeded):
+    """Acknowledge a processed message and its copies delivered meanwhile, or nack them
+    all so the message is delivered again.
+
+    Args:
+        message (google.cloud.pubsub_v1.subscriber.message.Message): the processed message
+        succeeded (bool): True if the message was processed
+    """
+    with self._lock:
+      copies = self._in_progress.pop(message.message_id, [])
+      if succeeded:
+        self._finished[message.message_id] = True
+        self._finished.move_to_end(message.message_id)
+        while len(self._finished) > self.max_finished:
+          self._finished.popitem(last=False)
+    for delivered_message in [message] + copies:
+      if succeeded:
+        delivered_message.ack()
+      else:
+        delivered_message.nack()
+
+  def in_progress_count(self):
+    """Returns:
+        int: the number of messages being processed
+    """
+    with self._lock:
+      return len(self._in_progress)
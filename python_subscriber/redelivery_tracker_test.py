@@ -0,0 +1,108 @@
+"""Test file for redelivery_tracker.py"""
+import threading
+import time
+import unittest
+from redelivery_tracker import redelivery_tracker
+from worker_pool import worker_pool
+
+class FakeMessage():
+  """A stand-in for a delivered Pub/Sub message which records how it was settled."""
+  def __init__(self, message_id, issue_id):
+    self.message_id = message_id
+    self.issue_id = issue_id
+    self.settled = threading.Event()
+    self.acked = False
+    self.nacked = False
+
+  def ack(self):
+    """Acknowledge the message."""
+    self.acked = True
+    self.settled.set()
+
+  def nack(self):
+    """Ask for the message to be delivered again."""
+    self.nacked = True
+    self.settled.set()
+
+class FakeSubscriber():
+  """A stand-in for the Pub/Sub subscriber client which does not extend leases: every copy
+  of a message which is not settled within the ack deadline is delivered again.
+  """
+  def __init__(self, callback, ack_deadline_sec):
+    self.callback = callback
+    self.ack_deadline_sec = ack_deadline_sec
+    self.deliveries = []
+
+  def deliver(self, message_id, issue_id, timeout_sec):
+    """Deliver a message, and a new copy each time the latest copy's deadline expires.
+
+    Args:
+        message_id (str): the id of the message
+        issue_id (str): the issue of the response in the message
+        timeout_sec (float): the time after which no copy is delivered anymore
+    """
+    deadline = time.monotonic() + timeout_sec
+    while time.monotonic() < deadline:
+      message = FakeMessage(message_id, issue_id)
+      self.deliveries.append(message)
+      self.callback(message)
+      if message.settled.wait(self.ack_deadline_sec):
+        return
+
+class Logger():
+  """A logger which keeps the errors in memory."""
+  def __init__(self):
+    self.errors = []
+
+  def log(self, error_message):
+    """Keep an error message."""
+    self.errors.append(error_message)
+
+class TestsRedeliveryTracker(unittest.TestCase):
+  """Test methods from redelivery_tracker.py
+
+  Args:
+    unittest (unittest.TestCase): unittest Testcase
+  """
+  def setUp(self):
+    self.tracker = redelivery_tracker.RedeliveryTracker()
+    self.processed = []
+
+    def handler(worker, message):
+      """Process a message slower than the ack deadline."""
+      time.sleep(0.2)
+      self.processed.append(message.message_id)
+      self.tracker.finish(message, True)
+
+    self.pool = worker_pool.IssueWorkerPool(["worker"], handler, Logger())
+
+    def callback(message):
+      """Dispatch a message the way main.System.subscribe() does."""
+      if self.tracker.start(message):
+        self.pool.submit(message.issue_id, message)
+
+    self.subscriber = FakeSubscriber(callback, ack_deadline_sec=0.05)
+
+  def test_slow_handler_processes_once(self):
+    """Test a handler slower than the ack deadline.
+    Assert that the message is processed once and every copy is acknowledged.
+    """
+    self.subscriber.deliver("1", "100", timeout_sec=2)
+    self.pool.shutdown()
+    assert self.processed == ["1"]
+    assert len(self.subscriber.deliveries) > 1
+    assert all(message.acked for message in self.subscriber.deliveries)
+    assert self.tracker.redelivered_count == len(self.subscriber.deliveries) - 1
+
+  def test_finished_message_is_acked_at_once(self):
+    """Test a message delivered again after it was processed.
+    Assert that the copy is acknowledged without being processed.
+    """
+    self.subscriber.deliver("1", "100", timeout_sec=2)
+    self.pool.shutdown()
+    copy = FakeMessage("1", "100")
+    assert not self.tracker.start(copy)
+    assert copy.acked and self.processed == ["1"]
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,140 @@
+"""This module holds the ResponseCache class which remembers the Impact Analysis Responses
+already handled for every Buganizer issue in a local SQLite database. CAT can send the same
+analysis several times, for example when an unchanged request is published again, and a
+response identical to one which already updated its issue is acknowledged without loading
+the issue, drawing the graph or uploading it again. The cache keeps its entries across restarts, drops
+them after a time to live and holds a bounded number of them, least recently used first out.
+"""
+import hashlib
+import sqlite3
+import threading
+import time
+import constants
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS handled_responses (
+  issue_id TEXT NOT NULL,
+  response_hash TEXT NOT NULL,
+  handled_time REAL NOT NULL,
+  used_time REAL NOT NULL,
+  PRIMARY KEY (issue_id, response_hash)
+);
+CREATE INDEX IF NOT EXISTS handled_responses_used_time ON handled_responses (used_time);
+"""
+
+def response_hash(impact_analysis_response):
+  """Hash an Impact Analysis Response, including the change request it analyses, so the
+  same outcome for a different request of the issue is not a duplicate.
+
+  Args:
+      impact_analysis_response (ImpactAnalysisResponse): the response
+
+  Returns:
+      str: the hex SHA-256 digest of the request, the queue impact analysis list and the
+           error message
+  """
+  digest = hashlib.sha256()
+  serialized_request = impact_analysis_response.request.SerializeToString(deterministic=True)
+  digest.update(len(serialized_request).to_bytes(4, "big"))
+  digest.update(serialized_request)
+  for queue_impact in impact_analysis_response.queue_Impact_analysis_list:
+    serialized_impact = queue_impact.SerializeToString(deterministic=True)
+    digest.update(len(serialized_impact).to_bytes(4, "big"))
+    digest.update(serialized_impact)
+  digest.update(impact_analysis_response.error_message.encode("utf-8"))
+  return digest.hexdigest()
+
+class ResponseCache():
+  """A bounded, persistent LRU cache of the handled responses of every issue, with a time
+  to live.
+  """
+
+  def __init__(self, path=":memory:", max_entries=None, ttl_sec=None, clock=None):
+    """Open the cache, creating the database if needed.
+
+    Args:
+        path (str): the path of the SQLite database, an in-memory database by default
+        max_entries (int): the number of responses remembered,
+                           constants.RESPONSE_CACHE_MAX_ENTRIES by default
+        ttl_sec (float): the seconds a handled response is remembered,
+                         constants.RESPONSE_CACHE_TTL_SEC by default
+        clock (object): the wall clock, with a time() method, the time module by default
+    """
+    self.max_entries = max_entries or constants.RESPONSE_CACHE_MAX_ENTRIES
+    self.ttl_sec = ttl_sec or constants.RESPONSE_CACHE_TTL_SEC
+    self.clock = clock or time
+    self.duplicate_count = 0
+    self._lock = threading.Lock()
+    self._connection = sqlite3.connect(path, check_same_thread=False)
+    if path != ":memory:":
+      self._connection.execute("PRAGMA journal_mode=WAL")
+      self._connection.execute("PRAGMA synchronous=NORMAL")
+    self._connection.executescript(SCHEMA)
+    with self._lock, self._connection:
+      self._connection.execute("DELETE FROM handled_responses WHERE handled_time <= ?",
+                               (self.clock.time() - self.ttl_sec,))
+      self._size = self._connection.execute(
+          "SELECT COUNT(*) FROM handled_responses").fetchone()[0]
+
+  def contains(self, issue_id, proto_hash):
+    """Check whether a response was already handled for an issue, counting it as a
+    duplicate if so.
+
+    Args:
+        issue_id (str): the id of the Buganizer issue
+        proto_hash (str): the hash of the response, see response_hash()
+
+    Returns:
+        bool: True if the response was handled less than the time to live ago
+    """
+    now = self.clock.time()
+    with self._lock, self._connection:
+      row = self._connection.execute(
+          "SELECT handled_time FROM handled_responses WHERE issue_id = ? AND "\
+          "response_hash = ?", (issue_id, proto_hash)).fetchone()
+      if row is None:
+        return False
+      if row[0] <= now - self.ttl_sec:
+        self._connection.execute(
+            "DELETE FROM handled_responses WHERE issue_id = ? AND response_hash = ?",
+            (issue_id, proto_hash))
+        self._size -= 1
+        return False
+      self._connection.execute(
+          "UPDATE handled_responses SET used_time = ? WHERE issue_id = ? AND "\
+          "response_hash = ?", (now, issue_id, proto_hash))
+      self.duplicate_count += 1
+      return True
+
+  def add(self, issue_id, proto_hash):
+    """Remember a handled response, forgetting the least recently used responses beyond
+    the maximum number of entries.
+
+    Args:
+        issue_id (str): the id of the Buganizer issue
+        proto_hash (str): the hash of the response, see response_hash()
+    """
+    now = self.clock.time()
+    with self._lock, self._connection:
+      inserted = self._connection.execute(
+          "INSERT OR IGNORE INTO handled_responses VALUES (?, ?, ?, ?)",
+          (issue_id, proto_hash, now, now)).rowcount
+      if not inserted:
+        self._connection.execute(
+            "UPDATE handled_responses SET handled_time = ?, used_time = ? WHERE "\
+            "issue_id = ? AND response_hash = ?", (now, now, issue_id, proto_hash))
+      self._size += inserted
+      if self._size > self.max_entries:
+        self._connection.execute(
+            "DELETE FROM handled_responses WHERE rowid IN (SELECT rowid FROM "\
+            "handled_responses ORDER BY used_time LIMIT ?)", (self._size - self.max_entries,))
+        self._size = self.max_entries
+
+  def __len__(self):
+    with self._lock:
+      return self._size
+
+  def close(self):
+    """Close the database."""
+    with self._lock:
+      self._connection.close()
@@ -0,0 +1,101 @@
+"""Test file for response_cache.py"""
+import os
+import tempfile
+import unittest
+from response_cache import response_cache
+
+class FakeClock():
+  """A wall clock which only moves when told to."""
+  def __init__(self):
+    self.now = 1000.0
+
+  def time(self):
+    """Returns:
+        float: the current time in seconds
+    """
+    return self.now
+
+class FakeMessage():
+  """A stand-in for a protocol buffer message serialized to fixed bytes."""
+  def __init__(self, serialized):
+    self.serialized = serialized
+
+  def SerializeToString(self, deterministic=False):
+    """Returns:
+        bytes: the serialized message
+    """
+    return self.serialized
+
+class FakeResponse():
+  """A stand-in for an Impact Analysis Response."""
+  def __init__(self, request, impacts, error_message=""):
+    self.request = FakeMessage(request)
+    self.queue_Impact_analysis_list = [FakeMessage(impact) for impact in impacts]
+    self.error_message = error_message
+
+class TestsResponseCache(unittest.TestCase):
+  """Test methods from response_cache.py
+
+  Args:
+    unittest (unittest.TestCase): unittest Testcase
+  """
+  def setUp(self):
+    self.clock = FakeClock()
+    self.directory = tempfile.TemporaryDirectory()
+    self.path = os.path.join(self.directory.name, "response_cache.db")
+
+  def tearDown(self):
+    self.directory.cleanup()
+
+  def open_cache(self, max_entries=100):
+    """Open the cache of the test database."""
+    return response_cache.ResponseCache(self.path, max_entries=max_entries, ttl_sec=60,
+                                        clock=self.clock)
+
+  def test_duplicate_survives_restart(self):
+    """Test a response handled before the cache is reopened.
+    Assert that it is still a duplicate, for its issue only, until its time to live ends.
+    """
+    cache = self.open_cache()
+    cache.add("100", "hash")
+    cache.close()
+
+    cache = self.open_cache()
+    assert cache.contains("100", "hash")
+    assert not cache.contains("101", "hash")
+    assert not cache.contains("100", "other hash")
+    assert cache.duplicate_count == 1
+    self.clock.now += 60
+    assert not cache.contains("100", "hash")
+    assert len(cache) == 0
+    cache.close()
+
+  def test_least_recently_used_is_evicted(self):
+    """Test more responses handled than the cache holds.
+    Assert that the least recently used response is forgotten.
+    """
+    cache = self.open_cache(max_entries=2)
+    cache.add("100", "a")
+    self.clock.now += 1
+    cache.add("101", "b")
+    self.clock.now += 1
+    assert cache.contains("100", "a")
+    self.clock.now += 1
+    cache.add("102", "c")
+    assert len(cache) == 2
+    assert cache.contains("100", "a") and cache.contains("102", "c")
+    assert not cache.contains("101", "b")
+    cache.close()
+
+  def test_hash_includes_request(self):
+    """Test responses with the same outcome for different requests of an issue.
+    Assert that their hashes differ, and match for the same request.
+    """
+    first = FakeResponse(b"queue 1", [b"impact"])
+    assert response_cache.response_hash(first) == \
+      response_cache.response_hash(FakeResponse(b"queue 1", [b"impact"]))
+    assert response_cache.response_hash(first) != \
+      response_cache.response_hash(FakeResponse(b"queue 2", [b"impact"]))
+
+if __name__ == "__main__":
+  unittest.main()
@@ -1,34 +1,98 @@
-"""This module holds the WebScrapingUtility class which does all Buganizer html scraping
-for issues under a componentid.
+"""This module holds the WebScrapingUtility class which owns the Chrome web driver of a
+worker and loads Buganizer issues, the elements of an issue being read and edited through
+issue_page.IssuePage.
+
+Every interaction waits for its element to be ready, for at most constants.STEP_TIMEOUT_SEC
+or constants.UPLOAD_TIMEOUT_SEC, and raises a StepTimeoutError naming the step which stalled
+instead of blocking the worker. The latency of every step is recorded.
 """
+import collections
+import statistics
+import threading
 import time
-from selenium import webdriver, common
-from selenium.webdriver.common.keys import Keys
+from selenium import common
 import constants
 
+class StepTimeoutError(Exception):
+  """Raised when a step of a Buganizer interaction does not complete within its deadline."""
+  def __init__(self, step, timeout):
+    """Setup the StepTimeoutError
+
+    Args:
+        step (str): the name of the step which stalled
+        timeout (float): the seconds the step was given
+    """
+    super().__init__("Step '" + step + "' did not complete within " + str(timeout) + " s.")
+    self.step = step
+    self.timeout = timeout
+
+class StepLatencies():
+  """Keeps the latest durations of every step, recorded from any number of workers."""
+
+  def __init__(self):
+    self._lock = threading.Lock()
+    self._latencies = collections.defaultdict(
+        lambda: collections.deque(maxlen=constants.STEP_LATENCY_SAMPLES))
+
+  def record(self, step, seconds):
+    """Record the latency of a step.
+
+    Args:
+        step (str): the name of the step
+        seconds (float): the duration of the step
+    """
+    with self._lock:
+      self._latencies[step].append(seconds)
+
+  def stats(self):
+    """Report the latency of every step.
+
+    Returns:
+        dict: the number of recent samples and the median and maximum latency in
+              milliseconds of every step
+    """
+    with self._lock:
+      return {step: {"count": len(latencies),
+                     "p50_ms": statistics.median(latencies) * 1000,
+                     "max_ms": max(latencies) * 1000}
+              for step, latencies in self._latencies.items() if latencies}
+
 class WebScrapingUtility():
-  """Responsible for all Buganizer html scraping."""
-  def __init__(self, logger):
+  """Responsible for the web driver session of a worker."""
+  def __init__(self, logger, profile_path=None, step_latencies=None):
     """Setup the WebScrapingUtility.
 
     Args:
         logger (logs.logger.Logger): the systems error logger
+        profile_path (str): the Chrome profile to load, constants.PROFILE_PATH by default
+        step_latencies (StepLatencies): where the latency of every step is recorded, which
+                                        may be shared with other workers
     """
-    self.driver = self.setup_webdriver()
     self.logger = logger
+    self.step_latencies = step_latencies or StepLatencies()
+    self.driver = self.setup_webdriver(profile_path)
 
-  def setup_webdriver(self):
+  def setup_webdriver(self, profile_path=None):
     """Completes all neccessary setup for the selenium web driver.
 
+        Args:
+            profile_path (str): the Chrome profile to load, constants.PROFILE_PATH by default
+
         Returns:
             selenium.webdriver.chrome.webdriver.WebDriver: the fully loaded Chrome
                                                           web driver with the desired profile.
     """
+    #Imported here as only the processes which launch a browser need the web driver
+    from selenium import webdriver
+
     try:
       options = webdriver.ChromeOptions()
-      options.add_argument("user-data-dir=" + constants.PROFILE_PATH)
+      options.add_argument("user-data-dir=" + (profile_path or constants.PROFILE_PATH))
       driver = webdriver.Chrome(executable_path=constants.DRIVER_PATH,
                                 options=options)
+      #Every element is waited for explicitly, with the deadline of its step
+      driver.implicitly_wait(0)
+      driver.set_page_load_timeout(constants.PAGE_LOAD_TIMEOUT_SEC)
       return driver
     except common.exceptions.WebDriverException:
       error_message = "ERROR: Failed to load Chrome Driver. Check "\
@@ -38,112 +102,53 @@ class WebScrapingUtility():
     except Exception:
       return None
 
-  def get_issue(self, issue):
-    """Open the Buganizer issue with the selenium webdriver.
-
-    Args:
-        issue (str): the URL of the Buganizer issue
-    """
-    self.driver.implicitly_wait(3)
-    self.driver.get(issue)
+  def quit(self):
+    """Terminate the web driver session, if it started."""
+    if self.driver:
+      self.driver.quit()
+      self.driver = None
 
-
-  def set_assignee_to_reporter(self, reporter):
-    """Sets the Assignee value in the current Buganizer page to the reporter value of the issue.
-
-    Args:
-        reporter (str): the reporter of the Buganizer issue
-    """
-    make_assignee_editable = self.driver.find_element_by_xpath("/html/body/b-service-bootstrap/"\
-      "app-root/div[7]/div/div/edit-issue-page/b-resolving-issue-references/div[2]/div[1]/div[3]"\
-        "/b-resizable-sidebar/div/div[1]/div/div/div[6]/div[1]/div[1]/div[1]/div[2]")
-    make_assignee_editable.click()
-    assignee_input_field = self.driver.find_element_by_xpath("/html/body/b-service-bootstrap/app"\
-      "-root/div[7]/div/div/edit-issue-page/b-resolving-issue-references/div[2]/div[1]/div[3]/"\
-        "b-resizable-sidebar/div/div[1]/div/div/div[6]/div[1]/div[2]/div/div[1]/input")
-    assignee_input_field.clear()
-    assignee_input_field.send_keys(reporter)
-    assignee_input_field.send_keys(Keys.ENTER)
-    assignee_submit_button = self.driver.find_element_by_xpath("/html/body/b-service-bootstrap/"\
-      "app-root/div[7]/div/div/edit-issue-page/b-resolving-issue-references/div[2]/div[1]/div[3]/"\
-        "b-resizable-sidebar/div/div[1]/div/div/div[6]/div[1]/div[2]/div/div[2]/b-button[1]/button")
-    assignee_submit_button.click()
-
-
-  def print_error_to_buganizer(self, error_message):
-    """Sets the Assignee value in the current Buganizer page to the specified reporter.
+  def wait_for(self, step, condition, timeout=None):
+    """Wait until a condition on the current page holds, and record how long it took.
 
     Args:
-        reporter (str): the reporter of the Buganizer issue
-    """
-    text_area = self.driver.find_element_by_xpath("/html/body/b-service-bootstrap/app-root/div[7]/"\
-      "div/div/edit-issue-page/b-resolving-issue-references/div[2]/div[1]/div[3]/div/div/div[2]/"\
-        "div[3]/div/bv2-comment-box/div/div[1]/b-comment-draft/b-comment-draft-textarea/textarea")
-    text_area.send_keys(error_message)
-    comment_button = self.driver.find_element_by_xpath("/html/body/b-service-bootstrap/app-root/"\
-      "div[7]/div/div/edit-issue-page/b-resolving-issue-references/div[2]/div[1]/div[3]/div/div/"\
-        "div[2]/div[3]/div/bv2-comment-box/div/div[3]/div[1]/div/b-button/button")
-
-    while not comment_button.is_enabled():
-      time.sleep(.1)
-    comment_button.click()
+        step (str): the name of the step, reported if it stalls
+        condition (callable): called with the web driver until it returns a truthy value,
+                              usually a selenium expected condition
+        timeout (float): the deadline of the step, constants.STEP_TIMEOUT_SEC by default
 
-  def post_image(self, image_path):
-    """Upload an image to the current Buganizer issue.
+    Raises:
+        StepTimeoutError: if the condition does not hold before the deadline
 
-    Args:
-        image_path (str): the file path of the image
+    Returns:
+        object: the value returned by the condition, usually the element waited for
     """
-    upload_button = self.driver.find_element_by_xpath("/html/body/b-"\
-      "service-bootstrap/app-root/div[7]/div/div/edit-issue-page/b-resolving-"\
-        "issue-references/div[2]/div[1]/div[3]/div/div/div[2]/div[3]/div/bv2-"\
-          "comment-box/div/div[3]/div[2]/div/div[2]/input")
-
-    upload_button.send_keys(image_path)
-
-    comment_button = self.driver.find_element_by_xpath("/html/body/b-service-bootstrap"\
-      "/app-root/div[7]/div/div/edit-issue-page/b-resolving-issue-references/div[2]/"\
-        "div[1]/div[3]/div/div/div[2]/div[3]/div/bv2-comment-box/div/div[3]/div[1]"\
-          "/div/b-button/button")
-
-    while not comment_button.is_enabled():
-      time.sleep(.1)
-    comment_button.click()
+    from selenium.webdriver.support.ui import WebDriverWait
 
+    timeout = timeout or constants.STEP_TIMEOUT_SEC
+    start = time.monotonic()
+    try:
+      return WebDriverWait(self.driver, timeout, poll_frequency=constants.STEP_POLL_SEC)\
+        .until(condition)
+    except common.exceptions.TimeoutException:
+      raise StepTimeoutError(step, timeout) from None
+    finally:
+      self.step_latencies.record(step, time.monotonic() - start)
 
-  def mark_as_fixed(self):
-    """Mark the Status of the current Buganizer to Fixed.
-    """
-    status_button = self.driver.find_element_by_xpath("/html/body/b-service-bootstrap/"\
-      "app-root/div[7]/div/div/edit-issue-page/b-resolving-issue-references/div[2]/div[1]"\
-        "/div[3]/b-resizable-sidebar/div/div[1]/div/div/span/span/div/div[1]/div[1]/div[2]/"\
-          "div[1]/truncated-span")
-    status_button.click()
-    fixed_button = self.driver.find_element_by_xpath("/html/body/b-service-bootstrap/app-root/"\
-      "div[7]/div/div/edit-issue-page/b-resolving-issue-references/div[2]/div[1]/div[3]/"\
-        "b-resizable-sidebar/div/div[1]/div/div/span/span/div/div[2]/div/div[1]/div/div[4]")
-    fixed_button.click()
-
-  def get_issue_status(self):
-    """Retrieve the Status value from the current Buganizer issue.
-
-    Returns:
-        str: the Status value from the current Buganizer issue
-    """
-    status_button = self.driver.find_element_by_xpath("/html/body/b-service-bootstrap/app-root/"\
-      "div[7]/div/div/edit-issue-page/b-resolving-issue-references/div[2]/div[1]/div[3]/"\
-        "b-resizable-sidebar/div/div[1]/div/div/span/span/div/div[1]/div[1]/div[2]/div[1]/"\
-          "truncated-span/span")
-    return status_button.text
+  def get_issue(self, issue):
+    """Open the Buganizer issue with the selenium webdriver, within
+    constants.PAGE_LOAD_TIMEOUT_SEC.
 
-  def get_issue_assignee(self):
-    """Retrieve the Assignee value from the current Buganizer issue.
+    Args:
+        issue (str): the URL of the Buganizer issue
 
-    Returns:
-       str : the Status value from the current Buganzier issue
+    Raises:
+        StepTimeoutError: if the page does not load before the deadline
     """
-    assignee_tag = self.driver.find_element_by_xpath("/html/body/b-service-bootstrap/app-root/"\
-      "div[7]/div/div/edit-issue-page/b-resolving-issue-references/div[2]/div[1]/div[3]/"\
-        "b-resizable-sidebar/div/div[1]/div/div/div[6]/div[1]/div[1]/div[1]/div[2]/div[1]/"\
-          "div/b-user-membership-chip/span/span/span")
-    return assignee_tag.text
+    start = time.monotonic()
+    try:
+      self.driver.get(issue)
+    except common.exceptions.TimeoutException:
+      raise StepTimeoutError("open issue", constants.PAGE_LOAD_TIMEOUT_SEC) from None
+    finally:
+      self.step_latencies.record("open issue", time.monotonic() - start)
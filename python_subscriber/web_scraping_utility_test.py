@@ -0,0 +1,51 @@
+"""Test file for web_scraping_utility.py"""
+import time
+import unittest
+import web_scraping_utility
+
+class OfflineScrapingUtility(web_scraping_utility.WebScrapingUtility):
+  """A WebScrapingUtility which does not launch Chrome."""
+  def setup_webdriver(self, profile_path=None):
+    """Returns:
+        object: a stand-in for the web driver
+    """
+    return object()
+
+class TestsWebScrapingUtility(unittest.TestCase):
+  """Test methods from web_scraping_utility.py
+
+  Args:
+    unittest (unittest.TestCase): unittest Testcase
+  """
+  def setUp(self):
+    self.utility = OfflineScrapingUtility(logger=None)
+
+  def test_stalled_step_fails_fast(self):
+    """Test a step whose condition never holds.
+    Assert that it raises a StepTimeoutError naming the step once its deadline passed, and
+    that its latency is recorded.
+    """
+    start = time.monotonic()
+    with self.assertRaises(web_scraping_utility.StepTimeoutError) as context:
+      self.utility.wait_for("upload image", lambda driver: False, timeout=0.3)
+    assert time.monotonic() - start < 2
+    assert context.exception.step == "upload image"
+    assert "upload image" in str(context.exception)
+    assert self.utility.step_latencies.stats()["upload image"]["count"] == 1
+
+  def test_ready_step_returns_at_once(self):
+    """Test a step whose condition holds after a few checks.
+    Assert that the value of the condition is returned.
+    """
+    checks = []
+
+    def condition(driver):
+      """Hold on the third check."""
+      checks.append(driver)
+      return "element" if len(checks) == 3 else None
+
+    assert self.utility.wait_for("read status", condition, timeout=5) == "element"
+    assert self.utility.step_latencies.stats()["read status"]["max_ms"] < 1000
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,96 @@
+"""This module holds the IssueWorkerPool class which processes Impact Analysis Responses
+concurrently with a pool of workers, each with its own Chrome web driver session. The
+responses of one Buganizer issue are processed one at a time, in the order they were
+received, while the responses of different issues are processed in parallel.
+"""
+import collections
+import queue
+import threading
+import time
+from concurrent import futures
+
+class IssueWorkerPool():
+  """Dispatches the responses of every issue to the next idle worker."""
+
+  def __init__(self, workers, handler, logger):
+    """Setup the IssueWorkerPool
+
+    Args:
+        workers (list): the web_scraping_utility.WebScrapingUtility of every worker
+        handler (callable): processes one response with a worker, called with the worker
+                            and the item given to submit()
+        logger (logs.logger.Logger): the systems error logger
+    """
+    self.workers = workers
+    self.handler = handler
+    self.logger = logger
+    self._idle_workers = queue.Queue()
+    for worker_index in range(len(workers)):
+      self._idle_workers.put(worker_index)
+    self._executor = futures.ThreadPoolExecutor(max_workers=len(workers))
+    self._lock = threading.Lock()
+    #The responses waiting for each issue which is being processed
+    self._pending_issues = {}
+    self._processed_counts = [0] * len(workers)
+    self._busy_sec = [0.0] * len(workers)
+    self._start = time.monotonic()
+
+  def submit(self, issue_id, item):
+    """Queue a response of an issue. It is processed once the responses of the issue
+    received before it are processed.
+
+    Args:
+        issue_id (str): the id of the Buganizer issue of the response
+        item (object): the response, passed to the handler
+    """
+    with self._lock:
+      if issue_id in self._pending_issues:
+        self._pending_issues[issue_id].append(item)
+        return
+      self._pending_issues[issue_id] = collections.deque([item])
+    self._executor.submit(self._process_issue, issue_id)
+
+  def _process_issue(self, issue_id):
+    """Process the responses of an issue with an idle worker until none is left.
+
+    Args:
+        issue_id (str): the id of the Buganizer issue
+    """
+    worker_index = self._idle_workers.get()
+    try:
+      while True:
+        with self._lock:
+          pending_items = self._pending_issues[issue_id]
+          if not pending_items:
+            del self._pending_issues[issue_id]
+            return
+          item = pending_items.popleft()
+
+        start = time.monotonic()
+        try:
+          self.handler(self.workers[worker_index], item)
+        except Exception as error:
+          self.logger.log("ERROR: Failed to process a response of issue " + issue_id + \
+            ": " + str(error) + "\n")
+        with self._lock:
+          self._processed_counts[worker_index] += 1
+          self._busy_sec[worker_index] += time.monotonic() - start
+    finally:
+      self._idle_workers.put(worker_index)
+
+  def stats(self):
+    """Report the throughput of every worker.
+
+    Returns:
+        list: the number of responses processed, the seconds spent processing them and the
+              responses processed per minute since the pool started, for every worker
+    """
+    elapsed_min = max(time.monotonic() - self._start, 1e-9) / 60
+    with self._lock:
+      return [{"processed": processed_count, "busy_sec": busy_sec,
+               "per_minute": processed_count / elapsed_min}
+              for processed_count, busy_sec in zip(self._processed_counts, self._busy_sec)]
+
+  def shutdown(self):
+    """Wait for every queued response and stop the pool."""
+    self._executor.shutdown(wait=True)
@@ -0,0 +1,74 @@
+"""Test file for worker_pool.py"""
+import threading
+import time
+import unittest
+from worker_pool import worker_pool
+
+class Logger():
+  """A logger which keeps the errors in memory."""
+  def __init__(self):
+    self.errors = []
+
+  def log(self, error_message):
+    """Keep an error message."""
+    self.errors.append(error_message)
+
+class TestsIssueWorkerPool(unittest.TestCase):
+  """Test methods from worker_pool.py
+
+  Args:
+    unittest (unittest.TestCase): unittest Testcase
+  """
+  def setUp(self):
+    self.lock = threading.Lock()
+    #The (issue id, item, worker, start, end) of every processed item
+    self.processed = []
+
+    def handler(worker, item):
+      """Process an item slowly and record when it ran."""
+      issue_id, _ = item
+      start = time.monotonic()
+      time.sleep(0.05)
+      if item == ("B", "fail"):
+        raise RuntimeError("failed")
+      with self.lock:
+        self.processed.append((issue_id, item[1], worker, start, time.monotonic()))
+
+    self.logger = Logger()
+    self.pool = worker_pool.IssueWorkerPool(["worker 0", "worker 1"], handler, self.logger)
+
+  def test_issues_in_parallel_items_in_order(self):
+    """Test two issues whose responses are submitted interleaved.
+    Assert that the responses of each issue are processed one at a time in the order they
+    were submitted, while the two issues are processed in parallel by both workers.
+    """
+    for item in range(4):
+      self.pool.submit("A", ("A", item))
+      self.pool.submit("B", ("B", item))
+    self.pool.shutdown()
+
+    for issue_id in ("A", "B"):
+      runs = [run for run in self.processed if run[0] == issue_id]
+      assert [run[1] for run in runs] == [0, 1, 2, 3]
+      assert all(previous[4] <= run[3] for previous, run in zip(runs, runs[1:]))
+    first_a = next(run for run in self.processed if run[0] == "A")
+    first_b = next(run for run in self.processed if run[0] == "B")
+    assert first_a[3] < first_b[4] and first_b[3] < first_a[4]
+
+    stats = self.pool.stats()
+    assert sum(worker_stats["processed"] for worker_stats in stats) == 8
+    assert all(worker_stats["processed"] > 0 and worker_stats["busy_sec"] > 0
+               for worker_stats in stats)
+
+  def test_failed_item_does_not_stop_issue(self):
+    """Test an issue whose first response fails.
+    Assert that the error is logged and the next response of the issue is processed.
+    """
+    self.pool.submit("B", ("B", "fail"))
+    self.pool.submit("B", ("B", 1))
+    self.pool.shutdown()
+    assert [run[1] for run in self.processed] == [1]
+    assert len(self.logger.errors) == 1 and "issue B" in self.logger.errors[0]
+
+if __name__ == "__main__":
+  unittest.main()